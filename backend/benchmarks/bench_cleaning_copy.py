@@ -0,0 +1,73 @@
+"""
+Cleaning Step Benchmark for ResearcherML
+Time and peak memory of apply_cleaning_transformation vs a deep copy per step
+
+Run from backend/: python benchmarks/bench_cleaning_copy.py [rows] [columns]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from questionnaire_handler import apply_cleaning_transformation  # noqa: E402
+
+
+STEPS = [
+    ('fill_median on one column', 'x0', {'missing_strategy': 'fill_median'}, 'numeric_continuous'),
+    ('clip outliers', 'x1', {'outlier_min': -2, 'outlier_max': 2}, 'numeric_continuous'),
+    ('one-hot, 8 levels', 'grp', {'encoding': 'onehot'}, 'categorical'),
+]
+
+
+def make_frame(rows, columns):
+    rng = np.random.default_rng(0)
+    data = {f"x{i}": rng.normal(size=rows) for i in range(columns)}
+    data['x0'][rng.random(rows) < 0.1] = np.nan
+    data['grp'] = rng.choice([f"level{i}" for i in range(8)], rows)
+    return pd.DataFrame(data)
+
+
+def deep_copy_step(df, column, answers, branch):
+    """Cost of the previous implementation: a deep copy of the frame per step."""
+    return apply_cleaning_transformation(df.copy(deep=True), column, answers, branch, copy=False)
+
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    df = make_frame(rows, columns)
+    before = df.copy(deep=True)
+    print(f"{rows:,} rows x {df.shape[1]} columns ({df.memory_usage().sum() / 2**20:.0f} MB)")
+    print(f"{'':28s} {'deep copy':>20s} {'copy-free':>20s}")
+
+    for label, column, answers, branch in STEPS:
+        (expected, _), copy_time, copy_peak = measure(deep_copy_step, df, column, answers, branch)
+        (actual, _), free_time, free_peak = measure(apply_cleaning_transformation, df, column, answers, branch)
+        pd.testing.assert_frame_equal(actual, expected)
+        # Untouched columns share memory with the input, which is unchanged
+        untouched = 'x2'
+        assert np.shares_memory(actual[untouched].to_numpy(), df[untouched].to_numpy())
+        pd.testing.assert_frame_equal(df, before)
+        print(f"{label:28s} {copy_time * 1000:7.0f} ms {copy_peak / 2**20:7.1f} MB"
+              f" {free_time * 1000:7.0f} ms {free_peak / 2**20:7.1f} MB")
+    print("✅ Outputs match and the input frame is unchanged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Downsampling Benchmark for ResearcherML
+Reshaped block reductions vs the groupby they replaced, with equivalence checks
+
+Run from backend/: python benchmarks/bench_downsample.py [samples] [factor]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from time_series_utils import downsample_time_series, _AGGREGATIONS  # noqa: E402
+
+
+METHODS = list(_AGGREGATIONS)
+
+
+def groupby_reference(df, factor, method, timestamp_column):
+    """The groupby downsampling that the block reductions replaced."""
+    numeric_cols = [col for col in df.select_dtypes(include=[np.number]).columns if col != timestamp_column]
+    groups = np.arange(len(df)) // factor
+    result = df.groupby(groups)[numeric_cols].agg(_AGGREGATIONS[method]).reset_index(drop=True)
+    if timestamp_column and timestamp_column in df.columns:
+        ts_groups = df.groupby(groups)[timestamp_column].first().reset_index(drop=True)
+        result.insert(0, timestamp_column, ts_groups)
+    return result
+
+
+def check_equivalence():
+    """Block reductions match groupby on the cases that need special handling."""
+    rng = np.random.default_rng(0)
+    n = 1003  # not a multiple of the factor: the tail block is shorter
+    values = rng.normal(size=n)
+    with_nan = values.copy()
+    with_nan[rng.random(n) < 0.2] = np.nan
+    with_nan[-3:] = np.nan  # all-missing tail block
+    with_nan[100:110] = np.nan  # all-missing full block
+    timestamps = pd.Series(np.arange(n) * 0.01)
+    timestamps[rng.random(n) < 0.1] = np.nan
+
+    cases = {
+        'float64': pd.DataFrame({'time': np.arange(n) * 0.01, 'x': values}),
+        'float32': pd.DataFrame({'time': np.arange(n) * 0.01, 'x': values.astype(np.float32)}),
+        'int64': pd.DataFrame({'time': np.arange(n) * 0.01, 'x': rng.integers(0, 100, n)}),
+        'NaN tails': pd.DataFrame({'time': timestamps, 'x': with_nan}),
+        'nullable Int64': pd.DataFrame({'time': np.arange(n) * 0.01,
+                                        'x': pd.array(np.where(np.isnan(with_nan), None, np.arange(n)), dtype='Int64')}),
+        'nullable Float64': pd.DataFrame({'time': np.arange(n) * 0.01, 'x': pd.array(with_nan, dtype='Float64')}),
+    }
+    for name, df in cases.items():
+        for method in METHODS:
+            expected = groupby_reference(df, 10, method, 'time')
+            actual = downsample_time_series(df, 10, 100, 'time', method)
+            # Means accumulate in float64, so float32 columns agree to rounding
+            pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-5)
+        print(f"ok  {name}")
+
+
+def benchmark(samples, factor):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'time': np.arange(samples) / 1000.0, 'x': rng.normal(size=samples)})
+    gappy = df.copy()
+    gappy.loc[rng.random(samples) < 0.05, 'x'] = np.nan
+
+    print(f"\n{samples:,} samples, factor {factor}")
+    print(f"{'':20s} {'groupby':>9s} {'blocks':>9s}")
+    for label, frame, method in (('average', df, 'average'), ('max', df, 'max'),
+                                 ('first', df, 'first'), ('average with NaN', gappy, 'average')):
+        start = time.perf_counter()
+        expected = groupby_reference(frame, factor, method, 'time')
+        reference_time = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = downsample_time_series(frame, 1000.0 / factor, 1000.0, 'time', method)
+        block_time = time.perf_counter() - start
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+        print(f"{label:20s} {reference_time:8.2f}s {block_time:8.2f}s")
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    factor = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    check_equivalence()
+    benchmark(samples, factor)
+    print("✅ Outputs match")
+
+
+if __name__ == '__main__':
+    main()
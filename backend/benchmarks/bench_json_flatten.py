@@ -0,0 +1,72 @@
+"""
+JSON Flattening Benchmark for ResearcherML
+Per-record flattening vs pd.json_normalize vs columnar flatten_records
+
+Run from backend/: python benchmarks/bench_json_flatten.py [records]
+"""
+
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_utils import _flatten_dict, flatten_records, parse_json_to_dataframe  # noqa: E402
+
+
+def make_records(count):
+    """Records with three nesting levels and a list field."""
+    return [
+        {
+            'id': i,
+            'patient': {'age': 20 + i % 60, 'vitals': {'hr': 60 + i % 40, 'bp': {'sys': 120, 'dia': 80}}},
+            'site': {'name': f"site-{i % 7}", 'country': 'NL'},
+            'tags': ['a', 'b'] if i % 2 else ['c'],
+            'score': i * 0.5
+        }
+        for i in range(count)
+    ]
+
+
+def per_record(records):
+    return pd.DataFrame([_flatten_dict(record) for record in records])
+
+
+def json_normalize(records):
+    df = pd.json_normalize(records, sep='_')
+    df['tags'] = df['tags'].map(lambda v: ', '.join(str(x) for x in v))
+    return df
+
+
+def timed(label, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label:32s} {time.perf_counter() - start:7.2f}s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    records = make_records(count)
+    print(f"{count} records")
+
+    reference = timed('per-record _flatten_dict', per_record, records)
+    normalized = timed('pd.json_normalize', json_normalize, records)
+    columnar = timed('flatten_records', flatten_records, records)
+
+    pd.testing.assert_frame_equal(columnar, reference)
+    pd.testing.assert_frame_equal(columnar, normalized[list(reference.columns)])
+
+    # JSON arrays and JSON Lines flatten to the same frame
+    sample = records[:1000]
+    array_df = parse_json_to_dataframe(json.dumps(sample))
+    lines_df = parse_json_to_dataframe('\n'.join(json.dumps(record) for record in sample))
+    pd.testing.assert_frame_equal(array_df, lines_df)
+    print("✅ Outputs match")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Type Detection Checks for ResearcherML
+Regression checks for sampled column type detection
+
+Run from backend/: python benchmarks/check_type_detection.py
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from questionnaire_handler import detect_column_type  # noqa: E402
+
+
+CASES = [
+    # (values, expected type)
+    (['2020-01-01', '2020-01-02'] * 5000, 'date'),
+    # Mixed formats: no single inferred format fits, values are parsed one by one
+    (['2020-01-01', '01/02/2020'] * 5000, 'date'),
+    (['2020-01-01', '01/02/2020'] * 50, 'date'),
+    (['2020-01-01', 'Jan 3 2020', '03.01.2020'] * 3000, 'date'),
+    (['red', 'green', 'blue'] * 5000, 'categorical'),
+    ([str(i) for i in range(20000)], 'numeric'),
+]
+
+
+def main():
+    for values, expected in CASES:
+        detected, details = detect_column_type(pd.Series(values))
+        label = f"{values[:3]}... x{len(values)}"
+        assert detected == expected, f"{label}: expected {expected}, got {detected} {details}"
+        print(f"ok  {label:60s} {detected}")
+    print("✅ All type detection checks passed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Cache Utilities for ResearcherML
+Least-recently-used in-memory caches bounded by entry count and size
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Object (string) values inspected to estimate an object column's size
+OBJECT_SIZE_SAMPLE = 1000
+
+
+class LruCache:
+    """
+    Dict-like cache that drops its least recently used entries once it
+    holds more than max_entries entries or more than max_bytes (as measured
+    by sizeof when an entry is stored). The entry stored last is always
+    kept, even on its own over budget, so a lookup right after a store
+    hits. Reads and writes are guarded by a lock, as background tasks
+    share the caches with request handlers.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = value
+            size = int(self.sizeof(value)) if self.sizeof and self.max_bytes is not None else 0
+            self._sizes[key] = size
+            self.nbytes += size
+            self._evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._entries:
+                return self[key]
+            self[key] = default
+            return default
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, default)
+            self._discard(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def _discard(self, key: Hashable) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self.nbytes -= self._sizes.pop(key)
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            self._discard(next(iter(self._entries)))
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """
+    Approximate memory held by a DataFrame. Object columns are estimated
+    from a sample of their values instead of measuring every string, which
+    memory_usage(deep=True) does and which is slow on large frames.
+    """
+    total = int(df.memory_usage(index=True, deep=False).sum())
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        if len(values) == 0:
+            continue
+        step = max(1, len(values) // OBJECT_SIZE_SAMPLE)
+        sample = values.iloc[::step]
+        total += int(np.mean([sys.getsizeof(value) for value in sample]) * len(values))
+    return total
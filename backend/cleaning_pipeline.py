@@ -0,0 +1,112 @@
+"""
+Cleaning Pipeline for ResearcherML
+Replayable questionnaire cleaning steps together with their fitted statistics
+"""
+
+import copy
+import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple
+
+from questionnaire_handler import apply_cleaning_transformation, apply_cleaning_batch, StatisticRequired
+
+
+# Bumped when the serialized layout changes
+PIPELINE_FORMAT_VERSION = 1
+
+
+class CleaningPipeline:
+    """
+    Ordered questionnaire cleaning steps and the statistics each step was
+    fitted with (fill values, outlier bounds, one-hot categories, label
+    order, reference dates).
+
+    A fitted pipeline cleans any data with the same columns - a new batch,
+    a refreshed upload, inference inputs - exactly as the data it was
+    fitted on, without recomputing statistics from the new data.
+    """
+
+    def __init__(self, steps: Optional[List[Dict[str, Any]]] = None):
+        self.steps = []
+        self.extend(steps or [])
+
+    def extend(self, steps: List[Dict[str, Any]]) -> None:
+        """Append steps ({column_name, answers, branch, fitted?})."""
+        for step in steps:
+            if not step.get('column_name'):
+                raise ValueError("Every pipeline step needs a column_name")
+            self.steps.append({
+                'column_name': step['column_name'],
+                'answers': copy.deepcopy(step.get('answers', {})),
+                'branch': step.get('branch', 'unknown'),
+                'fitted': copy.deepcopy(step.get('fitted') or {})
+            })
+
+    def fit_transform(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Fit every step's statistics on df and clean it.
+
+        Returns:
+            Tuple of (cleaned_df, list of transformation summaries)
+        """
+        for step in self.steps:
+            step['fitted'] = {}
+        return apply_cleaning_batch(df, self.steps)
+
+    def fit(self, df: pd.DataFrame) -> 'CleaningPipeline':
+        """Fit every step's statistics on df."""
+        self.fit_transform(df)
+        return self
+
+    def transform(self, df: pd.DataFrame, copy: bool = True) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+        """
+        Clean df with the fitted statistics, in one pass over the steps.
+
+        Args:
+            df: Data to clean
+            copy: If False, df may be modified in place (caller owns it)
+
+        Returns:
+            Tuple of (cleaned_df, list of transformation summaries)
+
+        Raises:
+            ValueError: If a step was never fitted or its column is missing
+        """
+        df_cleaned = df.copy(deep=False) if copy else df
+        summaries = []
+        for index, step in enumerate(self.steps):
+            if step['column_name'] not in df_cleaned.columns:
+                raise ValueError(f"Column '{step['column_name']}' needed by step {index + 1} not found in data")
+            try:
+                df_cleaned, summary = apply_cleaning_transformation(
+                    df_cleaned, step['column_name'], step['answers'], step['branch'],
+                    copy=False, fitted=step['fitted'], require_fitted=True
+                )
+            except StatisticRequired as e:
+                raise ValueError(
+                    f"Step {index + 1} ('{step['column_name']}') has no fitted '{e.key}'; fit the pipeline first")
+            summaries.append(summary)
+        return df_cleaned, summaries
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form (see from_dict)."""
+        return {
+            'version': PIPELINE_FORMAT_VERSION,
+            'steps': copy.deepcopy(self.steps)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CleaningPipeline':
+        """
+        Rebuild a pipeline from to_dict() output.
+
+        Raises:
+            ValueError: If the data is not a pipeline this version can read
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('steps'), list):
+            raise ValueError("Pipeline must be an object with a 'steps' list")
+        if data.get('version', PIPELINE_FORMAT_VERSION) > PIPELINE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported pipeline version {data.get('version')}")
+        return cls(data['steps'])
+
+    def __len__(self) -> int:
+        return len(self.steps)
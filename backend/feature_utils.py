@@ -0,0 +1,233 @@
+"""
+Feature Extraction Utilities for ResearcherML
+Windowed statistical and spectral features that turn time series signals into training rows
+"""
+
+import os
+import warnings
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from scipy import signal as scipy_signal
+from typing import Dict, List, Optional, Tuple
+
+
+# Per-window statistics computed when none are requested
+WINDOW_STATISTICS = ('mean', 'std', 'min', 'max', 'rms', 'ptp', 'skew', 'kurtosis', 'zero_crossings')
+
+# Without explicit bands, 0 Hz to Nyquist is split into this many equal bands
+DEFAULT_BAND_COUNT = 4
+
+# Longest Welch segment; shorter windows use one segment of their own length
+WELCH_SEGMENT = 256
+
+# Window samples processed at a time per channel; bounds the temporary
+# arrays when windows overlap heavily (element count, ~32 MB of float64)
+WINDOW_BATCH_ELEMENTS = 1 << 22
+
+
+def extract_window_features(
+    df: pd.DataFrame,
+    signal_columns: List[str],
+    frequency: float,
+    window_seconds: float,
+    step_seconds: Optional[float] = None,
+    statistics: Optional[List[str]] = None,
+    bands: Optional[Dict[str, Tuple[float, float]]] = None,
+    timestamp_column: Optional[str] = None,
+    label_column: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Summarize fixed-length windows of each signal as one row of features.
+
+    Windows are strided views over each channel (sliding_window_view), so
+    every statistic is one reduction along the window axis and band powers
+    come from one scipy.signal.welch call per batch of windows; there is no
+    per-window Python loop. Channels are processed in parallel threads.
+    Statistics skip missing values; spectra are computed after missing
+    values are interpolated.
+
+    Args:
+        df: Time series DataFrame
+        signal_columns: Numeric columns to extract features from
+        frequency: Sampling frequency in Hz
+        window_seconds: Window length in seconds
+        step_seconds: Distance between window starts (None = window_seconds,
+                      i.e. no overlap)
+        statistics: Names from WINDOW_STATISTICS (None = all)
+        bands: {name: (low_hz, high_hz)} band powers to compute (None =
+               DEFAULT_BAND_COUNT equal bands up to Nyquist, {} = none)
+        timestamp_column: Column whose value at each window start is reported
+        label_column: Column whose most common value in each window becomes
+                      the row's label
+        max_workers: Threads for per-channel work (None = CPU count, 1 = serial)
+
+    Returns:
+        DataFrame with 'window_start' (sample index), 'start_time' and a
+        '{column}_{feature}' column per channel and feature (plus the label)
+
+    Raises:
+        ValueError: If the window, step, statistics or bands are invalid,
+                    or a signal or label column is missing
+    """
+    if frequency <= 0:
+        raise ValueError("Sampling frequency must be greater than 0")
+    window = int(round(window_seconds * frequency))
+    step = int(round((step_seconds or window_seconds) * frequency))
+    if window < 2:
+        raise ValueError("Window must span at least 2 samples")
+    if step < 1:
+        raise ValueError("Step must be at least one sample")
+    if len(df) < window:
+        raise ValueError(f"Recording has {len(df)} samples, fewer than one window ({window})")
+
+    statistics = list(WINDOW_STATISTICS) if statistics is None else list(statistics)
+    unknown = [name for name in statistics if name not in WINDOW_STATISTICS]
+    if unknown:
+        raise ValueError(f"Unknown statistics: {', '.join(unknown)}. Use: {', '.join(WINDOW_STATISTICS)}")
+    bands = default_bands(frequency) if bands is None else bands
+    for name, (low, high) in bands.items():
+        if not 0 <= low < high <= frequency / 2:
+            raise ValueError(f"Band '{name}' must satisfy 0 <= low < high <= {frequency / 2:g} Hz (Nyquist)")
+    missing = [col for col in signal_columns + ([label_column] if label_column else [])
+               if col not in df.columns]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(missing)}")
+
+    starts = np.arange(0, len(df) - window + 1, step)
+    workers = max_workers or min(len(signal_columns), os.cpu_count() or 1)
+
+    def channel(col):
+        return _channel_features(df[col], window, step, len(starts), frequency, statistics, bands)
+
+    if workers <= 1 or len(signal_columns) <= 1:
+        per_channel = [channel(col) for col in signal_columns]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            per_channel = list(executor.map(channel, signal_columns))
+
+    columns = {'window_start': starts}
+    if timestamp_column and timestamp_column in df.columns:
+        columns['start_time'] = df[timestamp_column].to_numpy()[starts]
+    else:
+        columns['start_time'] = starts / frequency
+    for col, features in zip(signal_columns, per_channel):
+        for name, values in features.items():
+            columns[f"{col}_{name}"] = values
+    if label_column:
+        columns[label_column] = _window_labels(df[label_column], window, starts)
+    return pd.DataFrame(columns)
+
+
+def default_bands(frequency: float, count: int = DEFAULT_BAND_COUNT) -> Dict[str, Tuple[float, float]]:
+    """Equal-width bands from 0 Hz to Nyquist, named by their edges."""
+    edges = np.linspace(0, frequency / 2, count + 1)
+    return {f"{low:g}-{high:g}Hz": (float(low), float(high)) for low, high in zip(edges[:-1], edges[1:])}
+
+
+def _channel_features(
+    column: pd.Series,
+    window: int,
+    step: int,
+    window_count: int,
+    frequency: float,
+    statistics: List[str],
+    bands: Dict[str, Tuple[float, float]]
+) -> Dict[str, np.ndarray]:
+    """Every feature of one channel, computed over batches of windows."""
+    values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64)
+    has_nan = np.isnan(values.sum())
+    filled = values
+    if bands and has_nan:
+        filled = pd.Series(values).interpolate(limit_direction='both').fillna(0.0).to_numpy()
+
+    features = {name: np.empty(window_count) for name in statistics}
+    features.update({f"band_{name}": np.empty(window_count) for name in bands})
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)[::step]
+    filled_windows = windows if filled is values else np.lib.stride_tricks.sliding_window_view(filled, window)[::step]
+
+    batch = max(1, WINDOW_BATCH_ELEMENTS // window)
+    for first in range(0, window_count, batch):
+        part = slice(first, first + batch)
+        if statistics:
+            for name, result in _window_statistics(windows[part], statistics, has_nan).items():
+                features[name][part] = result
+        if bands:
+            for name, result in _band_powers(filled_windows[part], frequency, bands).items():
+                features[f"band_{name}"][part] = result
+    return features
+
+
+def _window_statistics(windows: np.ndarray, statistics: List[str], has_nan: bool) -> Dict[str, np.ndarray]:
+    """Requested statistics along the window axis of a (windows, samples) array."""
+    with warnings.catch_warnings():
+        # All-missing windows give NaN, which is the intended result
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(windows, axis=1) if has_nan else windows.mean(axis=1)
+        results = {'mean': mean}
+        needs_deviation = {'std', 'skew', 'kurtosis', 'zero_crossings'} & set(statistics)
+        if needs_deviation:
+            deviation = windows - mean[:, None]
+            average = np.nanmean if has_nan else np.mean
+            m2 = average(deviation ** 2, axis=1)
+            results['std'] = np.sqrt(m2)
+            if 'skew' in statistics:
+                results['skew'] = average(deviation ** 3, axis=1) / m2 ** 1.5
+            if 'kurtosis' in statistics:
+                # Excess kurtosis, 0 for a normal distribution
+                results['kurtosis'] = average(deviation ** 4, axis=1) / m2 ** 2 - 3
+            if 'zero_crossings' in statistics:
+                # Sign changes of the mean-removed signal; missing values are skipped over
+                results['zero_crossings'] = _sign_changes(deviation) if has_nan else np.count_nonzero(
+                    np.diff(np.signbit(deviation), axis=1), axis=1)
+        if {'min', 'ptp'} & set(statistics):
+            results['min'] = np.nanmin(windows, axis=1) if has_nan else windows.min(axis=1)
+        if {'max', 'ptp'} & set(statistics):
+            results['max'] = np.nanmax(windows, axis=1) if has_nan else windows.max(axis=1)
+        if 'ptp' in statistics:
+            results['ptp'] = results['max'] - results['min']
+        if 'rms' in statistics:
+            results['rms'] = np.sqrt((np.nanmean if has_nan else np.mean)(windows ** 2, axis=1))
+    return {name: results[name] for name in statistics}
+
+
+def _sign_changes(deviation: np.ndarray) -> np.ndarray:
+    """Sign changes per row, comparing each value with the last non-missing one before it."""
+    signs = np.where(np.isnan(deviation), np.nan, np.signbit(deviation).astype(np.float64))
+    signs = pd.DataFrame(signs).ffill(axis=1).to_numpy()
+    changes = np.diff(signs, axis=1)
+    return np.count_nonzero(np.nan_to_num(changes), axis=1)
+
+
+def _band_powers(
+    windows: np.ndarray,
+    frequency: float,
+    bands: Dict[str, Tuple[float, float]]
+) -> Dict[str, np.ndarray]:
+    """Power in each band from the Welch spectrum of every window at once."""
+    segment = min(windows.shape[1], WELCH_SEGMENT)
+    freqs, psd = scipy_signal.welch(windows, fs=frequency, nperseg=segment, axis=1)
+    resolution = freqs[1] - freqs[0]
+    powers = {}
+    for name, (low, high) in bands.items():
+        # Bins in [low, high), with the Nyquist bin in the top band
+        in_band = (freqs >= low) & ((freqs < high) | (high >= frequency / 2))
+        powers[name] = psd[:, in_band].sum(axis=1) * resolution
+    return powers
+
+
+def _window_labels(labels: pd.Series, window: int, starts: np.ndarray) -> np.ndarray:
+    """Most common non-missing label in each window (first in order of appearance on ties)."""
+    codes, uniques = pd.factorize(labels)
+    if len(uniques) == 0:
+        return np.full(len(starts), np.nan)
+    # Per-label running counts; a window's count is a difference of two rows
+    counts = np.zeros((len(codes) + 1, len(uniques)), dtype=np.int32)
+    valid = codes >= 0
+    counts[np.flatnonzero(valid) + 1, codes[valid]] = 1
+    np.cumsum(counts, axis=0, out=counts)
+    in_window = counts[starts + window] - counts[starts]
+    result = uniques.take(in_window.argmax(axis=1)).to_numpy(dtype=object)
+    result[in_window.max(axis=1) == 0] = np.nan
+    return result
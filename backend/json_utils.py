@@ -4,8 +4,232 @@ Handles various JSON formats and converts them to DataFrames
 """
 
 import json
+import re
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator, Optional, Tuple
+
+# orjson is optional - it parses several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Extensions that are always treated as newline-delimited JSON
+NDJSON_EXTENSIONS = ['.jsonl', '.ndjson']
+
+# Number of items per array inspected when estimating nesting depth
+NESTING_SAMPLE_SIZE = 100
+
+_NON_SPACE = re.compile(r'\S')
+
+
+def load_json_content(content: str, ndjson: Optional[bool] = None) -> Any:
+    """
+    Parse JSON or NDJSON (JSON Lines) content into Python objects.
+    
+    Args:
+        content: JSON string
+        ndjson: True to force JSON Lines parsing, False to forbid it,
+            None to fall back to JSON Lines when the document is not a
+            single JSON value
+        
+    Returns:
+        Parsed JSON value (a list of records for JSON Lines)
+        
+    Raises:
+        json.JSONDecodeError: If the content is neither valid JSON nor JSON Lines
+    """
+    if ndjson:
+        return list(iter_json_lines(content))
+    
+    try:
+        return _loads(content)
+    except json.JSONDecodeError:
+        # "Extra data" after the first value usually means JSON Lines
+        if ndjson is False or '\n' not in content.rstrip():
+            raise
+        return list(iter_json_lines(content))
+
+
+def iter_json_lines(content: str) -> Iterator[Any]:
+    """
+    Lazily parse JSON Lines content, yielding one value per non-blank line.
+    
+    Raises:
+        json.JSONDecodeError: If a line is not valid JSON
+    """
+    start = 0
+    length = len(content)
+    while start < length:
+        end = content.find('\n', start)
+        if end == -1:
+            end = length
+        line = content[start:end].strip()
+        if line:
+            yield _loads(line)
+        start = end + 1
+
+
+def is_json_lines(content: str) -> bool:
+    """
+    Check whether content looks like JSON Lines (one object or array per
+    line). Only the first line is parsed and nothing else is copied.
+    """
+    first = _NON_SPACE.search(content)
+    if first is None or content[first.start()] not in '{[':
+        return False
+    end = content.find('\n', first.start())
+    # A single line is one JSON document, not JSON Lines
+    if end == -1 or _NON_SPACE.search(content, end) is None:
+        return False
+    try:
+        return isinstance(_loads(content[first.start():end]), (dict, list))
+    except json.JSONDecodeError:
+        return False
+
+
+def records_to_dataframe(records: Iterable[Any]) -> pd.DataFrame:
+    """
+    Build a DataFrame from an iterable of records in a single pass.
+    
+    Values are appended straight into per-column lists, so the records
+    never need to be materialized as a list of dicts. Keys that are missing
+    from a record become None. Array records fill 'value_0', 'value_1', ...
+    by position; other non-dict records go into a 'value' column.
+    
+    Args:
+        records: Iterable of dicts (e.g. from iter_json_lines)
+        
+    Returns:
+        pandas DataFrame
+    """
+    columns: Dict[str, List[Any]] = {}
+    row_count = 0
+    for record in records:
+        if isinstance(record, list):
+            record = {f'value_{i}': value for i, value in enumerate(record)}
+        elif not isinstance(record, dict):
+            record = {'value': record}
+        for key, value in record.items():
+            column = columns.get(key)
+            if column is None:
+                # Back-fill rows seen before this key first appeared
+                column = columns[key] = [None] * row_count
+            column.append(value)
+        row_count += 1
+        if len(record) < len(columns):
+            # Pad keys this record did not have
+            for column in columns.values():
+                if len(column) < row_count:
+                    column.append(None)
+    
+    return pd.DataFrame(columns) if columns else pd.DataFrame()
+
+
+def flatten_records(
+    records: Iterable[Any],
+    sep: str = '_',
+    max_depth: Optional[int] = None,
+    explode: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Flatten an array of nested records into a DataFrame.
+    
+    See flatten_dataframe for how nesting and lists are handled.
+    
+    Example:
+        [{'a': {'b': 1}, 'c': [1, 2]}] -> columns 'a_b' (1) and 'c' ('1, 2')
+    """
+    df = records if isinstance(records, pd.DataFrame) else pd.DataFrame(records)
+    return flatten_dataframe(df, sep=sep, max_depth=max_depth, explode=explode)
+
+
+def flatten_dataframe(
+    df: pd.DataFrame,
+    sep: str = '_',
+    max_depth: Optional[int] = None,
+    explode: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Flatten dict-valued columns of a DataFrame, one nesting level at a time.
+    
+    Instead of recursing into every record, each level expands whole
+    dict-valued columns at once with the DataFrame constructor, so the work
+    per level is a handful of column operations regardless of row count.
+    
+    Args:
+        df: DataFrame whose object columns may hold dicts and lists
+        sep: Separator between parent and child keys
+        max_depth: Number of dict levels to expand (None = all); deeper
+            dicts are left as-is
+        explode: Flattened column name whose list elements become separate
+            rows (dict elements are flattened under the same prefix);
+            other lists are joined into comma-separated strings
+        
+    Returns:
+        Flattened DataFrame
+    """
+    depth = 0
+    # Only object columns can hold dicts; after the first level only the
+    # freshly expanded children need to be checked again
+    candidates = set(df.columns[df.dtypes == object])
+    while candidates and (max_depth is None or depth < max_depth):
+        if explode is not None and explode in df.columns:
+            df = df.explode(explode, ignore_index=True)
+        
+        pieces = []
+        next_candidates = set()
+        expanded_any = False
+        for col in df.columns:
+            values = df[col]
+            if col not in candidates or values.dtype != object:
+                pieces.append(values)
+                continue
+            
+            is_dict = (values.map(type) == dict).to_numpy()
+            if not is_dict.any():
+                pieces.append(values)
+                continue
+            
+            expanded_any = True
+            # Rows that are not dicts keep their scalar under the parent name
+            scalars = values[~is_dict]
+            if scalars.notna().any():
+                pieces.append(values.where(~is_dict))
+            children = pd.DataFrame(values[is_dict].tolist(), index=values.index[is_dict])
+            if not is_dict.all():
+                children = children.reindex(df.index)
+            children.columns = [f"{col}{sep}{key}" for key in children.columns]
+            next_candidates.update(children.columns[children.dtypes == object])
+            pieces.extend(children[c] for c in children.columns)
+        
+        if not expanded_any:
+            break
+        df = pd.concat(pieces, axis=1) if pieces else pd.DataFrame(index=df.index)
+        candidates = next_candidates
+        depth += 1
+    
+    if explode is not None and explode in df.columns:
+        df = df.explode(explode, ignore_index=True)
+    
+    # Remaining lists become comma-separated strings, as in _flatten_dict
+    for col in df.columns[df.dtypes == object]:
+        values = df[col]
+        is_list = (values.map(type) == list).to_numpy()
+        if is_list.any():
+            joined = values.copy()
+            joined[is_list] = [', '.join(str(x) for x in v) for v in values[is_list]]
+            df[col] = joined
+    
+    return df
+
+
+def _loads(text: str) -> Any:
+    """Parse a JSON string with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 def detect_json_structure(content: str) -> Dict[str, Any]:
@@ -19,14 +243,94 @@ def detect_json_structure(content: str) -> Dict[str, Any]:
         Dictionary with structure metadata
     """
     try:
-        data = json.loads(content)
-    except json.JSONDecodeError as e:
+        if is_json_lines(content):
+            return parse_json_with_structure(content)[1]
+        data = load_json_content(content, ndjson=False)
+    except (json.JSONDecodeError, ValueError) as e:
         return {
             'type': 'invalid',
             'error': str(e),
             'suggested_format': None
         }
     
+    return _describe_json(data)
+
+
+def parse_json_to_dataframe(
+    content: str,
+    ndjson: Optional[bool] = None,
+    max_depth: Optional[int] = None,
+    explode: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Parse JSON content and convert to a pandas DataFrame.
+    Handles multiple JSON formats intelligently, including JSON Lines.
+    Records from arrays and from JSON Lines are flattened the same way.
+    
+    Args:
+        content: JSON string
+        ndjson: True if the content is known to be JSON Lines (see load_json_content)
+        max_depth: Nested dict levels to expand (see flatten_dataframe)
+        explode: Flattened list column to expand into rows (see flatten_dataframe)
+        
+    Returns:
+        pandas DataFrame
+        
+    Raises:
+        ValueError: If JSON format cannot be converted to DataFrame
+    """
+    try:
+        if ndjson or (ndjson is None and is_json_lines(content)):
+            # Stream lines straight into columns without a list of dicts
+            df = records_to_dataframe(iter_json_lines(content))
+            return flatten_dataframe(df, max_depth=max_depth, explode=explode)
+        data = load_json_content(content, ndjson=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+    
+    return _json_to_dataframe(data, max_depth=max_depth, explode=explode)
+
+
+def parse_json_with_structure(
+    content: str,
+    ndjson: Optional[bool] = None,
+    max_depth: Optional[int] = None,
+    explode: Optional[str] = None
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Parse JSON content once and return both the DataFrame and its structure.
+    
+    Equivalent to calling parse_json_to_dataframe and detect_json_structure,
+    but the document is only decoded a single time and nesting depth is
+    estimated from a sample of rows.
+    
+    Args:
+        content: JSON string
+        ndjson: True if the content is known to be JSON Lines (see load_json_content)
+        max_depth: Nested dict levels to expand (see flatten_dataframe)
+        explode: Flattened list column to expand into rows (see flatten_dataframe)
+        
+    Returns:
+        Tuple of (DataFrame, structure metadata)
+        
+    Raises:
+        ValueError: If JSON format cannot be converted to DataFrame
+    """
+    try:
+        if ndjson or (ndjson is None and is_json_lines(content)):
+            df = records_to_dataframe(iter_json_lines(content))
+            # Structure describes the records as written, before flattening
+            structure = _describe_json_lines(df)
+            return flatten_dataframe(df, max_depth=max_depth, explode=explode), structure
+        data = load_json_content(content, ndjson=False)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+    
+    return _json_to_dataframe(data, max_depth=max_depth, explode=explode), _describe_json(data)
+
+
+def _describe_json(data: Any) -> Dict[str, Any]:
+    """Structure metadata for an already-parsed JSON value."""
     # Detect type
     if isinstance(data, list):
         if len(data) == 0:
@@ -54,8 +358,8 @@ def detect_json_structure(content: str) -> Dict[str, Any]:
     else:
         json_type = 'primitive'
     
-    # Calculate nesting depth
-    nesting_depth = _calculate_nesting_depth(data)
+    # Estimate nesting depth from a sample of each container
+    nesting_depth = _calculate_nesting_depth(data, sample_size=NESTING_SAMPLE_SIZE)
     
     # Determine suggested format
     if json_type in ['array_of_objects', 'columnar_dict']:
@@ -79,25 +383,28 @@ def detect_json_structure(content: str) -> Dict[str, Any]:
     }
 
 
-def parse_json_to_dataframe(content: str) -> pd.DataFrame:
-    """
-    Parse JSON content and convert to a pandas DataFrame.
-    Handles multiple JSON formats intelligently.
-    
-    Args:
-        content: JSON string
-        
-    Returns:
-        pandas DataFrame
-        
-    Raises:
-        ValueError: If JSON format cannot be converted to DataFrame
-    """
-    try:
-        data = json.loads(content)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON: {str(e)}")
+def _describe_json_lines(df: pd.DataFrame) -> Dict[str, Any]:
+    """Structure metadata for JSON Lines content that was already loaded into df."""
+    # Depth of the line array: 1 for the array plus the deepest sampled row
+    step = max(1, len(df) // NESTING_SAMPLE_SIZE)
+    sampled_rows = df.iloc[::step].to_dict('records')
+    nesting_depth = _calculate_nesting_depth(sampled_rows, sample_size=NESTING_SAMPLE_SIZE)
     
+    has_time_columns = any(
+        str(key).lower() in ['time', 'timestamp', 'date', 't', 'datetime']
+        for key in df.columns
+    )
+    return {
+        'type': 'json_lines',
+        'has_time_columns': has_time_columns,
+        'suggested_format': 'nested' if nesting_depth > 2 else 'tabular',
+        'nesting_depth': nesting_depth,
+        'row_count': len(df)
+    }
+
+
+def _json_to_dataframe(data: Any, max_depth: Optional[int] = None, explode: Optional[str] = None) -> pd.DataFrame:
+    """Convert an already-parsed JSON value to a DataFrame."""
     # Handle different JSON structures
     
     # Case 1: Array of objects (most common for tabular data)
@@ -106,8 +413,8 @@ def parse_json_to_dataframe(content: str) -> pd.DataFrame:
             return pd.DataFrame()
         
         if isinstance(data[0], dict):
-            # Array of objects - direct conversion
-            return pd.DataFrame(data)
+            # Array of objects - nested fields become prefixed columns
+            return flatten_records(data, max_depth=max_depth, explode=explode)
         else:
             # Array of primitive values - convert to single column
             return pd.DataFrame({'value': data})
@@ -135,16 +442,23 @@ def parse_json_to_dataframe(content: str) -> pd.DataFrame:
         return pd.DataFrame({'value': [data]})
 
 
-def _calculate_nesting_depth(obj: Any, current_depth: int = 0) -> int:
-    """Calculate the maximum nesting depth of a JSON structure."""
+def _calculate_nesting_depth(obj: Any, current_depth: int = 0, sample_size: Optional[int] = None) -> int:
+    """
+    Calculate the maximum nesting depth of a JSON structure.
+    
+    With sample_size set, lists longer than sample_size are only inspected
+    at evenly spaced positions, so large arrays cost O(sample_size) per level.
+    """
     if isinstance(obj, dict):
         if not obj:
             return current_depth
-        return max(_calculate_nesting_depth(v, current_depth + 1) for v in obj.values())
+        return max(_calculate_nesting_depth(v, current_depth + 1, sample_size) for v in obj.values())
     elif isinstance(obj, list):
         if not obj:
             return current_depth
-        return max(_calculate_nesting_depth(item, current_depth + 1) for item in obj)
+        if sample_size and len(obj) > sample_size:
+            obj = obj[::len(obj) // sample_size]
+        return max(_calculate_nesting_depth(item, current_depth + 1, sample_size) for item in obj)
     else:
         return current_depth
 
@@ -0,0 +1,162 @@
+"""
+Level-of-Detail Utilities for ResearcherML
+Min/max/mean pyramids for plotting long signals at any zoom level
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+
+# Coarsening stops once a level has at most this many buckets
+LOD_MIN_BUCKETS = 512
+
+# Default plot width in pixels for range queries
+LOD_DEFAULT_WIDTH = 1000
+
+# Timestamp values parsed to decide whether the timestamp column is usable
+TIMESTAMP_PROBE_SIZE = 100
+
+
+class LodPyramid:
+    """
+    Per-bucket min, max and mean of signal columns at power-of-two
+    resolutions: level k summarizes buckets of 2**k samples, from k = 1
+    until a level has at most LOD_MIN_BUCKETS buckets. Each level is built
+    from the one below it, so the pyramid takes one pass over the data and
+    about three times the signal size in float32. It keeps no copy of the
+    samples themselves: raw samples (level 0) and bucket timestamps are
+    read from the frame passed to query.
+
+    A range query picks the coarsest level that still has at least one
+    bucket per pixel, so it returns between width and 2 * width buckets
+    (a min and a max point each) whatever the zoom.
+    """
+
+    def __init__(self, df: pd.DataFrame, signal_columns: List[str], timestamp_column: Optional[str] = None):
+        self.sample_count = len(df)
+        self.columns = list(signal_columns)
+        usable = timestamp_column in df.columns and _timestamp_array(
+            df[timestamp_column].head(TIMESTAMP_PROBE_SIZE)) is not None
+        self.timestamp_column = timestamp_column if usable else None
+        # levels[k - 1][col] = (min, max, mean) for buckets of 2**k samples
+        self.levels = []
+        self._build(df)
+
+    def _build(self, df: pd.DataFrame) -> None:
+        current = {}
+        for col in self.columns:
+            values = _signal_array(df[col])
+            valid = ~np.isnan(values)
+            current[col] = (values, values, np.where(valid, values, 0.0), valid.astype(np.float64))
+
+        while current and len(next(iter(current.values()))[0]) > LOD_MIN_BUCKETS:
+            current = {col: _coarsen(*arrays) for col, arrays in current.items()}
+            level = {}
+            for col, (mins, maxs, sums, counts) in current.items():
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    means = sums / counts
+                level[col] = (mins.astype(np.float32), maxs.astype(np.float32), means.astype(np.float32))
+            self.levels.append(level)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the pyramid levels."""
+        return sum(array.nbytes for level in self.levels for arrays in level.values() for array in arrays)
+
+    def query(
+        self,
+        df: pd.DataFrame,
+        start: int = 0,
+        end: Optional[int] = None,
+        width: int = LOD_DEFAULT_WIDTH,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Summaries of samples [start, end) for a plot `width` pixels wide.
+
+        Args:
+            df: The frame the pyramid was built from
+            start: First sample index
+            end: Sample index after the last (None = end of the signal)
+            width: Plot width in pixels
+            columns: Signal columns to return (None = all)
+
+        Returns:
+            Dictionary with the level and bucket size used, each bucket's
+            first sample index (and timestamp, if known), and per column
+            'min', 'max' and 'mean' arrays. Windows of at most 2 * width
+            samples return the raw samples (level 0) in the same shape.
+
+        Raises:
+            ValueError: If a requested column is not a signal column
+        """
+        columns = self.columns if columns is None else columns
+        unknown = [col for col in columns if col not in self.columns]
+        if unknown:
+            raise ValueError(f"Not signal columns: {', '.join(unknown)}")
+        width = max(1, int(width))
+        end = self.sample_count if end is None else end
+        start, end = max(0, int(start)), min(self.sample_count, int(end))
+        end = max(start, end)
+
+        level = 0
+        if self.levels and end - start > 2 * width:
+            level = min(int(np.log2((end - start) / width)), len(self.levels))
+        bucket_size = 2 ** level
+        first, last = start // bucket_size, -(-end // bucket_size)
+
+        signals = {}
+        for col in columns:
+            if level == 0:
+                values = _signal_array(df[col].iloc[first:last])
+                signals[col] = {'min': values, 'max': values, 'mean': values}
+            else:
+                mins, maxs, means = self.levels[level - 1][col]
+                signals[col] = {'min': mins[first:last], 'max': maxs[first:last], 'mean': means[first:last]}
+
+        index = np.arange(first, last, dtype=np.int64) * bucket_size
+        result = {
+            'level': level,
+            'bucket_size': bucket_size,
+            'start': start,
+            'end': end,
+            'sample_count': self.sample_count,
+            'index': index,
+            'signals': signals
+        }
+        if self.timestamp_column is not None:
+            times = _timestamp_array(df[self.timestamp_column].iloc[index])
+            result['time'] = times if times.dtype.kind == 'f' else np.datetime_as_string(times, unit='ms').tolist()
+        return result
+
+
+def _coarsen(mins: np.ndarray, maxs: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+    """Merge neighbouring buckets in pairs; an odd last bucket stands alone."""
+    if len(mins) % 2:
+        mins = np.append(mins, np.nan)
+        maxs = np.append(maxs, np.nan)
+        sums = np.append(sums, 0.0)
+        counts = np.append(counts, 0.0)
+    # fmin/fmax skip NaN unless both buckets are empty
+    return (
+        np.fmin(mins[0::2], mins[1::2]),
+        np.fmax(maxs[0::2], maxs[1::2]),
+        sums[0::2] + sums[1::2],
+        counts[0::2] + counts[1::2]
+    )
+
+
+def _signal_array(values: pd.Series) -> np.ndarray:
+    """Signal values as float64, with unparseable values as NaN."""
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _timestamp_array(timestamps: pd.Series) -> Optional[np.ndarray]:
+    """Timestamps as float seconds or datetime64, or None if they cannot be parsed."""
+    if pd.api.types.is_numeric_dtype(timestamps):
+        return timestamps.to_numpy(dtype=np.float64)
+    parsed = pd.to_datetime(timestamps, errors='coerce')
+    if parsed.isna().all():
+        return None
+    return parsed.to_numpy()
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -6,6 +6,7 @@ import os
 import uuid
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from typing import List, Optional, Dict, Any
 import json
 import joblib
@@ -13,46 +14,104 @@ from datetime import datetime
 import base64
 import io
 import zipfile
+import pathlib
 from fastapi import Path
-from session_store import save_session, load_session, delete_session
-from questionnaire_handler import analyze_column, apply_cleaning_transformation, get_cleaning_summary
+from session_store import (
+    save_session, save_session_metadata, load_session, load_session_metadata,
+    session_content_path, delete_session, save_session_array, load_session_array,
+    save_session_blob, open_session_blob, delete_session_blob
+)
+from response_utils import FastJSONResponse, DATA_FORMATS, frame_payload
+from cache_utils import LruCache, frame_nbytes
+from profile_utils import profile_dataframe, column_value_summary
+from lod_utils import LodPyramid, LOD_DEFAULT_WIDTH
+from feature_utils import extract_window_features
+from stream_cleaning import stream_clean_csv, check_step_columns, STREAM_CHUNK_SIZE
+from stream_merge import stream_concat_csv, stream_asof_csv, MERGE_CHUNK_SIZE
+from cleaning_pipeline import CleaningPipeline
+from questionnaire_handler import (
+    analyze_column,
+    apply_cleaning_transformation,
+    apply_cleaning_batch,
+    replay_cleaning_log,
+    get_cleaning_summary
+)
 
 # Import time series utilities
 try:
     from time_series_utils import (
         analyze_time_series,
+        analyze_sampling,
         detect_frequency,
+        find_timestamp_column,
         downsample_time_series,
+        resample_polyphase,
+        resampled_frequency,
+        stream_resample_csv,
         validate_frequency_conversion,
-        process_audio_file
+        decode_audio,
+        audio_frame,
+        waveform_envelope,
+        RESAMPLE_CHUNK_SIZE
     )
 except ImportError:
     # If time_series_utils is not available, create stub functions
     print("Warning: time_series_utils not available, using stubs")
+    RESAMPLE_CHUNK_SIZE = 1_000_000
 
     def analyze_time_series(df, timestamp_column=None):
-        return {"frequency": 1.0, "sample_count": len(df), "signal_columns": [], "timestamp_column": timestamp_column, "duration_seconds": 0}
+        return {"frequency": 1.0, "sample_count": len(df), "signal_columns": [], "timestamp_column": timestamp_column, "duration_seconds": 0,
+                "sampling": {"timestamp_column": timestamp_column, "frequency": 1.0, "source": "default"}}
+
+    def analyze_sampling(df, timestamp_column=None):
+        return {"timestamp_column": timestamp_column, "frequency": 1.0, "source": "default"}
 
     def detect_frequency(df, timestamp_column=None):
         return 1.0
 
+    def find_timestamp_column(df):
+        return detect_timestamp_column(df.columns)
+
     def downsample_time_series(df, target_freq, original_freq, timestamp_column=None, method='average'):
         return df
 
+    def resample_polyphase(df, target_freq, original_freq, timestamp_column=None):
+        return df
+
+    def resampled_frequency(target_freq, original_freq, method='average'):
+        return target_freq
+
+    def stream_resample_csv(source_path, output_path, target_freq, original_freq,
+                            timestamp_column=None, method='average', chunk_size=None):
+        raise NotImplementedError("Streaming resampling requires time_series_utils")
+
     def validate_frequency_conversion(original_freq, target_freq):
         return True, ""
 
-    def process_audio_file(audio_data, sample_rate=None):
+    def decode_audio(source, block_frames=None):
         raise NotImplementedError(
-            "Audio processing not available. Install librosa and soundfile.")
+            "Audio decoding not available. Install soundfile.")
+
+    def audio_frame(samples, sample_rate, start=0, stop=None):
+        amplitude = samples[start:stop]
+        return pd.DataFrame({'timestamp': (start + np.arange(len(amplitude))) / sample_rate,
+                             'amplitude': amplitude})
+
+    def waveform_envelope(samples, buckets=2000):
+        return {'bucket_size': 1, 'min': samples[:buckets], 'max': samples[:buckets]}
 
 # Import JSON utilities
 try:
-    from json_utils import parse_json_to_dataframe, detect_json_structure
+    from json_utils import (
+        parse_json_to_dataframe,
+        parse_json_with_structure,
+        detect_json_structure,
+        load_json_content
+    )
 except ImportError:
     print("Warning: json_utils not available, using stubs")
 
-    def parse_json_to_dataframe(content):
+    def parse_json_to_dataframe(content, ndjson=None, max_depth=None, explode=None):
         data = json.loads(content)
         if isinstance(data, list):
             return pd.DataFrame(data)
@@ -66,6 +125,21 @@ except ImportError:
     def detect_json_structure(content):
         return {'type': 'unknown', 'suggested_format': 'tabular'}
 
+    def load_json_content(content, ndjson=None):
+        return json.loads(content)
+
+    def parse_json_with_structure(content, ndjson=None, max_depth=None, explode=None):
+        return parse_json_to_dataframe(content), detect_json_structure(content)
+
+# JSON documents and JSON Lines (one record per line)
+JSON_EXTENSIONS = ['.json', '.jsonl', '.ndjson']
+
+# Audio is decoded at upload and stored as float32 samples, not as text
+AUDIO_EXTENSIONS = ['.wav', '.mp3', '.flac', '.m4a']
+
+# Uploads stored as UTF-8 text; any other format is kept as raw bytes
+TEXT_EXTENSIONS = ['.csv', '.tsv', '.txt'] + JSON_EXTENSIONS
+
 app = FastAPI(title="ResearcherML API",
               description="Machine Learning Research Platform")
 
@@ -94,9 +168,17 @@ if os.path.exists(os.path.join(frontend_dir, "js")):
     app.mount(
         "/js", StaticFiles(directory=os.path.join(frontend_dir, "js")), name="js")
 
+# Memory budgets of the in-memory caches below; least recently used files
+# are dropped first and reload from the session store on demand
+UPLOADED_DATA_CACHE_BYTES = 1 << 30
+DATAFRAME_CACHE_BYTES = 2 << 30
+LOD_PYRAMID_CACHE_BYTES = 512 << 20
+ANALYSIS_CACHE_FILES = 64
+
 # Storage for uploaded files - now using persistent session store
 # Keep in-memory cache for frequently accessed data
-uploaded_data_cache = {}
+uploaded_data_cache = LruCache(max_bytes=UPLOADED_DATA_CACHE_BYTES,
+                               sizeof=lambda data: len(data.get('content') or ''))
 
 def get_file_data(file_id: str) -> Optional[Dict]:
     """Get file data from cache or load from session store"""
@@ -108,10 +190,198 @@ def get_file_data(file_id: str) -> Optional[Dict]:
         uploaded_data_cache[file_id] = data
     return data
 
-def store_file_data(file_id: str, data: Dict) -> None:
-    """Store file data in both cache and persistent storage"""
+def store_file_data(file_id: str, data: Dict, metadata_only: bool = False) -> None:
+    """
+    Store file data in both cache and persistent storage
+    metadata_only: Skip rewriting the stored content (e.g. after logging a cleaning step)
+    """
     uploaded_data_cache[file_id] = data
-    save_session(file_id, data)
+    if metadata_only:
+        save_session_metadata(file_id, data)
+    else:
+        save_session(file_id, data)
+
+# Cleaning steps are appended to a log in the session metadata and replayed
+# on read; the content itself is only rewritten every N steps (a checkpoint)
+CLEANING_CHECKPOINT_INTERVAL = 20
+
+# Current DataFrame per file, tagged with the data_version it reflects
+dataframe_cache = LruCache(max_bytes=DATAFRAME_CACHE_BYTES, sizeof=lambda entry: frame_nbytes(entry['df']))
+
+
+def parse_file_content(file_data: Dict) -> pd.DataFrame:
+    """Parse the stored content (as of the last checkpoint) into a DataFrame"""
+    content = file_data.get('content', '')
+    if file_data.get('extension', '') in JSON_EXTENSIONS:
+        return parse_json_to_dataframe(content)
+    return pd.read_csv(io.StringIO(content))
+
+
+def load_dataframe(file_id: str, file_data: Dict) -> pd.DataFrame:
+    """
+    Get the current DataFrame for a file with all logged cleaning steps applied.
+    The result is cached until the next cleaning step changes data_version.
+    Callers must not modify the returned frame in place.
+    """
+    version = file_data.get('data_version', 0)
+    cached = dataframe_cache.get(file_id)
+    if cached and cached['version'] == version:
+        return cached['df']
+
+    if 'audio' in file_data:
+        df = audio_frame(load_session_array(file_id), file_data['audio']['sample_rate'])
+    else:
+        df = parse_file_content(file_data)
+    cleaning_log = file_data.get('cleaning_log', [])
+    if cleaning_log:
+        df = replay_cleaning_log(df, cleaning_log)
+    dataframe_cache[file_id] = {'version': version, 'df': df}
+    return df
+
+
+def record_cleaning_steps(file_id: str, file_data: Dict, steps: List[Dict], df_cleaned: pd.DataFrame) -> None:
+    """
+    Append cleaning steps to the session log and cache the resulting frame.
+    Content is only re-serialized when the log reaches the checkpoint interval.
+    """
+    file_data.setdefault('cleaning_log', []).extend(steps)
+    add_pipeline_steps(file_data, steps)
+    file_data.setdefault('transformations', []).extend(
+        step['summary'] for step in steps if 'summary' in step)
+    file_data['data_version'] = file_data.get('data_version', 0) + 1
+    file_data['last_cleaned'] = datetime.now().isoformat()
+    dataframe_cache[file_id] = {'version': file_data['data_version'], 'df': df_cleaned}
+    invalidate_column_analyses(file_id, file_data, steps)
+
+    if len(file_data['cleaning_log']) >= CLEANING_CHECKPOINT_INTERVAL:
+        checkpoint_cleaning_log(file_id, file_data, df_cleaned)
+    else:
+        store_file_data(file_id, file_data, metadata_only=True)
+
+
+def add_pipeline_steps(file_data: Dict, steps: List[Dict]) -> None:
+    """
+    Add steps and their fitted statistics to the session's cleaning pipeline.
+    Unlike the cleaning log it is never cleared, so it can re-clean new data.
+    """
+    pipeline = CleaningPipeline(file_data.get('cleaning_pipeline', []))
+    pipeline.extend(steps)
+    file_data['cleaning_pipeline'] = pipeline.steps
+
+
+# Questionnaire column analyses per file: {file_id: {column: {'version', 'analysis'}}}
+column_analysis_cache = LruCache(max_entries=ANALYSIS_CACHE_FILES)
+
+
+def column_version(file_data: Dict, column_name: str) -> str:
+    """Version of a column's data: changes when the column or the row set is cleaned"""
+    column_versions = file_data.get('column_versions', {})
+    return f"{file_data.get('rows_version', 0)}:{column_versions.get(column_name, 0)}"
+
+
+def get_column_analysis(file_id: str, file_data: Dict, column_name: str,
+                        approximate: Optional[bool] = None) -> Dict:
+    """Questionnaire analysis for one column, computed once per column version"""
+    version = column_version(file_data, column_name)
+    cached = column_analysis_cache.get(file_id, {}).get(column_name)
+    if cached and cached['version'] == version and cached['approximate'] == approximate:
+        return cached['analysis']
+
+    analysis = analyze_column(load_dataframe(file_id, file_data), column_name, approximate=approximate)
+    column_analysis_cache.setdefault(file_id, {})[column_name] = {
+        'version': version,
+        'approximate': approximate,
+        'analysis': analysis
+    }
+    return analysis
+
+
+def invalidate_column_analyses(file_id: str, file_data: Dict, steps: List[Dict]) -> None:
+    """Bump the versions of columns touched by cleaning steps and drop their cached analyses"""
+    column_versions = file_data.setdefault('column_versions', {})
+    cached = column_analysis_cache.get(file_id, {})
+    for step in steps:
+        if step.get('answers', {}).get('missing_strategy') == 'remove_rows':
+            # Removing rows changes every column
+            file_data['rows_version'] = file_data.get('rows_version', 0) + 1
+            cached.clear()
+        summary = step.get('summary', {})
+        for column in [step['column_name']] + summary.get('new_columns', []):
+            column_versions[column] = column_versions.get(column, 0) + 1
+            cached.pop(column, None)
+
+
+def precompute_column_analyses(file_id: str) -> None:
+    """Analyze every column ahead of time so the questionnaire opens columns instantly"""
+    try:
+        file_data = get_file_data(file_id)
+        if not file_data:
+            return
+        df = load_dataframe(file_id, file_data)
+        for column_name in df.columns:
+            get_column_analysis(file_id, file_data, column_name)
+        print(f"✅ Precomputed analyses for {len(df.columns)} columns of {file_id}")
+    except Exception as e:
+        print(f"⚠️ Could not precompute column analyses for {file_id}: {str(e)}")
+
+
+# Whole-dataset profiles per file, tagged with the data_version they describe
+dataset_profile_cache = LruCache(max_entries=ANALYSIS_CACHE_FILES)
+
+
+def get_dataset_profile(file_id: str, file_data: Dict, top_n: int = 10,
+                        approximate: Optional[bool] = None) -> Dict:
+    """Profile of the current data, recomputed only after the data changes"""
+    version = file_data.get('data_version', 0)
+    options = {'top_n': top_n, 'approximate': approximate}
+    cached = dataset_profile_cache.get(file_id)
+    if cached and cached['version'] == version and cached['options'] == options:
+        return cached['profile']
+
+    profile = profile_dataframe(load_dataframe(file_id, file_data), top_n=top_n, approximate=approximate)
+    dataset_profile_cache[file_id] = {'version': version, 'options': options, 'profile': profile}
+    return profile
+
+
+# Level-of-detail pyramids of time series signals, tagged with their data_version
+lod_pyramid_cache = LruCache(max_bytes=LOD_PYRAMID_CACHE_BYTES, sizeof=lambda entry: entry['pyramid'].nbytes)
+
+
+def get_lod_pyramid(file_id: str, file_data: Dict) -> LodPyramid:
+    """Min/max/mean pyramid of the signal columns, rebuilt only after the data changes"""
+    version = file_data.get('data_version', 0)
+    cached = lod_pyramid_cache.get(file_id)
+    if cached and cached['version'] == version:
+        return cached['pyramid']
+
+    df = load_dataframe(file_id, file_data)
+    analysis = analyze_time_series(df)
+    signal_columns = analysis['signal_columns']
+    pyramid = LodPyramid(df, signal_columns, analysis['timestamp_column'])
+    lod_pyramid_cache[file_id] = {'version': version, 'pyramid': pyramid}
+    print(f"✅ Built {len(pyramid.levels)}-level plotting pyramid for {len(signal_columns)} signals of {file_id}")
+    return pyramid
+
+
+def checkpoint_cleaning_log(file_id: str, file_data: Dict, df_cleaned: pd.DataFrame) -> None:
+    """
+    Materialize the cleaned frame as the new stored content and clear the log.
+    Frames with sparse (one-hot) columns are not checkpointed: CSV would
+    store them densely and re-parse them densely, so their steps stay in
+    the log, whose replay rebuilds the sparse columns.
+    """
+    if not file_data.get('cleaning_log'):
+        return
+    if any(isinstance(dtype, pd.SparseDtype) for dtype in df_cleaned.dtypes):
+        store_file_data(file_id, file_data, metadata_only=True)
+        return
+    file_data['content'] = df_cleaned.to_csv(index=False)
+    # Checkpoints are always CSV, whatever the original upload format
+    file_data.setdefault('original_extension', file_data.get('extension', ''))
+    file_data['extension'] = '.csv'
+    file_data['cleaning_log'] = []
+    file_data['checkpointed_at'] = datetime.now().isoformat()
+    store_file_data(file_id, file_data)
 
 # Models directory
 MODELS_DIR = "backend/models"
@@ -130,7 +400,7 @@ def detect_data_type(extension: str, content: bytes) -> str:
 
     if extension in ['.csv', '.tsv']:
         return "tabular"
-    elif extension in ['.txt', '.json']:
+    elif extension in ['.txt'] + JSON_EXTENSIONS:
         # Check content for time series patterns
         try:
             text_content = content.decode('utf-8')
@@ -140,9 +410,9 @@ def detect_data_type(extension: str, content: bytes) -> str:
             if any(keyword in text_content.lower() for keyword in time_series_keywords):
                 return "time_series"
             # For JSON, check structure
-            if extension == '.json':
+            if extension in JSON_EXTENSIONS:
                 try:
-                    json_data = json.loads(text_content)
+                    json_data = load_json_content(text_content)
                     # Check if it's object with arrays (time series format)
                     if isinstance(json_data, dict):
                         array_keys = [
@@ -159,7 +429,7 @@ def detect_data_type(extension: str, content: bytes) -> str:
             return "tabular"
         except:
             return "tabular"
-    elif extension in ['.wav', '.mp3', '.flac', '.m4a']:
+    elif extension in AUDIO_EXTENSIONS:
         return "time_series"  # Audio files are time series signals
     else:
         return "unknown"
@@ -180,6 +450,7 @@ async def health_check():
 
 @app.post("/api/upload")
 async def upload_files(
+    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
     model_type: str = None,
     model_action: str = None
@@ -204,21 +475,31 @@ async def upload_files(
             f"📤 Receiving file: {file.filename}, size: {file_size_mb:.2f}MB, extension: {file_extension}")
 
         # Read file content
+        is_text = file_extension in TEXT_EXTENSIONS
         try:
             import time
             start_read = time.time()
-            content = await file.read()
+            if is_text:
+                content = await file.read()
+                content_size = len(content)
+            else:
+                # Binary formats are streamed into the blob store as they are,
+                # never held in memory whole or decoded as text
+                await file.seek(0)
+                content = b''
+                content_size = save_session_blob(file_id, file.file)
             read_time = time.time() - start_read
             print(
-                f"✅ File read complete in {read_time:.2f}s, content size: {len(content) / (1024 * 1024):.2f}MB")
+                f"✅ File read complete in {read_time:.2f}s, content size: {content_size / (1024 * 1024):.2f}MB")
 
             # Decode content - this should be fast
             start_decode = time.time()
-            content_str = content.decode(
-                'utf-8') if isinstance(content, bytes) else str(content)
-            decode_time = time.time() - start_decode
-            print(
-                f"✅ File decoded in {decode_time:.2f}s, string length: {len(content_str) / (1024 * 1024):.2f}MB")
+            if is_text:
+                content_str = content.decode(
+                    'utf-8') if isinstance(content, bytes) else str(content)
+                decode_time = time.time() - start_decode
+                print(
+                    f"✅ File decoded in {decode_time:.2f}s, string length: {len(content_str) / (1024 * 1024):.2f}MB")
         except Exception as e:
             print(f"❌ Error reading file {file.filename}: {str(e)}")
             raise HTTPException(
@@ -233,19 +514,48 @@ async def upload_files(
             print(f"⚠️ Error detecting data type: {str(e)}")
             detected_types.append('unknown')
 
+        # Decode audio block-wise straight from the stored blob. Only the
+        # decoded samples are read afterwards, so the blob is then dropped
+        # rather than keeping the signal on disk twice
+        audio_info = None
+        if file_extension in AUDIO_EXTENSIONS:
+            try:
+                start_decode = time.time()
+                with open_session_blob(file_id) as blob:
+                    audio_info = decode_audio(blob)
+                save_session_array(file_id, audio_info.pop('samples'))
+                delete_session_blob(file_id)
+                print(f"✅ Audio decoded in {time.time() - start_decode:.2f}s: {audio_info['sample_count']} samples "
+                      f"at {audio_info['sample_rate']} Hz")
+            except Exception as e:
+                print(f"❌ Error decoding audio {file.filename}: {str(e)}")
+                delete_session(file_id)
+                raise HTTPException(
+                    status_code=400, detail=f"Could not decode audio file {file.filename}: {str(e)}")
+
         # Store file data (persistent storage + cache)
         try:
             file_data = {
                 'filename': file.filename,
                 'extension': file_extension,
-                'content': content_str,
-                'size': len(content),
+                'size': content_size,
                 'detected_type': detected_type,
                 'uploaded_at': datetime.now().isoformat()
             }
+            if is_text:
+                file_data['content'] = content_str
+            elif audio_info is not None:
+                file_data['storage'] = 'array'
+                file_data['audio'] = audio_info
+            else:
+                file_data['storage'] = 'blob'
             store_file_data(file_id, file_data)
             print(f"✅ File stored with ID: {file_id}")
             file_ids.append(file_id)
+
+            # Warm the questionnaire's column analyses after the response is sent
+            if detected_type == 'tabular' and file_extension in ['.csv'] + JSON_EXTENSIONS:
+                background_tasks.add_task(precompute_column_analyses, file_id)
         except Exception as e:
             print(f"❌ Error storing file data: {str(e)}")
             raise HTTPException(
@@ -274,12 +584,33 @@ async def upload_files(
     }
 
 
+def tabular_payload(df: pd.DataFrame, data_format: str) -> Any:
+    """Tabular rows for the data viewer: records keep '' for missing values, columnar formats send null."""
+    if data_format == 'records':
+        df = df.fillna('')
+    return frame_payload(df, data_format)
+
+
+def validate_data_format(data_format: str) -> None:
+    """Reject unknown wire formats with a 400 before any work is done."""
+    if data_format not in DATA_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format '{data_format}'. Use one of: {', '.join(DATA_FORMATS)}")
+
+
 @app.get("/api/data/{file_id}")
-async def get_data_preview(file_id: str, full: bool = False):
+async def get_data_preview(
+    file_id: str,
+    full: bool = False,
+    data_format: str = Query('records', alias='format')
+):
     """
     Get data preview for a specific file
     full: If True, return full dataset instead of preview
+    format: Wire format for rows - 'records' (default) or 'columns'
     """
+    validate_data_format(data_format)
     try:
         file_data = get_file_data(file_id)
         if not file_data:
@@ -287,14 +618,50 @@ async def get_data_preview(file_id: str, full: bool = False):
         file_extension = file_data.get('extension', '')
         content = file_data.get('content', '')
 
+        # Pending cleaning steps live in the log, not in the stored content;
+        # the response keeps the shape the stored content gets below
+        if file_data.get('cleaning_log'):
+            df = load_dataframe(file_id, file_data)
+            if file_data.get('detected_type') == 'time_series':
+                analysis = analyze_time_series(df)
+                return FastJSONResponse({
+                    "type": "time_series",
+                    "frequency": analysis['frequency'],
+                    "sample_count": analysis['sample_count'],
+                    "signal_columns": analysis['signal_columns'],
+                    "timestamp_column": analysis['timestamp_column'],
+                    "sampling": analysis['sampling'],
+                    "format": data_format,
+                    "preview_data": frame_payload(df.head(100), data_format) if not full else None,
+                    "data": frame_payload(df, data_format) if full else None,
+                    "columns": list(df.columns),
+                    "shape": df.shape
+                })
+            df_preview = df if full else df.head(1000)
+            response = {
+                "type": "tabular",
+                "format": data_format,
+                "columns": list(df.columns),
+                "data": tabular_payload(df_preview, data_format),
+                "shape": df.shape,
+                "dtypes": {col: str(df[col].dtype) for col in df.columns}
+            }
+            sampling = analyze_sampling(df_preview)
+            if sampling['timestamp_column'] is not None:
+                response.update({
+                    "frequency": sampling['frequency'],
+                    "timestamp_column": sampling['timestamp_column'],
+                    "sampling": sampling
+                })
+            return FastJSONResponse(response)
+
         # Handle JSON files
-        if file_extension == '.json':
+        if file_extension in JSON_EXTENSIONS:
             try:
-                # Parse JSON to DataFrame
-                df = parse_json_to_dataframe(content)
+                # Parse JSON to DataFrame and detect its structure in one pass
+                df, json_structure = parse_json_with_structure(content)
 
                 # Detect if it's time series based on structure
-                json_structure = detect_json_structure(content)
                 is_time_series = json_structure.get(
                     'suggested_format') == 'time_series' or json_structure.get('has_time_columns', False)
 
@@ -307,16 +674,19 @@ async def get_data_preview(file_id: str, full: bool = False):
                     # Process as time series
                     analysis = analyze_time_series(df)
                     preview_size = 100 if not full else len(df)
-                    return {
+                    return FastJSONResponse({
                         "type": "time_series",
                         "frequency": analysis['frequency'],
                         "sample_count": analysis['sample_count'],
                         "signal_columns": analysis['signal_columns'],
-                        "preview_data": df.head(preview_size).to_dict('records') if not full else None,
-                        "data": df.to_dict('records') if full else None,
+                        "timestamp_column": analysis['timestamp_column'],
+                        "sampling": analysis['sampling'],
+                        "format": data_format,
+                        "preview_data": frame_payload(df.head(preview_size), data_format) if not full else None,
+                        "data": frame_payload(df, data_format) if full else None,
                         "columns": list(df.columns),
                         "shape": df.shape
-                    }
+                    })
                 else:
                     # Process as tabular data
                     print(
@@ -329,13 +699,14 @@ async def get_data_preview(file_id: str, full: bool = False):
                         print(
                             f"📋 Returning preview: {preview_size} rows (out of {len(df)} total)")
                         df_preview = df.head(preview_size)
-                    return {
+                    return FastJSONResponse({
                         "type": "tabular",
+                        "format": data_format,
                         "columns": list(df.columns),
-                        "data": df_preview.fillna('').to_dict('records'),
+                        "data": tabular_payload(df_preview, data_format),
                         "shape": df.shape,
                         "dtypes": {col: str(df[col].dtype) for col in df.columns}
-                    }
+                    })
             except Exception as e:
                 raise HTTPException(
                     status_code=500, detail=f"Error parsing JSON file: {str(e)}")
@@ -385,13 +756,23 @@ async def get_data_preview(file_id: str, full: bool = False):
                 df_preview = df
                 # Set shape with approximate total (will be accurate when full=true is called)
                 df_shape = (total_rows_approx, len(df.columns))
-            return {
+            response = {
                 "type": "tabular",
+                "format": data_format,
                 "columns": list(df_preview.columns),
-                "data": df_preview.fillna('').to_dict('records'),
+                "data": tabular_payload(df_preview, data_format),
                 "shape": df_shape,
                 "dtypes": {col: "string" for col in df_preview.columns}
             }
+            # Sampling of the time axis, if there is one, from the rows read
+            sampling = analyze_sampling(df_preview)
+            if sampling['timestamp_column'] is not None:
+                response.update({
+                    "frequency": sampling['frequency'],
+                    "timestamp_column": sampling['timestamp_column'],
+                    "sampling": sampling
+                })
+            return FastJSONResponse(response)
 
         # Handle TXT files (could be CSV-like or time series)
         elif file_extension == '.txt':
@@ -407,30 +788,36 @@ async def get_data_preview(file_id: str, full: bool = False):
                     if full:
                         print(
                             f"✅ Returning FULL time series dataset: {len(df)} rows")
-                        return {
+                        return FastJSONResponse({
                             "type": "time_series",
                             "frequency": analysis['frequency'],
                             "sample_count": analysis['sample_count'],
                             "signal_columns": analysis['signal_columns'],
+                            "timestamp_column": analysis['timestamp_column'],
+                            "sampling": analysis['sampling'],
+                            "format": data_format,
                             "preview_data": None,
-                            "data": df.to_dict('records'),
+                            "data": frame_payload(df, data_format),
                             "columns": list(df.columns),
                             "shape": df.shape
-                        }
+                        })
                     else:
                         preview_size = 100
                         print(
                             f"📋 Returning time series preview: {preview_size} rows (out of {len(df)} total)")
-                        return {
+                        return FastJSONResponse({
                             "type": "time_series",
                             "frequency": analysis['frequency'],
                             "sample_count": analysis['sample_count'],
                             "signal_columns": analysis['signal_columns'],
-                            "preview_data": df.head(preview_size).to_dict('records'),
+                            "timestamp_column": analysis['timestamp_column'],
+                            "sampling": analysis['sampling'],
+                            "format": data_format,
+                            "preview_data": frame_payload(df.head(preview_size), data_format),
                             "data": None,
                             "columns": list(df.columns),
                             "shape": df.shape
-                        }
+                        })
                 except Exception as e:
                     return {
                         "type": "text",
@@ -452,13 +839,14 @@ async def get_data_preview(file_id: str, full: bool = False):
                         print(
                             f"📋 Returning preview: {preview_size} rows (out of {len(df)} total)")
                         df_preview = df.head(preview_size)
-                    return {
+                    return FastJSONResponse({
                         "type": "tabular",
+                        "format": data_format,
                         "columns": list(df.columns),
-                        "data": df_preview.fillna('').to_dict('records'),
+                        "data": tabular_payload(df_preview, data_format),
                         "shape": df.shape,
                         "dtypes": {col: "string" for col in df.columns}
-                    }
+                    })
                 except:
                     return {
                         "type": "text",
@@ -467,33 +855,32 @@ async def get_data_preview(file_id: str, full: bool = False):
                     }
 
         # Handle audio files
-        elif file_extension in ['.wav', '.mp3', '.flac', '.m4a']:
-            try:
-                audio_info = process_audio_file(content)
-                audio_df = audio_info['data']
-                if full:
-                    data_records = audio_df.to_dict('records')
-                else:
-                    data_records = audio_df.head(100).to_dict('records')
-
+        elif file_extension in AUDIO_EXTENSIONS:
+            samples = load_session_array(file_id) if 'audio' in file_data else None
+            if samples is None:
                 return {
                     "type": "time_series",
-                    "frequency": audio_info['frequency'],
-                    "sample_rate": audio_info['sample_rate'],
-                    "duration": audio_info['duration'],
-                    "sample_count": len(audio_df),
-                    "signal_columns": ['amplitude'],
-                    "audio_data": True,
-                    "preview_data": data_records,
-                    "data": audio_df.to_dict('records') if full else None,
-                    "columns": list(audio_df.columns)
-                }
-            except Exception as e:
-                return {
-                    "type": "time_series",
-                    "message": f"Audio file detected but processing failed: {str(e)}",
+                    "message": "Audio file detected but its decoded samples are not available",
                     "extension": file_extension
                 }
+            # Decoded float32 samples, memory-mapped: previews read only what they send
+            sample_rate = file_data['audio']['sample_rate']
+            audio_df = audio_frame(samples, sample_rate, stop=None if full else 100)
+            return FastJSONResponse({
+                "type": "time_series",
+                "frequency": float(sample_rate),
+                "sample_rate": sample_rate,
+                "duration": len(samples) / sample_rate,
+                "sample_count": len(samples),
+                "channels": file_data['audio'].get('channels', 1),
+                "signal_columns": ['amplitude'],
+                "audio_data": True,
+                "format": data_format,
+                "envelope": waveform_envelope(samples),
+                "preview_data": frame_payload(audio_df, data_format) if not full else None,
+                "data": frame_payload(audio_df, data_format) if full else None,
+                "columns": list(audio_df.columns)
+            })
         else:
             return {"type": "unknown", "message": "Unsupported file type"}
 
@@ -502,16 +889,23 @@ async def get_data_preview(file_id: str, full: bool = False):
             status_code=500, detail=f"Error reading file: {str(e)}")
 
 
+# Models that cannot take a sparse feature matrix; it is densified for them
+DENSE_INPUT_MODELS = {'nb'}
+
+
 @app.post("/api/train")
 async def train_models(request: Request):
     """
-    Train machine learning models on provided data
+    Train machine learning models on provided data, or on a session's
+    cleaned data when file_id is given. Sparse (one-hot) columns of a
+    session stay sparse through to the models as a scipy CSR matrix.
     """
     try:
         body = await request.json()
 
         # Extract request parameters
         data = body.get('data', [])
+        file_id = body.get('file_id')
         features = body.get('features', [])
         label = body.get('label')
         model_ids = body.get('model_ids', [])
@@ -524,7 +918,7 @@ async def train_models(request: Request):
         save_models = body.get('save_models', True)
         hyperparameter_configs = body.get('hyperparameter_configs', {})
 
-        if not data or len(data) == 0:
+        if not file_id and (not data or len(data) == 0):
             raise HTTPException(status_code=400, detail="No data provided")
         if not features or len(features) == 0:
             raise HTTPException(status_code=400, detail="No features provided")
@@ -534,8 +928,17 @@ async def train_models(request: Request):
             raise HTTPException(status_code=400, detail="No models specified")
 
         # Convert data to DataFrame
+        if file_id:
+            file_data = get_file_data(file_id)
+            if not file_data:
+                raise HTTPException(status_code=404, detail="File not found")
         try:
-            df = pd.DataFrame(data)
+            if file_id:
+                # Only the columns used; copied because nulls are handled in place
+                session_df = load_dataframe(file_id, file_data)
+                df = session_df[[col for col in dict.fromkeys(features + [label]) if col in session_df.columns]].copy()
+            else:
+                df = pd.DataFrame(data)
             if df.empty:
                 raise ValueError("DataFrame is empty after conversion")
         except Exception as e:
@@ -557,6 +960,10 @@ async def train_models(request: Request):
                 detail=f"Label '{label}' not found in data columns"
             )
 
+        # Sparse columns (one-hot indicators) have no nulls and skip the dense preprocessing
+        sparse_features = [f for f in features if isinstance(df[f].dtype, pd.SparseDtype)]
+        dense_features = [f for f in features if f not in sparse_features]
+
         # Handle null values
         try:
             if null_handling_method == 'remove':
@@ -568,13 +975,13 @@ async def train_models(request: Request):
                 from sklearn.impute import SimpleImputer
                 imputer = SimpleImputer(strategy='mean')
                 numeric_features = [
-                    f for f in features if df[f].dtype in ['int64', 'float64']]
+                    f for f in dense_features if df[f].dtype in ['int64', 'float64']]
                 if len(numeric_features) > 0:
                     df[numeric_features] = imputer.fit_transform(
                         df[numeric_features])
                 # For categorical, use mode
                 categorical_features = [
-                    f for f in features if f not in numeric_features]
+                    f for f in dense_features if f not in numeric_features]
                 if len(categorical_features) > 0:
                     cat_imputer = SimpleImputer(strategy='most_frequent')
                     df[categorical_features] = cat_imputer.fit_transform(
@@ -587,7 +994,7 @@ async def train_models(request: Request):
 
         # Prepare features and label
         try:
-            X = df[features].copy()
+            X = df[dense_features].copy()
             y = df[label].copy()
         except Exception as e:
             raise HTTPException(
@@ -668,6 +1075,14 @@ async def train_models(request: Request):
             if np.any(np.isinf(y)):
                 y = np.nan_to_num(y, nan=0.0, posinf=0.0, neginf=0.0)
 
+            # Dense columns first, then the sparse ones, as one CSR matrix
+            if sparse_features:
+                X = sparse.hstack(
+                    [sparse.csr_matrix(X.to_numpy()), df[sparse_features].sparse.to_coo()],
+                    format='csr', dtype=float
+                )
+                print(f"🧮 Training on a sparse {X.shape[0]}x{X.shape[1]} matrix ({X.nnz} non-zeros)")
+
         except Exception as e:
             import traceback
             error_detail = f"Error preprocessing data: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
@@ -693,7 +1108,7 @@ async def train_models(request: Request):
             )
 
             # Validate split results
-            if len(X_train) == 0 or len(X_test) == 0:
+            if X_train.shape[0] == 0 or X_test.shape[0] == 0:
                 raise ValueError("Train-test split resulted in empty datasets")
         except Exception as e:
             raise HTTPException(
@@ -743,6 +1158,10 @@ async def train_models(request: Request):
                 # Get hyperparameter config for this model
                 model_config = hyperparameter_configs.get(model_id, {})
 
+                model_X_train, model_X_test = X_train, X_test
+                if model_id in DENSE_INPUT_MODELS and sparse.issparse(X_train):
+                    model_X_train, model_X_test = X_train.toarray(), X_test.toarray()
+
                 # Create model based on ID
                 if model_id == 'logreg':
                     model = LogisticRegression(random_state=42, max_iter=1000)
@@ -1011,14 +1430,14 @@ async def train_models(request: Request):
 
                         try:
                             model_with_params = model_class(**model_params)
-                            model_with_params.fit(X_train, y_train)
+                            model_with_params.fit(model_X_train, y_train)
 
                             # Evaluate
                             if task == 'classification':
-                                score = model_with_params.score(X_test, y_test)
+                                score = model_with_params.score(model_X_test, y_test)
                             else:
                                 from sklearn.metrics import mean_squared_error
-                                y_pred = model_with_params.predict(X_test)
+                                y_pred = model_with_params.predict(model_X_test)
                                 # Negative because Optuna minimizes
                                 score = -mean_squared_error(y_test, y_pred)
 
@@ -1084,7 +1503,7 @@ async def train_models(request: Request):
                 # If Optuna was disabled or failed, use default model (already created above)
                 # The model variable already has the default model from the if/elif chain above
 
-                model.fit(X_train, y_train)
+                model.fit(model_X_train, y_train)
 
                 # Calculate metrics
                 from sklearn.metrics import (
@@ -1096,8 +1515,8 @@ async def train_models(request: Request):
                 matplotlib.use('Agg')  # Non-interactive backend for server-side rendering
                 import matplotlib.pyplot as plt
 
-                y_train_pred = model.predict(X_train)
-                y_test_pred = model.predict(X_test)
+                y_train_pred = model.predict(model_X_train)
+                y_test_pred = model.predict(model_X_test)
 
                 metrics = {}
                 if task == 'classification':
@@ -1299,10 +1718,93 @@ async def download_model(filename: str = Path(..., description="Model filename (
     return FileResponse(model_path, media_type="application/octet-stream", filename=filename)
 
 
+def detect_timestamp_column(columns: List[str]) -> Optional[str]:
+    """First column whose name looks like a time axis, if any"""
+    for col in columns:
+        if any(kw in col.lower() for kw in ['time', 'timestamp', 'date']):
+            return col
+    return None
+
+
+# Rows read from a CSV to choose its timestamp column out of core; the same
+# number of leading values find_timestamp_column checks in memory
+TIMESTAMP_PROBE_ROWS = 10_000
+
+
+def csv_timestamp_column(path: pathlib.Path) -> Optional[str]:
+    """Timestamp column of a CSV file, chosen from its first rows as find_timestamp_column does in memory"""
+    return find_timestamp_column(pd.read_csv(path, nrows=TIMESTAMP_PROBE_ROWS))
+
+
+def stream_cleaned_source(file_data: Dict, content_path: pathlib.Path, cleaned_path: pathlib.Path) -> pathlib.Path:
+    """
+    Path of a CSV session's content with its cleaning log applied: the
+    content itself if nothing is pending, otherwise cleaned_path after the
+    log is streamed into it (the caller deletes it).
+    """
+    if not file_data.get('cleaning_log'):
+        return content_path
+    stream_clean_csv(str(content_path), str(cleaned_path), file_data['cleaning_log'])
+    return cleaned_path
+
+
+def stream_resample_session(file_id: str, target_frequency: float, original_frequency: float,
+                            method: str, chunk_size: int = RESAMPLE_CHUNK_SIZE) -> Dict:
+    """
+    Resample a CSV session chunk by chunk into a new session, never holding
+    the recording in memory. Cleaning steps still in the log are streamed
+    first. Returns stream_resample_csv's result plus the new 'file_id'.
+    """
+    # Metadata only: the content is read from disk chunk by chunk
+    file_data = uploaded_data_cache.get(file_id) or load_session_metadata(file_id)
+    content_path = session_content_path(file_id)
+    if not file_data or not content_path.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    if file_data.get('extension', '') != '.csv':
+        raise HTTPException(status_code=400, detail="Out-of-core resampling supports CSV files only")
+
+    new_file_id = str(uuid.uuid4())
+    output_path = session_content_path(new_file_id)
+    cleaned_path = content_path.with_name(f"{new_file_id}.clean.tmp")
+    try:
+        source_path = stream_cleaned_source(file_data, content_path, cleaned_path)
+        timestamp_column = csv_timestamp_column(source_path)
+        result = stream_resample_csv(
+            str(source_path), str(output_path), target_frequency, original_frequency,
+            timestamp_column, method, chunk_size)
+    except Exception:
+        if output_path.exists():
+            output_path.unlink()
+        raise
+    finally:
+        if cleaned_path.exists():
+            cleaned_path.unlink()
+
+    stem, _ = os.path.splitext(file_data.get('filename', 'recording.csv'))
+    save_session_metadata(new_file_id, {
+        'filename': f"{stem}_{result['frequency']:g}Hz.csv",
+        'extension': '.csv',
+        'size': output_path.stat().st_size,
+        'detected_type': file_data.get('detected_type', 'time_series'),
+        'uploaded_at': datetime.now().isoformat(),
+        'resampled_from': file_id,
+        'frequency': result['frequency']
+    })
+    print(f"✅ Resampled {result['rows_in']} samples of {file_id} to {result['rows_out']} "
+          f"at {result['frequency']:g} Hz in {result['chunks']} chunks -> {new_file_id}")
+    result['file_id'] = new_file_id
+    return result
+
+
 @app.post("/api/time-series/resample")
 async def resample_time_series(request: Request):
     """
-    Resample time series data to a target frequency
+    Resample time series data to a target frequency. Upsampling, and
+    method 'polyphase', use anti-aliased polyphase filtering; the other
+    methods aggregate blocks of samples.
+
+    With out_of_core, a CSV session is resampled chunk by chunk into a new
+    session and only its file_id and a summary are returned.
     """
     try:
         body = await request.json()
@@ -1310,12 +1812,10 @@ async def resample_time_series(request: Request):
         target_frequency = body.get('target_frequency')
         original_frequency = body.get('original_frequency')
         method = body.get('method', 'average')
-
-        file_data = get_file_data(file_id)
-        if not file_data:
-            raise HTTPException(status_code=404, detail="File not found")
-        content = file_data.get('content', '')
-        file_extension = file_data.get('extension', '')
+        data_format = body.get('format', 'records')
+        out_of_core = body.get('out_of_core', False)
+        chunk_size = int(body.get('chunk_size') or RESAMPLE_CHUNK_SIZE)
+        validate_data_format(data_format)
 
         # Validate frequency conversion
         is_valid, error_msg = validate_frequency_conversion(
@@ -1323,67 +1823,372 @@ async def resample_time_series(request: Request):
         if not is_valid:
             raise HTTPException(status_code=400, detail=error_msg)
 
+        if out_of_core:
+            if chunk_size <= 0:
+                raise HTTPException(status_code=400, detail="chunk_size must be positive")
+            result = stream_resample_session(
+                file_id, target_frequency, original_frequency, method, chunk_size)
+            return FastJSONResponse({
+                "success": True,
+                "file_id": result['file_id'],
+                "source_file_id": file_id,
+                "frequency": result['frequency'],
+                "sample_count": result['rows_out'],
+                "source_sample_count": result['rows_in'],
+                "columns": result['columns'],
+                "method": result['method'],
+                "chunks": result['chunks']
+            })
+
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+
         # Read time series data - handle both CSV and JSON
-        import io
-        if file_extension == '.json':
-            df = parse_json_to_dataframe(content)
-        else:
-            df = pd.read_csv(io.StringIO(content))
+        df = load_dataframe(file_id, file_data)
 
         # Detect timestamp column
-        timestamp_column = None
-        for col in df.columns:
-            if any(kw in col.lower() for kw in ['time', 'timestamp', 'date']):
-                timestamp_column = col
-                break
+        timestamp_column = find_timestamp_column(df)
 
         # Perform resampling
-        resampled_df = downsample_time_series(
-            df,
-            target_frequency,
-            original_frequency,
-            timestamp_column,
-            method
-        )
+        if method == 'polyphase' or target_frequency > original_frequency:
+            resampled_df = resample_polyphase(
+                df,
+                target_frequency,
+                original_frequency,
+                timestamp_column
+            )
+        else:
+            resampled_df = downsample_time_series(
+                df,
+                target_frequency,
+                original_frequency,
+                timestamp_column,
+                method
+            )
 
-        return {
+        return FastJSONResponse({
             "success": True,
-            "data": resampled_df.to_dict('records'),
-            "frequency": target_frequency,
+            "format": data_format,
+            "data": frame_payload(resampled_df, data_format),
+            "frequency": resampled_frequency(target_frequency, original_frequency, method),
             "sample_count": len(resampled_df),
             "columns": list(resampled_df.columns)
-        }
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Error resampling time series: {str(e)}")
 
 
+def stream_merge_session(file_ids: List[str], mode: str, timestamp_columns: Optional[List[Optional[str]]] = None,
+                         tolerance_seconds: Optional[float] = None, direction: str = 'nearest',
+                         chunk_size: int = MERGE_CHUNK_SIZE) -> Dict:
+    """
+    Merge CSV sessions on their timestamps chunk by chunk into a new
+    session, never holding the recordings in memory. Mode 'concat'
+    interleaves all rows in time order (stream_concat_csv); 'asof' aligns
+    the other sessions' columns onto the first's rows (stream_asof_csv).
+    Cleaning steps still in each log are streamed first. Returns the merge
+    result plus the new 'file_id'.
+    """
+    if mode not in ('concat', 'asof'):
+        raise HTTPException(status_code=400, detail="mode must be 'concat' or 'asof'")
+    timestamp_columns = list(timestamp_columns or [None] * len(file_ids))
+    if len(timestamp_columns) != len(file_ids):
+        raise HTTPException(status_code=400, detail="timestamp_columns must have one entry per file")
+
+    sources = []
+    for file_id in file_ids:
+        # Metadata only: the content is read from disk chunk by chunk
+        file_data = uploaded_data_cache.get(file_id) or load_session_metadata(file_id)
+        content_path = session_content_path(file_id)
+        if not file_data or not content_path.exists():
+            raise HTTPException(status_code=404, detail=f"File not found: {file_id}")
+        if file_data.get('extension', '') != '.csv':
+            raise HTTPException(status_code=400, detail="Merging supports CSV files only")
+        sources.append((file_id, file_data, content_path))
+
+    new_file_id = str(uuid.uuid4())
+    output_path = session_content_path(new_file_id)
+    cleaned_paths = [content_path.with_name(f"{new_file_id}.{position}.clean.tmp")
+                     for position, (_, _, content_path) in enumerate(sources)]
+    try:
+        source_paths = [stream_cleaned_source(file_data, content_path, cleaned_path)
+                        for (_, file_data, content_path), cleaned_path in zip(sources, cleaned_paths)]
+        for position, source_path in enumerate(source_paths):
+            if not timestamp_columns[position]:
+                timestamp_columns[position] = csv_timestamp_column(source_path)
+            if not timestamp_columns[position]:
+                raise HTTPException(status_code=400,
+                                    detail=f"No timestamp column found in {sources[position][1].get('filename')}")
+        paths = [str(path) for path in source_paths]
+        if mode == 'concat':
+            result = stream_concat_csv(paths, str(output_path), timestamp_columns, chunk_size)
+        else:
+            result = stream_asof_csv(paths, str(output_path), timestamp_columns,
+                                     tolerance_seconds, direction, chunk_size)
+    except Exception:
+        if output_path.exists():
+            output_path.unlink()
+        raise
+    finally:
+        for cleaned_path in cleaned_paths:
+            if cleaned_path.exists():
+                cleaned_path.unlink()
+
+    first = sources[0][1]
+    stem, _ = os.path.splitext(first.get('filename', 'recording.csv'))
+    save_session_metadata(new_file_id, {
+        'filename': f"{stem}_merged.csv",
+        'extension': '.csv',
+        'size': output_path.stat().st_size,
+        'detected_type': first.get('detected_type', 'time_series'),
+        'uploaded_at': datetime.now().isoformat(),
+        'merged_from': list(file_ids),
+        'merge_mode': mode
+    })
+    print(f"✅ Merged {len(file_ids)} sessions ({mode}) into {result['rows_out']} rows -> {new_file_id}")
+    result['file_id'] = new_file_id
+    return result
+
+
+@app.post("/api/time-series/merge")
+async def merge_time_series(request: Request):
+    """
+    Combine several uploaded CSV time series into one new session by
+    timestamp, streaming every file so week-long recordings never have to
+    fit in memory.
+
+    Body: file_ids (two or more), mode ('concat': all rows interleaved in
+    time order, e.g. consecutive days; 'asof': the other files' columns
+    aligned onto the first file's rows, e.g. separate devices), and
+    optionally timestamp_columns (one per file, default: detected),
+    tolerance_seconds and direction ('nearest', 'backward', 'forward')
+    for 'asof', and chunk_size.
+    """
+    try:
+        body = await request.json()
+        file_ids = body.get('file_ids') or []
+        mode = body.get('mode', 'concat')
+        tolerance_seconds = body.get('tolerance_seconds')
+        chunk_size = int(body.get('chunk_size') or MERGE_CHUNK_SIZE)
+        if len(file_ids) < 2:
+            raise HTTPException(status_code=400, detail="At least two file_ids are required")
+        if chunk_size <= 0:
+            raise HTTPException(status_code=400, detail="chunk_size must be positive")
+
+        result = stream_merge_session(
+            file_ids, mode, body.get('timestamp_columns'),
+            float(tolerance_seconds) if tolerance_seconds is not None else None,
+            body.get('direction', 'nearest'), chunk_size)
+        return FastJSONResponse({
+            "success": True,
+            "file_id": result['file_id'],
+            "source_file_ids": file_ids,
+            "mode": mode,
+            "sample_count": result['rows_out'],
+            "columns": result['columns'],
+            "timestamp_column": result['timestamp_column'],
+            "sources": result['sources']
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error merging time series: {str(e)}")
+
+
+@app.post("/api/time-series/features")
+async def extract_time_series_features(request: Request, background_tasks: BackgroundTasks):
+    """
+    Turn a time series into a tabular dataset for training: each window of
+    window_seconds (every step_seconds) becomes one row of per-channel
+    statistics and Welch band powers, stored as a new CSV session.
+
+    Body: file_id, window_seconds, and optionally step_seconds, statistics,
+    bands ({name: [low_hz, high_hz]}), signal_columns (default: those
+    analyze_time_series finds), label_column (most common value per
+    window), frequency (default: detected from the timestamps; required
+    when there are none) and format for the preview.
+    """
+    try:
+        body = await request.json()
+        file_id = body.get('file_id')
+        window_seconds = body.get('window_seconds')
+        data_format = body.get('format', 'records')
+        label_column = body.get('label_column')
+        validate_data_format(data_format)
+        if not window_seconds or window_seconds <= 0:
+            raise HTTPException(status_code=400, detail="window_seconds must be positive")
+
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        df = load_dataframe(file_id, file_data)
+        analysis = analyze_time_series(df)
+        frequency = body.get('frequency')
+        if not frequency:
+            if analysis['sampling']['source'] == 'default':
+                raise HTTPException(
+                    status_code=400,
+                    detail="No timestamp column to detect the sampling frequency from; provide frequency")
+            frequency = analysis['frequency']
+        signal_columns = body.get('signal_columns') or [
+            col for col in analysis['signal_columns'] if col != label_column]
+        if not signal_columns:
+            raise HTTPException(status_code=400, detail="No signal columns to extract features from")
+        bands = body.get('bands')
+        if bands is not None:
+            bands = {name: tuple(edges) for name, edges in bands.items()}
+
+        features = extract_window_features(
+            df, signal_columns, frequency, window_seconds,
+            step_seconds=body.get('step_seconds'),
+            statistics=body.get('statistics'),
+            bands=bands,
+            timestamp_column=analysis['timestamp_column'],
+            label_column=label_column
+        )
+
+        new_file_id = str(uuid.uuid4())
+        stem, _ = os.path.splitext(file_data.get('filename', 'recording.csv'))
+        content = features.to_csv(index=False)
+        store_file_data(new_file_id, {
+            'filename': f"{stem}_features.csv",
+            'extension': '.csv',
+            'content': content,
+            'size': len(content),
+            'detected_type': 'tabular',
+            'uploaded_at': datetime.now().isoformat(),
+            'features_from': file_id,
+            'feature_config': {
+                'frequency': frequency,
+                'window_seconds': window_seconds,
+                'step_seconds': body.get('step_seconds') or window_seconds,
+                'signal_columns': signal_columns,
+                'label_column': label_column
+            }
+        })
+        background_tasks.add_task(precompute_column_analyses, new_file_id)
+        print(f"✅ Extracted {features.shape[1] - 2} features from {len(features)} windows "
+              f"of {len(signal_columns)} signals of {file_id} -> {new_file_id}")
+
+        return FastJSONResponse({
+            "success": True,
+            "file_id": new_file_id,
+            "source_file_id": file_id,
+            "frequency": frequency,
+            "window_count": len(features),
+            "signal_columns": signal_columns,
+            "columns": list(features.columns),
+            "format": data_format,
+            "preview_data": frame_payload(features.head(100), data_format)
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error extracting time series features: {str(e)}")
+
+
+@app.get("/api/time-series/range/{file_id}")
+async def get_time_series_range(file_id: str, start: int = 0, end: Optional[int] = None,
+                                width: int = LOD_DEFAULT_WIDTH, columns: Optional[str] = None):
+    """
+    Plot-ready view of samples [start, end) for a chart `width` pixels wide.
+
+    Long windows are answered from a precomputed min/max/mean pyramid, so
+    any zoom level returns at most about 2 * width buckets per signal
+    instead of every sample. The pyramid is built on the first request
+    and kept until the data changes or the cache needs the room.
+    columns: Comma-separated signal columns (default: all)
+    """
+    try:
+        if width <= 0:
+            raise HTTPException(status_code=400, detail="width must be positive")
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        pyramid = get_lod_pyramid(file_id, file_data)
+        selected = [col.strip() for col in columns.split(',') if col.strip()] if columns else None
+        # Raw samples and timestamps are read from the cached frame
+        result = pyramid.query(load_dataframe(file_id, file_data), start, end, width, selected)
+        return FastJSONResponse({
+            "success": True,
+            "timestamp_column": pyramid.timestamp_column,
+            **result
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error reading time series range: {str(e)}")
+
+
+@app.get("/api/column-analysis/{file_id}")
+async def get_column_analysis_profile(file_id: str, column_name: Optional[str] = None, top_n: int = 10,
+                                      approximate: Optional[bool] = None):
+    """
+    Profile the dataset: missing counts, distinct counts, numeric statistics,
+    detected types, outlier counts and top values for all columns at once.
+    column_name: If given, return that column's full value distribution
+                 (the shape the data cleaning page expects) instead
+    approximate: Estimate distinct counts and top values with bounded-memory
+                 sketches (default: only for very large datasets)
+    """
+    try:
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        if column_name is not None:
+            df = load_dataframe(file_id, file_data)
+            return FastJSONResponse(column_value_summary(df, column_name))
+
+        profile = get_dataset_profile(file_id, file_data, top_n=top_n, approximate=approximate)
+        return FastJSONResponse({
+            "success": True,
+            "profile": profile
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error profiling dataset: {str(e)}")
+
+
 @app.get("/api/questionnaire/column/{file_id}/{column_name}")
-async def get_column_context(file_id: str, column_name: str):
+async def get_column_context(file_id: str, column_name: str, approximate: Optional[bool] = None):
     """
     Get context and analysis for a specific column for questionnaire.
+    approximate: Estimate distinct counts and value counts with bounded-memory
+                 sketches (default: only for very large columns)
     """
     try:
         file_data = get_file_data(file_id)
         if not file_data:
             raise HTTPException(status_code=404, detail="File not found")
         
-        content = file_data.get('content', '')
-        file_extension = file_data.get('extension', '')
-        
-        # Parse data
-        if file_extension == '.json':
-            df = parse_json_to_dataframe(content)
-        else:
-            df = pd.read_csv(io.StringIO(content))
-        
-        # Analyze column
-        analysis = analyze_column(df, column_name)
+        # Cached per column version; computed on the current (cleaned) data
+        analysis = get_column_analysis(file_id, file_data, column_name, approximate=approximate)
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "analysis": analysis
-        }
+        })
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -1406,26 +2211,22 @@ async def apply_questionnaire_cleaning(request: Request):
         if not file_data:
             raise HTTPException(status_code=404, detail="File not found")
         
-        content = file_data.get('content', '')
-        file_extension = file_data.get('extension', '')
-        
-        # Parse data
-        if file_extension == '.json':
-            df = parse_json_to_dataframe(content)
-        else:
-            df = pd.read_csv(io.StringIO(content))
+        df = load_dataframe(file_id, file_data)
         
-        # Apply transformation
+        # Apply transformation, keeping the statistics it was fitted with
+        fitted = {}
         df_cleaned, transformation_summary = apply_cleaning_transformation(
-            df, column_name, answers, branch
+            df, column_name, answers, branch, fitted=fitted
         )
         
-        # Store cleaned data back to session
-        # Update the content with cleaned data
-        cleaned_content = df_cleaned.to_csv(index=False)
-        file_data['content'] = cleaned_content
-        file_data['last_cleaned'] = datetime.now().isoformat()
-        store_file_data(file_id, file_data)
+        # Log the step instead of rewriting the whole dataset
+        record_cleaning_steps(file_id, file_data, [{
+            'column_name': column_name,
+            'answers': answers,
+            'branch': branch,
+            'fitted': fitted,
+            'summary': transformation_summary
+        }], df_cleaned)
         
         # Return preview
         preview_data = df_cleaned.head(10).to_dict('records')
@@ -1441,6 +2242,252 @@ async def apply_questionnaire_cleaning(request: Request):
         raise HTTPException(status_code=500, detail=f"Error applying cleaning: {str(e)}")
 
 
+@app.post("/api/questionnaire/apply-batch")
+async def apply_questionnaire_cleaning_batch(request: Request):
+    """
+    Apply cleaning transformations for many columns in one pass.
+    Body: {file_id, columns: [{column_name, answers, branch}, ...]}
+    The data is loaded once, copied once and persisted once.
+    """
+    try:
+        body = await request.json()
+        file_id = body.get('file_id')
+        columns = body.get('columns', [])
+        
+        if not columns:
+            raise HTTPException(status_code=400, detail="No columns provided")
+        missing_names = [i for i, step in enumerate(columns) if not step.get('column_name')]
+        if missing_names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing column_name for entries: {', '.join(map(str, missing_names))}")
+        
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        df = load_dataframe(file_id, file_data)
+        
+        steps = [{
+            'column_name': step['column_name'],
+            'answers': step.get('answers', {}),
+            'branch': step.get('branch', 'unknown')
+        } for step in columns]
+        df_cleaned, summaries = apply_cleaning_batch(df, steps)
+        
+        for step, summary in zip(steps, summaries):
+            step['summary'] = summary
+        record_cleaning_steps(file_id, file_data, steps, df_cleaned)
+        
+        return FastJSONResponse({
+            "success": True,
+            "transformation_summaries": summaries,
+            "preview": df_cleaned.head(10),
+            "total_rows": len(df_cleaned),
+            "total_columns": len(df_cleaned.columns)
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying cleaning: {str(e)}")
+
+
+def stream_clean_session(file_id: str, steps: List[Dict], chunk_size: int = STREAM_CHUNK_SIZE) -> Dict:
+    """
+    Stream a CSV session's stored content through its cleaning log plus
+    `steps` and store the result as the new checkpoint, without loading the
+    data into memory. Returns stream_clean_csv's result with the summaries
+    of `steps` as 'new_summaries'. Raises ValueError if a step's column is
+    missing.
+    """
+    # Metadata only: the content is read from disk chunk by chunk
+    file_data = uploaded_data_cache.get(file_id) or load_session_metadata(file_id)
+    content_path = session_content_path(file_id)
+    if not file_data or not content_path.exists():
+        raise HTTPException(status_code=404, detail="File not found")
+    if file_data.get('extension', '') != '.csv':
+        raise HTTPException(status_code=400, detail="Out-of-core cleaning supports CSV files only")
+    
+    all_steps = file_data.get('cleaning_log', []) + steps
+    if not all_steps:
+        raise HTTPException(status_code=400, detail="No cleaning steps to apply")
+    # Checked against the header before any data is read; step numbers
+    # count the new steps only, as when they are applied in memory
+    check_step_columns(pd.read_csv(content_path, nrows=0).columns, all_steps,
+                       first_step=1 - (len(all_steps) - len(steps)))
+    
+    output_path = content_path.with_name(f"{file_id}.stream.tmp")
+    try:
+        result = stream_clean_csv(str(content_path), str(output_path), all_steps, chunk_size=chunk_size)
+    except Exception:
+        if output_path.exists():
+            output_path.unlink()
+        raise
+    os.replace(output_path, content_path)
+    
+    # The cleaned file is the new checkpoint; record the new steps with
+    # their summaries and fitted statistics
+    first_new = len(all_steps) - len(steps)
+    result['new_summaries'] = result['summaries'][first_new:]
+    for step, fitted in zip(steps, result['fitted'][first_new:]):
+        step['fitted'] = fitted
+    add_pipeline_steps(file_data, steps)
+    file_data.setdefault('transformations', []).extend(
+        summary for summary in result['new_summaries'] if summary)
+    file_data.setdefault('original_extension', file_data.get('extension', ''))
+    file_data['extension'] = '.csv'
+    file_data['cleaning_log'] = []
+    file_data['data_version'] = file_data.get('data_version', 0) + 1
+    file_data['rows_version'] = file_data.get('rows_version', 0) + 1
+    file_data['last_cleaned'] = datetime.now().isoformat()
+    file_data['checkpointed_at'] = file_data['last_cleaned']
+    save_session_metadata(file_id, file_data)
+    
+    # Cached content and frames are stale; they reload from disk on demand
+    for cache in (uploaded_data_cache, dataframe_cache, column_analysis_cache, dataset_profile_cache,
+                  lod_pyramid_cache):
+        cache.pop(file_id, None)
+    return result
+
+
+@app.post("/api/questionnaire/stream-clean")
+async def stream_questionnaire_cleaning(request: Request):
+    """
+    Clean a CSV dataset out-of-core: the stored file is streamed in chunks
+    through the logged cleaning steps (plus any new ones) and the cleaned
+    CSV is written incrementally, so the data never has to fit in memory.
+    Body: {file_id, steps?: [{column_name, answers, branch}, ...], chunk_size?}
+    """
+    try:
+        body = await request.json()
+        file_id = body.get('file_id')
+        new_steps = body.get('steps', [])
+        chunk_size = int(body.get('chunk_size', STREAM_CHUNK_SIZE))
+        
+        if chunk_size <= 0:
+            raise HTTPException(status_code=400, detail="chunk_size must be positive")
+        missing_names = [i for i, step in enumerate(new_steps) if not step.get('column_name')]
+        if missing_names:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Missing column_name for entries: {', '.join(map(str, missing_names))}")
+        
+        steps = [{
+            'column_name': step['column_name'],
+            'answers': step.get('answers', {}),
+            'branch': step.get('branch', 'unknown')
+        } for step in new_steps]
+        result = stream_clean_session(file_id, steps, chunk_size)
+        new_summaries = result['new_summaries']
+        
+        return FastJSONResponse({
+            "success": True,
+            "transformation_summaries": new_summaries,
+            "rows_in": result['rows_in'],
+            "total_rows": result['rows_out'],
+            "total_columns": len(result['columns']),
+            "columns": result['columns'],
+            "passes": result['passes']
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error streaming cleaning: {str(e)}")
+
+
+@app.get("/api/cleaning-pipeline/{file_id}")
+async def get_cleaning_pipeline(file_id: str):
+    """
+    Export every cleaning step applied to a file, with the statistics each
+    was fitted with, as a pipeline that can be applied to other data.
+    """
+    try:
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        pipeline = CleaningPipeline(file_data.get('cleaning_pipeline', []))
+        return FastJSONResponse({
+            "success": True,
+            "pipeline": pipeline.to_dict()
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting cleaning pipeline: {str(e)}")
+
+
+@app.post("/api/cleaning-pipeline/apply")
+async def apply_cleaning_pipeline(request: Request):
+    """
+    Clean a file with a fitted pipeline - e.g. a monthly refresh with the
+    statistics fitted on the original upload - without refitting anything.
+    Body: {file_id, pipeline | source_file_id, out_of_core?, chunk_size?}
+    pipeline: An exported pipeline (GET /api/cleaning-pipeline/{file_id})
+    source_file_id: Use the pipeline recorded on another file
+    out_of_core: Stream a CSV file from disk instead of loading it
+    """
+    try:
+        body = await request.json()
+        file_id = body.get('file_id')
+        
+        if body.get('pipeline') is not None:
+            pipeline = CleaningPipeline.from_dict(body['pipeline'])
+        elif body.get('source_file_id'):
+            source_data = get_file_data(body['source_file_id'])
+            if not source_data:
+                raise HTTPException(status_code=404, detail="Source file not found")
+            pipeline = CleaningPipeline(source_data.get('cleaning_pipeline', []))
+        else:
+            raise HTTPException(status_code=400, detail="Provide a pipeline or a source_file_id")
+        if len(pipeline) == 0:
+            raise HTTPException(status_code=400, detail="Pipeline has no steps")
+        
+        steps = pipeline.to_dict()['steps']
+        
+        if body.get('out_of_core'):
+            chunk_size = int(body.get('chunk_size', STREAM_CHUNK_SIZE))
+            if chunk_size <= 0:
+                raise HTTPException(status_code=400, detail="chunk_size must be positive")
+            result = stream_clean_session(file_id, steps, chunk_size)
+            return FastJSONResponse({
+                "success": True,
+                "transformation_summaries": result['new_summaries'],
+                "total_rows": result['rows_out'],
+                "total_columns": len(result['columns']),
+                "passes": result['passes']
+            })
+        
+        file_data = get_file_data(file_id)
+        if not file_data:
+            raise HTTPException(status_code=404, detail="File not found")
+        
+        df = load_dataframe(file_id, file_data)
+        df_cleaned, summaries = pipeline.transform(df)
+        
+        for step, summary in zip(steps, summaries):
+            step['summary'] = summary
+        record_cleaning_steps(file_id, file_data, steps, df_cleaned)
+        
+        return FastJSONResponse({
+            "success": True,
+            "transformation_summaries": summaries,
+            "preview": df_cleaned.head(10),
+            "total_rows": len(df_cleaned),
+            "total_columns": len(df_cleaned.columns)
+        })
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error applying cleaning pipeline: {str(e)}")
+
+
 @app.get("/api/questionnaire/summary/{file_id}")
 async def get_questionnaire_summary(file_id: str):
     """
@@ -1472,28 +2519,28 @@ async def finalize_questionnaire_cleaning(request: Request):
     try:
         body = await request.json()
         file_id = body.get('file_id')
+        data_format = body.get('format', 'records')
+        validate_data_format(data_format)
         
         file_data = get_file_data(file_id)
         if not file_data:
             raise HTTPException(status_code=404, detail="File not found")
         
-        content = file_data.get('content', '')
-        file_extension = file_data.get('extension', '')
-        
-        # Parse final cleaned data
-        if file_extension == '.json':
-            df = parse_json_to_dataframe(content)
-        else:
-            df = pd.read_csv(io.StringIO(content))
+        # Final cleaned data - materialize any pending logged steps
+        df = load_dataframe(file_id, file_data)
+        checkpoint_cleaning_log(file_id, file_data, df)
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "file_id": file_id,
-            "data": df.to_dict('records'),
+            "format": data_format,
+            "data": frame_payload(df, data_format),
             "columns": list(df.columns),
             "shape": {"rows": len(df), "columns": len(df.columns)},
-            "preview": df.head(20).to_dict('records')
-        }
+            "preview": df.head(20)
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error finalizing cleaning: {str(e)}")
 
@@ -0,0 +1,189 @@
+"""
+Dataset Profiling Utilities for ResearcherML
+Computes per-column statistics for a whole dataset in one vectorized pass
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from questionnaire_handler import detect_column_type
+from sketch_utils import sketch_column, top_value_counts, use_approximate
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    top_n: int = 10,
+    max_workers: Optional[int] = None,
+    approximate: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Profile every column of a DataFrame at once.
+
+    Missing counts, distinct counts and numeric statistics are computed with
+    DataFrame-wide reductions. Per-column work that cannot be vectorized
+    (type detection, value counts) runs on a thread pool over column groups.
+
+    Args:
+        df: DataFrame to profile
+        top_n: Number of most frequent values to report per column
+        max_workers: Threads for per-column work (None = CPU count, 1 = serial)
+        approximate: Estimate distinct counts and top values with sketches
+                     (None = only above APPROXIMATE_ROW_THRESHOLD rows)
+
+    Returns:
+        Dictionary with row/column counts and a 'columns' mapping of
+        column name to its statistics
+    """
+    total_rows = len(df)
+    approximate = use_approximate(total_rows, approximate)
+    # Sparse (one-hot) columns are densified one at a time, not as a block
+    sparse_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.SparseDtype)]
+    parts = [_numeric_statistics(df.drop(columns=sparse_columns) if sparse_columns else df)]
+    parts += [_numeric_statistics(df[[col]].sparse.to_dense()) for col in sparse_columns]
+    missing, numeric_counts, numeric_stats, outlier_counts = (
+        _concat_nonempty(pieces, axis) for pieces, axis in zip(zip(*parts), (0, 0, 1, 0))
+    )
+
+    per_column = _run_column_groups(df, top_n, max_workers, approximate)
+
+    columns = {}
+    for col in df.columns:
+        detected_type, type_details = per_column[col]['type']
+        entry = {
+            'detected_type': detected_type,
+            'type_details': type_details,
+            'missing_count': int(missing[col]),
+            'missing_pct': round(float(missing[col]) / total_rows * 100, 2) if total_rows > 0 else 0,
+            'unique_count': int(per_column[col]['unique_count']),
+            'top_values': per_column[col]['top_values']
+        }
+        if approximate:
+            entry['approximate'] = True
+        if detected_type == 'numeric' and numeric_counts[col] > 0:
+            entry.update({
+                'min': float(numeric_stats.at['min', col]),
+                'max': float(numeric_stats.at['max', col]),
+                'mean': float(numeric_stats.at['mean', col]),
+                'median': float(numeric_stats.at['median', col]),
+                'std': float(numeric_stats.at['std', col]) if numeric_counts[col] > 1 else 0.0,
+                'potential_outliers': int(outlier_counts[col])
+            })
+        columns[str(col)] = entry
+
+    return {
+        'row_count': total_rows,
+        'column_count': len(df.columns),
+        'columns': columns
+    }
+
+
+def _numeric_statistics(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.DataFrame, pd.Series]:
+    """Missing counts, numeric counts, numeric statistics and outlier counts per column."""
+    missing = df.isna().sum()
+
+    # Numeric view of the frame: numeric columns as-is, others coerced
+    numeric = df.apply(
+        lambda col: col if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col)
+        else pd.to_numeric(col, errors='coerce')
+    )
+    numeric_counts = numeric.notna().sum()
+    # Columns with no parseable numbers have no statistics to compute
+    numeric = numeric.loc[:, numeric_counts > 0]
+    if numeric.shape[1] == 0:
+        return missing, numeric_counts, pd.DataFrame(index=['min', 'max', 'mean', 'median', 'std']), pd.Series(dtype=np.int64)
+    numeric_stats = numeric.agg(['min', 'max', 'mean', 'median', 'std'])
+
+    # Values beyond 3 standard deviations, as in analyze_column
+    deviation = (numeric - numeric_stats.loc['mean']).abs()
+    outlier_counts = deviation.gt(3 * numeric_stats.loc['std']).sum()
+    return missing, numeric_counts, numeric_stats, outlier_counts
+
+
+def _concat_nonempty(pieces: Tuple, axis: int) -> Any:
+    """Concatenate per-part results along axis, skipping parts with no columns."""
+    nonempty = [piece for piece in pieces if piece.shape[axis] > 0]
+    return pd.concat(nonempty, axis=axis) if nonempty else pieces[0]
+
+
+def column_value_summary(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
+    """
+    Full value distribution for one column, in the shape the data cleaning
+    page builds locally (calculateLocalColumnData in dataCleaning.js).
+
+    Raises:
+        ValueError: If the column does not exist
+    """
+    if column_name not in df.columns:
+        raise ValueError(f"Column '{column_name}' not found in DataFrame")
+
+    column = df[column_name]
+    # Empty strings count as missing, as on the client
+    is_missing = column.isna() | (column.astype(str) == '')
+    counts = column[~is_missing].astype(str).value_counts()
+
+    return {
+        'column_name': column_name,
+        'data_type': 'number' if pd.api.types.is_numeric_dtype(column) else 'string',
+        'total_values': len(column),
+        'unique_values': int(len(counts)),
+        'missing_values': int(is_missing.sum()),
+        'missing_count': int(is_missing.sum()),
+        'value_counts': [
+            {
+                'value': value,
+                'original_value': value,
+                'count': int(count),
+                'selected': True,
+                'isNaN': False
+            }
+            for value, count in counts.items()
+        ]
+    }
+
+
+def _run_column_groups(
+    df: pd.DataFrame,
+    top_n: int,
+    max_workers: Optional[int],
+    approximate: bool
+) -> Dict[Any, Dict]:
+    """Type detection, distinct counts and top values for every column, split across threads."""
+    columns = list(df.columns)
+    workers = max_workers or min(len(columns), os.cpu_count() or 1)
+    if workers <= 1 or len(columns) <= 1:
+        return _profile_column_group(df, columns, top_n, approximate)
+
+    group_size = int(np.ceil(len(columns) / workers))
+    groups = [columns[i:i + group_size] for i in range(0, len(columns), group_size)]
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for group_result in executor.map(lambda group: _profile_column_group(df, group, top_n, approximate), groups):
+            results.update(group_result)
+    return results
+
+
+def _profile_column_group(df: pd.DataFrame, columns: List[Any], top_n: int, approximate: bool) -> Dict[Any, Dict]:
+    """Per-column work for one group of columns."""
+    results = {}
+    for col in columns:
+        column = df[col]
+        if isinstance(column.dtype, pd.SparseDtype):
+            column = column.sparse.to_dense()
+        if approximate:
+            distinct, heavy = sketch_column(column)
+            unique_count = distinct.count()
+            value_counts = top_value_counts(heavy, top_n)
+            detected = detect_column_type(column, distinct_count=unique_count)
+        else:
+            unique_count = column.nunique()
+            value_counts = column.value_counts().head(top_n)
+            detected = detect_column_type(column)
+        results[col] = {
+            'type': detected,
+            'unique_count': unique_count,
+            'top_values': {str(k): int(v) for k, v in value_counts.items()}
+        }
+    return results
@@ -5,17 +5,66 @@ Processes questionnaire answers and generates cleaning transformations
 
 import pandas as pd
 import numpy as np
+from scipy import sparse
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+import warnings
 
+from sketch_utils import sketch_column, top_value_counts, use_approximate
 
-def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
+# guess_datetime_format is public from pandas 2.2, private before that
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:
+    try:
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    except ImportError:
+        guess_datetime_format = None
+
+# From pandas 2.0 a format-less to_datetime applies the first value's format
+# to every value; 'mixed' restores parsing each value on its own
+MIXED_DATETIME_FORMAT = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+# Type detection: columns longer than TYPE_SAMPLE_SIZE are classified from a
+# sample, using a Wilson interval at TYPE_CONFIDENCE_Z (~99.7%) to decide
+# whether the sample is conclusive
+TYPE_SAMPLE_SIZE = 5000
+TYPE_CONFIDENCE_Z = 3.0
+FORMAT_GUESS_SAMPLE_SIZE = 50
+
+# One-hot encoding keeps at most ONEHOT_MAX_CATEGORIES levels (the most
+# frequent; the rest share an "other" column) and stores the indicator
+# columns sparsely above ONEHOT_SPARSE_THRESHOLD columns
+ONEHOT_MAX_CATEGORIES = 1000
+ONEHOT_SPARSE_THRESHOLD = 50
+
+
+class StatisticRequired(Exception):
+    """
+    Raised by apply_cleaning_transformation(require_fitted=True) when a step
+    needs a whole-column statistic (median, categories, ...) that is not in
+    `fitted`. Carries the column as it is at that point, so a caller that
+    sees the data in chunks can accumulate the statistic and try again.
+    `options` are the step settings the statistic depends on.
+    """
+
+    def __init__(self, key: str, values: pd.Series, options: Optional[Dict[str, Any]] = None):
+        super().__init__(f"Statistic '{key}' has not been fitted")
+        self.key = key
+        self.values = values
+        self.options = options or {}
+
+
+def analyze_column(df: pd.DataFrame, column_name: str, approximate: Optional[bool] = None) -> Dict[str, Any]:
     """
     Analyze a column and return context for questionnaire.
     
     Args:
         df: DataFrame containing the column
         column_name: Name of the column to analyze
+        approximate: Estimate distinct counts and value counts with
+                     bounded-memory sketches (None = only for columns above
+                     APPROXIMATE_ROW_THRESHOLD rows)
         
     Returns:
         Dictionary with column analysis
@@ -24,6 +73,9 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
         raise ValueError(f"Column '{column_name}' not found in DataFrame")
     
     column = df[column_name]
+    if isinstance(column.dtype, pd.SparseDtype):
+        # Sparse one-hot columns: statistics need the dense values
+        column = column.sparse.to_dense()
     
     # Basic info
     total_rows = len(df)
@@ -32,7 +84,17 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
     
     # Get sample values (non-null) - prioritize diverse values
     non_null_values = column.dropna()
-    unique_values = non_null_values.unique()
+    approximate = use_approximate(total_rows, approximate)
+    if approximate:
+        # Distinct values from a row sample instead of the whole column
+        unique_values = non_null_values.sample(min(len(non_null_values), 10000), random_state=0).unique()
+        distinct, heavy = sketch_column(column)
+        unique_count = distinct.count()
+        value_counts = top_value_counts(heavy, 50)
+    else:
+        unique_values = non_null_values.unique()
+        unique_count = column.nunique()
+        value_counts = column.value_counts()
     
     if len(unique_values) <= 8:
         # If 8 or fewer unique values, show all unique values
@@ -47,7 +109,9 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
     sample_rows = df[[column_name]].head(sample_row_count).to_dict('records')
     
     # Detect data type
-    detected_type, type_details = detect_column_type(column)
+    detected_type, type_details = detect_column_type(
+        column, distinct_count=unique_count if approximate else None
+    )
     
     # Type-specific analysis
     analysis = {
@@ -58,12 +122,18 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
         'missing_pct': round(missing_pct, 2),
         'sample_values': sample_values,
         'sample_rows': sample_rows,  # Add sample rows for table display
-        'unique_count': int(column.nunique()),
+        'unique_count': int(unique_count),
         'type_details': type_details
     }
     
+    if approximate:
+        # unique_count is within a few percent; value counts are lower
+        # bounds at most value_count_error below the true counts
+        analysis['approximate'] = True
+        analysis['unique_count_error'] = distinct.relative_error
+        analysis['value_count_error'] = heavy.max_error
+    
     # Add value_counts for ALL types (needed for distribution charts)
-    value_counts = column.value_counts()
     analysis['value_counts'] = {str(k): int(v) for k, v in value_counts.head(20).items()}
     
     # Add type-specific metadata
@@ -90,7 +160,9 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
         
     elif detected_type == 'date':
         try:
-            dates = pd.to_datetime(column, errors='coerce').dropna()
+            date_format = type_details.get('format')
+            date_options = {'format': date_format} if date_format else MIXED_DATETIME_FORMAT
+            dates = pd.to_datetime(column, errors='coerce', **date_options).dropna()
             if len(dates) > 0:
                 analysis['min_date'] = dates.min().isoformat()
                 analysis['max_date'] = dates.max().isoformat()
@@ -104,10 +176,26 @@ def analyze_column(df: pd.DataFrame, column_name: str) -> Dict[str, Any]:
     return analysis
 
 
-def detect_column_type(column: pd.Series) -> Tuple[str, Dict]:
+def detect_column_type(
+    column: pd.Series,
+    sample_size: Optional[int] = TYPE_SAMPLE_SIZE,
+    distinct_count: Optional[int] = None
+) -> Tuple[str, Dict]:
     """
     Detect the type of a column.
-    
+
+    Columns with more than sample_size values are classified from a
+    stratified sample. A sampled conversion rate is only used when its
+    confidence interval lies entirely on one side of every threshold it
+    is compared against; otherwise all values are converted.
+
+    Args:
+        column: Column to classify
+        sample_size: Values to sample before falling back to a full scan
+                     (None = always convert every value)
+        distinct_count: Number of distinct non-null values if already known
+                        (e.g. estimated by a sketch); counted otherwise
+
     Returns:
         Tuple of (type_name, details_dict)
     """
@@ -116,43 +204,149 @@ def detect_column_type(column: pd.Series) -> Tuple[str, Dict]:
     if len(non_null) == 0:
         return 'unknown', {'reason': 'all_missing'}
     
+    # Numeric dtypes convert completely by definition
+    if pd.api.types.is_numeric_dtype(non_null.dtype):
+        return 'numeric', {'conversion_rate': 1.0}
+    
+    sample = _stratified_sample(non_null, sample_size)
+    
     # Try numeric
-    numeric_converted = pd.to_numeric(non_null, errors='coerce')
-    numeric_success_rate = numeric_converted.notna().sum() / len(non_null)
+    numeric_success_rate, numeric_sampled = _settle_conversion_rate(
+        non_null, sample, _numeric_mask, thresholds=(0.1, 0.9)
+    )
     
     if numeric_success_rate > 0.9:  # 90% can be converted to numeric
-        return 'numeric', {'conversion_rate': numeric_success_rate}
+        return 'numeric', _rate_details({'conversion_rate': numeric_success_rate}, sample, numeric_sampled)
     
-    # Try datetime
+    # Try datetime, parsing with a format inferred from the values so
+    # pandas does not fall back to dateutil for every element
     try:
-        date_converted = pd.to_datetime(non_null, errors='coerce')
-        date_success_rate = date_converted.notna().sum() / len(non_null)
+        date_format = _infer_datetime_format(sample if sample is not None else non_null)
+        date_success_rate, date_sampled = _settle_conversion_rate(
+            non_null, sample, lambda values: _datetime_mask(values, date_format), thresholds=(0.8,)
+        )
+        if date_format and date_success_rate <= 0.8:
+            # Mixed formats: no single format fits, so parse value by value
+            date_format = None
+            date_success_rate, date_sampled = _settle_conversion_rate(
+                non_null, sample, lambda values: _datetime_mask(values, None), thresholds=(0.8,)
+            )
         if date_success_rate > 0.8:  # 80% can be converted to datetime
-            return 'date', {'conversion_rate': date_success_rate}
+            details = {'conversion_rate': date_success_rate}
+            if date_format:
+                details['format'] = date_format
+            return 'date', _rate_details(details, sample, date_sampled)
     except:
         pass
     
     # Check if mixed (some numeric, some text)
     if 0.1 < numeric_success_rate < 0.9:
-        return 'mixed', {
+        return 'mixed', _rate_details({
             'numeric_portion': numeric_success_rate,
             'text_portion': 1 - numeric_success_rate
-        }
+        }, sample, numeric_sampled)
     
     # Otherwise it's text/categorical
-    unique_ratio = non_null.nunique() / len(non_null)
+    if distinct_count is None:
+        distinct_count = non_null.nunique()
+    unique_ratio = distinct_count / len(non_null)
     if unique_ratio < 0.5:  # Less than 50% unique values
         return 'categorical', {'unique_ratio': unique_ratio}
     else:
         return 'text', {'unique_ratio': unique_ratio}
 
 
+def _stratified_sample(values: pd.Series, sample_size: Optional[int]) -> Optional[pd.Series]:
+    """
+    One value from each of sample_size equal-width row ranges, so every part
+    of the column is represented. None when the column is not larger than
+    sample_size.
+    """
+    n = len(values)
+    if sample_size is None or n <= sample_size:
+        return None
+    rng = np.random.default_rng(0)
+    positions = ((np.arange(sample_size) + rng.random(sample_size)) * (n / sample_size)).astype(np.int64)
+    return values.iloc[positions]
+
+
+def _wilson_interval(successes: int, n: int, z: float = TYPE_CONFIDENCE_Z) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return center - margin, center + margin
+
+
+def _settle_conversion_rate(
+    non_null: pd.Series,
+    sample: Optional[pd.Series],
+    is_converted,
+    thresholds: Tuple[float, ...]
+) -> Tuple[float, bool]:
+    """
+    Share of values that convert, and whether it was taken from the sample.
+
+    The sample decides when no threshold falls inside its confidence
+    interval; an ambiguous sample escalates to converting every value.
+    """
+    if sample is not None:
+        successes = int(is_converted(sample).sum())
+        low, high = _wilson_interval(successes, len(sample))
+        if not any(low <= threshold <= high for threshold in thresholds):
+            return successes / len(sample), True
+    return is_converted(non_null).sum() / len(non_null), False
+
+
+def _rate_details(details: Dict, sample: Optional[pd.Series], sampled: bool) -> Dict:
+    """Note the sample size on details estimated from a sample."""
+    if sampled:
+        details['sample_size'] = len(sample)
+    return details
+
+
+def _numeric_mask(values: pd.Series) -> pd.Series:
+    """Which values convert to numbers."""
+    return pd.to_numeric(values, errors='coerce').notna()
+
+
+def _datetime_mask(values: pd.Series, date_format: Optional[str]) -> pd.Series:
+    """Which values parse as datetimes, with date_format if one was inferred."""
+    if date_format:
+        return pd.to_datetime(values, format=date_format, errors='coerce').notna()
+    with warnings.catch_warnings():
+        # No common format: pandas parses each element with dateutil
+        warnings.simplefilter('ignore', UserWarning)
+        return pd.to_datetime(values, errors='coerce', **MIXED_DATETIME_FORMAT).notna()
+
+
+def _infer_datetime_format(values: pd.Series) -> Optional[str]:
+    """Most common strftime format guessed from a spread of string values."""
+    if guess_datetime_format is None:
+        return None
+    probe = _stratified_sample(values, FORMAT_GUESS_SAMPLE_SIZE)
+    probe = values if probe is None else probe
+    guesses = [guess_datetime_format(value) for value in probe if isinstance(value, str)]
+    guesses = [guess for guess in guesses if guess]
+    if not guesses:
+        return None
+    return max(set(guesses), key=guesses.count)
+
+
 def suggest_question_branch(column: pd.Series, detected_type: str, analysis: Dict) -> str:
     """Suggest which question branch to use."""
     
     if detected_type == 'numeric':
         # Check if it looks like an ID (sequential integers)
-        if analysis.get('unique_count', 0) == analysis.get('total_rows', 0):
+        unique_count = analysis.get('unique_count', 0)
+        total_rows = analysis.get('total_rows', 0)
+        if analysis.get('approximate'):
+            # Estimated distinct counts are only within a few standard errors
+            looks_like_id = unique_count >= total_rows * (1 - 3 * analysis.get('unique_count_error', 0))
+        else:
+            looks_like_id = unique_count == total_rows
+        if looks_like_id:
             return 'numeric_id'
         # Check if it has very few unique values (might be categorical)
         elif analysis.get('unique_count', 0) < 10:
@@ -185,21 +379,39 @@ def apply_cleaning_transformation(
     df: pd.DataFrame,
     column_name: str,
     answers: Dict[str, str],
-    branch: str
+    branch: str,
+    copy: bool = True,
+    fitted: Optional[Dict[str, Any]] = None,
+    require_fitted: bool = False
 ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
     """
     Apply cleaning transformation based on questionnaire answers.
     
+    Only the affected column is rebuilt. With copy=True the result is a
+    shallow copy of df: untouched columns share memory with df, and the
+    cleaned column and any new columns are set on the copy, so df itself
+    is never modified (copy-on-write for the one column).
+    
+    Statistics taken from the whole column (fill values, default outlier
+    bounds, one-hot categories, label order, reference date) are read from
+    `fitted` when present. Missing ones are computed and recorded there, so
+    the same step can later be applied identically to other data such as
+    chunks of a larger file.
+    
     Args:
         df: DataFrame to clean
         column_name: Column to clean
         answers: Dictionary of question answers
         branch: Question branch used
+        copy: If False, df may be modified in place (caller owns it)
+        fitted: Statistics for this step, filled in as they are computed
+        require_fitted: Raise StatisticRequired instead of computing a
+                        missing statistic from df. df is left unchanged
         
     Returns:
         Tuple of (cleaned_df, transformation_summary)
     """
-    df_cleaned = df.copy()
+    df_cleaned = df.copy(deep=False) if copy else df
     summary = {
         'column': column_name,
         'branch': branch,
@@ -214,46 +426,59 @@ def apply_cleaning_transformation(
         summary['transformations'].append(f"Column '{column_name}' marked for exclusion")
         return df_cleaned, summary
     
+    # Every step below works on this one Series and returns a new one;
+    # it is written back to the frame once at the end (None = dropped)
+    col = df_cleaned[column_name]
+    
     # Handle missing values
     if 'missing_strategy' in answers:
         strategy = answers['missing_strategy']
-        original_missing = df_cleaned[column_name].isna().sum()
+        original_missing = col.isna().sum()
+        # When fitting, fill values are recorded even if this data has
+        # nothing to fill, since the step may be applied to other data
+        fitting = fitted is not None
         
-        if strategy == 'fill_median' and original_missing > 0:
-            median_val = df_cleaned[column_name].median()
-            df_cleaned[column_name].fillna(median_val, inplace=True)
-            summary['transformations'].append(f"Filled {original_missing} missing values with median ({median_val:.2f})")
+        if strategy == 'fill_median' and (original_missing > 0 or fitting):
+            median_val = _statistic(fitted, 'median', col, lambda values: values.median(), require_fitted)
+            if original_missing > 0 and pd.notna(median_val):
+                col = col.fillna(median_val)
+                summary['transformations'].append(f"Filled {original_missing} missing values with median ({median_val:.2f})")
         
-        elif strategy == 'fill_mean' and original_missing > 0:
-            mean_val = df_cleaned[column_name].mean()
-            df_cleaned[column_name].fillna(mean_val, inplace=True)
-            summary['transformations'].append(f"Filled {original_missing} missing values with mean ({mean_val:.2f})")
+        elif strategy == 'fill_mean' and (original_missing > 0 or fitting):
+            mean_val = _statistic(fitted, 'mean', col, lambda values: values.mean(), require_fitted)
+            if original_missing > 0 and pd.notna(mean_val):
+                col = col.fillna(mean_val)
+                summary['transformations'].append(f"Filled {original_missing} missing values with mean ({mean_val:.2f})")
         
-        elif strategy == 'fill_mode' and original_missing > 0:
-            mode_val = df_cleaned[column_name].mode()[0] if len(df_cleaned[column_name].mode()) > 0 else None
-            if mode_val is not None:
-                df_cleaned[column_name].fillna(mode_val, inplace=True)
+        elif strategy == 'fill_mode' and (original_missing > 0 or fitting):
+            mode_val = _statistic(fitted, 'mode', col, _mode_value, require_fitted)
+            if mode_val is not None and original_missing > 0:
+                col = col.fillna(mode_val)
                 summary['transformations'].append(f"Filled {original_missing} missing values with most common value ({mode_val})")
         
         elif strategy == 'fill_unknown' and original_missing > 0:
-            df_cleaned[column_name].fillna('Unknown', inplace=True)
+            col = col.fillna('Unknown')
             summary['transformations'].append(f"Filled {original_missing} missing values with 'Unknown'")
         
         elif strategy == 'remove_rows' and original_missing > 0:
-            df_cleaned = df_cleaned.dropna(subset=[column_name])
+            # Shallow copy: the result is a new frame, not a view to warn about
+            df_cleaned = df_cleaned.dropna(subset=[column_name]).copy(deep=False)
+            col = df_cleaned[column_name]
             summary['transformations'].append(f"Removed {original_missing} rows with missing values")
     
     # Handle outliers
     if 'outlier_min' in answers or 'outlier_max' in answers:
         try:
-            col = df_cleaned[column_name]
-            min_val = float(answers.get('outlier_min', col.min()))
-            max_val = float(answers.get('outlier_max', col.max()))
+            min_val = float(answers['outlier_min'] if 'outlier_min' in answers
+                            else _statistic(fitted, 'min', col, lambda values: values.min(), require_fitted))
+            max_val = float(answers['outlier_max'] if 'outlier_max' in answers
+                            else _statistic(fitted, 'max', col, lambda values: values.max(), require_fitted))
             
-            outliers_found = ((col < min_val) | (col > max_val)).sum()
+            outlier_mask = (col < min_val) | (col > max_val)
+            outliers_found = outlier_mask.sum()
             if outliers_found > 0:
                 # Treat outliers as missing, then fill
-                df_cleaned.loc[(col < min_val) | (col > max_val), column_name] = np.nan
+                col = col.mask(outlier_mask)
                 summary['transformations'].append(f"Marked {outliers_found} outlier values as missing (outside range [{min_val}, {max_val}])")
         except (ValueError, TypeError):
             pass
@@ -263,61 +488,238 @@ def apply_cleaning_transformation(
         encoding = answers['encoding']
         
         if encoding == 'onehot':
-            # One-hot encoding
-            dummies = pd.get_dummies(df_cleaned[column_name], prefix=column_name, dtype=int)
-            df_cleaned = pd.concat([df_cleaned, dummies], axis=1)
+            # One-hot encoding, capped at max_categories levels plus "other"
+            max_categories = int(answers.get('max_categories') or ONEHOT_MAX_CATEGORIES)
+            if fitted is not None and 'categories' in fitted:
+                # Fitted before the cardinality cap existed
+                levels = {'levels': fitted['categories'], 'other': False}
+            else:
+                levels = _statistic(
+                    fitted, 'onehot_levels', col,
+                    lambda values: select_onehot_levels(values.value_counts(), max_categories),
+                    require_fitted, options={'max_categories': max_categories}
+                )
+            use_sparse = answers.get('sparse')
+            if use_sparse is None:
+                use_sparse = len(levels['levels']) + levels['other'] > ONEHOT_SPARSE_THRESHOLD
+            dummies = _onehot_columns(col, column_name, levels['levels'], levels['other'], use_sparse)
+            # Added in one concat; same-named columns from an earlier encoding are replaced
+            replaced = [name for name in dummies.columns if name in df_cleaned.columns]
+            if replaced:
+                df_cleaned = df_cleaned.drop(columns=replaced)
+            df_cleaned = pd.concat([df_cleaned, dummies], axis=1, copy=False)
             summary['new_columns'] = dummies.columns.tolist()
-            summary['transformations'].append(f"Created {len(dummies.columns)} one-hot encoded columns")
+            summary['transformations'].append(
+                f"Created {len(dummies.columns)} {'sparse ' if use_sparse else ''}one-hot encoded columns")
+            if levels['other']:
+                summary['transformations'].append(
+                    f"Grouped values outside the {len(levels['levels'])} most frequent into '{dummies.columns[-1]}'")
             # Drop original
-            df_cleaned = df_cleaned.drop(columns=[column_name])
+            col = None
         
         elif encoding == 'label':
             # Label encoding
-            unique_values = df_cleaned[column_name].dropna().unique()
+            unique_values = _statistic(
+                fitted, 'label_values', col, lambda values: values.dropna().unique().tolist(), require_fitted
+            )
             mapping = {val: idx for idx, val in enumerate(unique_values)}
-            df_cleaned[column_name] = df_cleaned[column_name].map(mapping)
+            col = col.map(mapping)
             summary['transformations'].append(f"Label encoded with mapping: {mapping}")
         
         elif encoding == 'binary':
             # Binary encoding (Yes/No, True/False, etc.)
             yes_values = answers.get('yes_values', ['yes', 'true', '1', 'y', 't'])
-            df_cleaned[column_name] = df_cleaned[column_name].astype(str).str.lower().isin(yes_values).astype(int)
+            col = col.astype(str).str.lower().isin(yes_values).astype(int)
             summary['transformations'].append("Converted to binary (0/1)")
     
     # Handle categorical cleanup (merge typos)
-    if 'merge_values' in answers:
+    if 'merge_values' in answers and col is not None:
         merges = answers['merge_values']  # Dict of {old_value: new_value}
         if merges:
-            df_cleaned[column_name] = df_cleaned[column_name].replace(merges)
+            col = col.replace(merges)
             summary['transformations'].append(f"Merged {len(merges)} duplicate/typo values")
     
     # Handle date transformations
-    if 'date_transform' in answers:
+    if 'date_transform' in answers and col is not None:
         transform = answers['date_transform']
         
         if transform == 'extract_year':
-            df_cleaned[f'{column_name}_year'] = pd.to_datetime(df_cleaned[column_name], errors='coerce').dt.year
+            df_cleaned[f'{column_name}_year'] = pd.to_datetime(col, errors='coerce').dt.year
             summary['new_columns'].append(f'{column_name}_year')
             summary['transformations'].append("Extracted year as new column")
-            df_cleaned = df_cleaned.drop(columns=[column_name])
+            col = None
         
         elif transform == 'days_elapsed':
-            reference_date = answers.get('reference_date', datetime.now().isoformat())
+            reference_date = answers.get('reference_date')
+            if reference_date is None:
+                # Fixed at fit time so re-applying the step gives the same result
+                reference_date = _statistic(fitted, 'reference_date', None, lambda _: datetime.now().isoformat())
             ref_dt = pd.to_datetime(reference_date)
-            dates = pd.to_datetime(df_cleaned[column_name], errors='coerce')
+            dates = pd.to_datetime(col, errors='coerce')
             df_cleaned[f'{column_name}_days_elapsed'] = (ref_dt - dates).dt.days
             summary['new_columns'].append(f'{column_name}_days_elapsed')
             summary['transformations'].append(f"Calculated days elapsed from {reference_date}")
-            df_cleaned = df_cleaned.drop(columns=[column_name])
+            col = None
     
     # Handle numeric to categorical conversion
-    if answers.get('treat_as') == 'categorical':
-        df_cleaned[column_name] = df_cleaned[column_name].astype(str)
+    if answers.get('treat_as') == 'categorical' and col is not None:
+        col = col.astype(str)
         summary['transformations'].append("Converted to categorical (string type)")
     
+    # Write the cleaned column back (replaces the column, never writes into df's data)
+    if col is None:
+        del df_cleaned[column_name]
+    else:
+        df_cleaned[column_name] = col
+    
     return df_cleaned, summary
 
 
+def _statistic(
+    fitted: Optional[Dict[str, Any]],
+    key: str,
+    values: Optional[pd.Series],
+    compute,
+    require_fitted: bool = False,
+    options: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Whole-column statistic used by a cleaning step: taken from fitted if
+    present, otherwise computed from values and recorded in fitted.
+    values=None marks a statistic that does not depend on the data.
+    """
+    if fitted is not None and key in fitted:
+        return fitted[key]
+    if require_fitted and values is not None:
+        raise StatisticRequired(key, values, options)
+    value = compute(values)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if fitted is not None:
+        fitted[key] = value
+    return value
+
+
+def _mode_value(values: pd.Series) -> Any:
+    """Most common value (the smallest one on ties), or None."""
+    modes = values.mode()
+    return modes[0] if len(modes) > 0 else None
+
+
+def select_onehot_levels(counts: pd.Series, max_categories: int) -> Dict[str, Any]:
+    """
+    One-hot levels from value counts: every value if there are at most
+    max_categories, otherwise the most frequent ones (ties go to the value
+    that sorts first) with the rest marked for an "other" column. Levels
+    are in the order pd.get_dummies gives their columns.
+    """
+    counts = counts[counts > 0]
+    try:
+        counts = counts.sort_index()
+    except TypeError:
+        pass
+    other = len(counts) > max_categories
+    if other:
+        kept = counts.sort_values(ascending=False, kind='stable').index[:max_categories]
+        counts = counts[counts.index.isin(kept)]
+    return {'levels': counts.index.tolist(), 'other': bool(other)}
+
+
+def _onehot_columns(
+    col: pd.Series,
+    column_name: str,
+    levels: List[Any],
+    other: bool,
+    use_sparse: bool
+) -> pd.DataFrame:
+    """
+    Indicator columns for the given levels, plus an "other" column for
+    non-missing values outside them. Sparse columns are Sparse[int64, 0]
+    and are built straight from the category codes, so memory grows with
+    the rows rather than rows x levels.
+    """
+    categorical = col.astype(pd.CategoricalDtype(levels))
+    codes = categorical.cat.codes.to_numpy()
+    names = [f"{column_name}_{level}" for level in levels]
+    other_mask = (codes == -1) & col.notna().to_numpy() if other else None
+    if other:
+        other_name = f"{column_name}_other"
+        names.append(other_name if other_name not in names else f"{column_name}__other")
+
+    if not use_sparse:
+        dummies = pd.get_dummies(categorical, prefix=column_name, dtype=int)
+        if other:
+            dummies[names[-1]] = other_mask.astype(int)
+        return dummies
+
+    rows = np.flatnonzero(codes >= 0)
+    cols = codes[rows].astype(np.int64)
+    if other:
+        other_rows = np.flatnonzero(other_mask)
+        rows = np.concatenate([rows, other_rows])
+        cols = np.concatenate([cols, np.full(len(other_rows), len(levels), dtype=np.int64)])
+    matrix = sparse.csc_matrix(
+        (np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(col), len(names))
+    )
+    return pd.DataFrame.sparse.from_spmatrix(matrix, index=col.index, columns=names)
+
+
+def replay_cleaning_log(df: pd.DataFrame, cleaning_log: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Re-apply recorded cleaning steps in order.
+    
+    Args:
+        df: DataFrame as of the last materialized checkpoint
+        cleaning_log: Steps with 'column_name', 'answers', 'branch' and (if
+                      recorded) 'fitted' keys
+        
+    Returns:
+        DataFrame with every step applied
+    """
+    df, _ = apply_cleaning_batch(df, cleaning_log, copy=False)
+    return df
+
+
+def apply_cleaning_batch(
+    df: pd.DataFrame,
+    steps: List[Dict[str, Any]],
+    copy: bool = True
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]]]:
+    """
+    Apply several questionnaire steps to one frame, copying it at most once.
+    
+    Each step's whole-column statistics are taken from step['fitted'] when
+    present and recorded there otherwise, so replaying the steps later
+    gives the same result without recomputing them.
+    
+    Args:
+        df: DataFrame to clean
+        steps: Steps with 'column_name', 'answers', 'branch' and optionally
+               'fitted' keys, in order
+        copy: If False, df may be modified in place (caller owns it)
+        
+    Returns:
+        Tuple of (cleaned_df, list of transformation summaries)
+        
+    Raises:
+        ValueError: If a step names a column that is not in df
+    """
+    missing = [step['column_name'] for step in steps if step['column_name'] not in df.columns]
+    if missing:
+        raise ValueError(f"Columns not found: {', '.join(dict.fromkeys(map(str, missing)))}")
+    # Steps never write into shared column data, so a shallow copy keeps df intact
+    df_cleaned = df.copy(deep=False) if copy else df
+    summaries = []
+    for step in steps:
+        df_cleaned, summary = apply_cleaning_transformation(
+            df_cleaned, step['column_name'], step.get('answers', {}),
+            step.get('branch', 'unknown'), copy=False,
+            fitted=step.setdefault('fitted', {})
+        )
+        summaries.append(summary)
+    return df_cleaned, summaries
+
+
 def get_cleaning_summary(transformations: List[Dict]) -> Dict[str, Any]:
     """
     Generate a summary of all cleaning transformations.
@@ -0,0 +1,170 @@
+"""
+Response Utilities for ResearcherML
+Fast JSON serialization of DataFrames for API responses
+"""
+
+import json
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+from fastapi.responses import JSONResponse
+
+# orjson is optional - it encodes large payloads several times faster than the stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Wire formats accepted by the data endpoints' format parameter:
+#   records - list of row dicts (default, repeats column names per row)
+#   columns - {column: [values...]}, numeric columns sent as plain arrays
+DATA_FORMATS = ['records', 'columns']
+
+
+def frame_payload(df: pd.DataFrame, data_format: str = 'records') -> Any:
+    """
+    Convert a DataFrame to the requested wire format.
+
+    Args:
+        df: DataFrame to convert
+        data_format: One of DATA_FORMATS
+
+    Returns:
+        JSON-serializable payload
+
+    Raises:
+        ValueError: If data_format is unknown
+    """
+    if data_format == 'records':
+        return dataframe_to_records(df)
+    if data_format == 'columns':
+        return dataframe_to_columns(df)
+    raise ValueError(f"Unknown data format '{data_format}'. Use one of: {', '.join(DATA_FORMATS)}")
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Convert a DataFrame to a list of row dicts.
+
+    Same shape as df.to_dict('records'), but built column-wise with
+    Series.tolist() instead of boxing every cell individually. Missing
+    values (NaN, NaT, None) become None so any JSON encoder accepts them.
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        List of row dictionaries
+    """
+    columns = [str(col) for col in df.columns]
+    arrays = [_column_to_list(df.iloc[:, i]) for i in range(df.shape[1])]
+    return [dict(zip(columns, row)) for row in zip(*arrays)]
+
+
+def dataframe_to_columns(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Convert a DataFrame to a column-oriented dict.
+
+    Numeric columns stay NumPy arrays so orjson can encode them without
+    creating a Python object per value (NaN becomes null).
+
+    Args:
+        df: DataFrame to convert
+
+    Returns:
+        Dictionary mapping column name to its values
+    """
+    columns = {}
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i]
+        is_numeric = (
+            pd.api.types.is_numeric_dtype(series.dtype)
+            and not pd.api.types.is_bool_dtype(series.dtype)
+        )
+        if not is_numeric:
+            columns[str(col)] = _column_to_list(series)
+        elif series.hasnans:
+            # Nullable integer columns need a float array to carry NaN
+            columns[str(col)] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            columns[str(col)] = np.ascontiguousarray(series.to_numpy())
+    return columns
+
+
+def _column_to_list(series: pd.Series) -> List[Any]:
+    """Convert a column to native Python values with None for missing entries."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        values = series.dt.strftime('%Y-%m-%dT%H:%M:%S.%f').tolist()
+    else:
+        values = series.tolist()
+
+    if not series.hasnans:
+        return values
+    missing = series.isna().to_numpy()
+    return [None if is_missing else value for value, is_missing in zip(values, missing)]
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for values neither orjson nor json handle natively."""
+    if isinstance(obj, pd.DataFrame):
+        return dataframe_to_records(obj)
+    if isinstance(obj, pd.Series):
+        return _column_to_list(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    return str(obj)
+
+
+def _replace_nan(obj: Any) -> Any:
+    """Recursively replace NaN/inf floats with None (stdlib fallback only)."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _replace_nan(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_replace_nan(v) for v in obj]
+    return obj
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to JSON bytes.
+
+    DataFrames, Series, NumPy arrays and scalars may appear anywhere in
+    content and are encoded directly. NaN and infinity become null.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    # The stdlib rejects NaN, so resolve DataFrames first and scrub floats
+    content = json.loads(json.dumps(content, default=_json_default))
+    return json.dumps(
+        _replace_nan(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse that encodes with orjson when available.
+
+    Endpoints can put DataFrames straight into the response content and
+    they are serialized as records without an intermediate to_dict().
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
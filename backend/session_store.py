@@ -4,14 +4,20 @@ File-system based session persistence to survive server restarts
 """
 
 import json
+import mmap
 import pathlib
-from typing import Dict, Any, Optional
+import shutil
+import numpy as np
+from typing import Dict, Any, Optional, BinaryIO, Union
 
 
 # Sessions directory
 SESSIONS_DIR = pathlib.Path("sessions")
 SESSIONS_DIR.mkdir(exist_ok=True)
 
+# Bytes copied at a time when streaming an upload into the blob store
+BLOB_CHUNK_SIZE = 1 << 20
+
 
 def save_session(file_id: str, data: Dict[str, Any]) -> None:
     """
@@ -21,10 +27,7 @@ def save_session(file_id: str, data: Dict[str, Any]) -> None:
         file_id: Unique file identifier
         data: Session data dictionary
     """
-    # Save metadata (everything except large content)
-    metadata = {k: v for k, v in data.items() if k not in ['content', 'data']}
-    metadata_path = SESSIONS_DIR / f"{file_id}.json"
-    metadata_path.write_text(json.dumps(metadata, indent=2, default=str))
+    save_session_metadata(file_id, data)
     
     # Save content separately as raw file (if exists)
     if 'content' in data:
@@ -39,6 +42,146 @@ def save_session(file_id: str, data: Dict[str, Any]) -> None:
                 f.write(json.dumps(row, default=str) + '\n')
 
 
+def save_session_metadata(file_id: str, data: Dict[str, Any]) -> None:
+    """
+    Save only the session metadata, leaving stored content untouched.
+    
+    Args:
+        file_id: Unique file identifier
+        data: Session data dictionary
+    """
+    metadata = {k: v for k, v in data.items() if k not in ['content', 'data']}
+    metadata_path = SESSIONS_DIR / f"{file_id}.json"
+    metadata_path.write_text(json.dumps(metadata, indent=2, default=str))
+
+
+def load_session_metadata(file_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load only the session metadata, without reading stored content.
+    
+    Args:
+        file_id: Unique file identifier
+        
+    Returns:
+        Metadata dictionary or None if not found
+    """
+    metadata_path = SESSIONS_DIR / f"{file_id}.json"
+    if not metadata_path.exists():
+        return None
+    try:
+        return json.loads(metadata_path.read_text())
+    except (json.JSONDecodeError, IOError):
+        return None
+
+
+def session_content_path(file_id: str) -> pathlib.Path:
+    """
+    Path of the stored raw content, for reading it without loading it whole.
+    
+    Args:
+        file_id: Unique file identifier
+        
+    Returns:
+        Path to the content file (may not exist)
+    """
+    return SESSIONS_DIR / f"{file_id}.data"
+
+
+def session_blob_path(file_id: str) -> pathlib.Path:
+    """
+    Path of the stored raw bytes of a binary (non-text) upload.
+    
+    Args:
+        file_id: Unique file identifier
+        
+    Returns:
+        Path to the blob file (may not exist)
+    """
+    return SESSIONS_DIR / f"{file_id}.bin"
+
+
+def save_session_blob(file_id: str, source: Union[bytes, BinaryIO], chunk_size: int = BLOB_CHUNK_SIZE) -> int:
+    """
+    Store raw bytes exactly as uploaded. File objects are copied in
+    chunks, so the upload is never held in memory as a whole.
+    
+    Args:
+        file_id: Unique file identifier
+        source: Bytes or a binary file object positioned at the start
+        chunk_size: Bytes copied at a time
+        
+    Returns:
+        Number of bytes stored
+    """
+    blob_path = session_blob_path(file_id)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        blob_path.write_bytes(source)
+    else:
+        with open(blob_path, 'wb') as blob:
+            shutil.copyfileobj(source, blob, chunk_size)
+    return blob_path.stat().st_size
+
+
+def open_session_blob(file_id: str, memory_map: bool = False) -> Optional[Union[BinaryIO, mmap.mmap]]:
+    """
+    Open stored raw bytes for reading; the caller closes the result.
+    
+    Args:
+        file_id: Unique file identifier
+        memory_map: Return a read-only memory map instead of a file handle
+        
+    Returns:
+        Binary file handle or mmap (empty blobs always get a file handle),
+        or None if not found
+    """
+    blob_path = session_blob_path(file_id)
+    if not blob_path.exists():
+        return None
+    handle = open(blob_path, 'rb')
+    if not memory_map or blob_path.stat().st_size == 0:
+        return handle
+    with handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def delete_session_blob(file_id: str) -> None:
+    """
+    Remove stored raw bytes, e.g. once they are decoded into an array.
+    
+    Args:
+        file_id: Unique file identifier
+    """
+    session_blob_path(file_id).unlink(missing_ok=True)
+
+
+def save_session_array(file_id: str, array: np.ndarray) -> None:
+    """
+    Save a decoded numeric array (e.g. audio samples) in its own dtype.
+    
+    Args:
+        file_id: Unique file identifier
+        array: Array to store
+    """
+    np.save(SESSIONS_DIR / f"{file_id}.npy", array, allow_pickle=False)
+
+
+def load_session_array(file_id: str, memory_map: bool = True) -> Optional[np.ndarray]:
+    """
+    Load an array saved with save_session_array.
+    
+    Args:
+        file_id: Unique file identifier
+        memory_map: Memory-map the file read-only instead of reading it
+        
+    Returns:
+        Array or None if not found
+    """
+    array_path = SESSIONS_DIR / f"{file_id}.npy"
+    if not array_path.exists():
+        return None
+    return np.load(array_path, mmap_mode='r' if memory_map else None, allow_pickle=False)
+
+
 def load_session(file_id: str) -> Optional[Dict[str, Any]]:
     """
     Load session data from disk.
@@ -89,7 +232,7 @@ def delete_session(file_id: str) -> None:
     Args:
         file_id: Unique file identifier
     """
-    for suffix in ['.json', '.data', '.jsonl']:
+    for suffix in ['.json', '.data', '.jsonl', '.npy', '.bin']:
         path = SESSIONS_DIR / f"{file_id}{suffix}"
         if path.exists():
             path.unlink()
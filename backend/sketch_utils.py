@@ -0,0 +1,199 @@
+"""
+Sketch Utilities for ResearcherML
+Bounded-memory approximate distinct counts and top values for very large columns
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, List, Optional, Tuple
+
+
+# Columns with more rows than this use approximate statistics by default
+APPROXIMATE_ROW_THRESHOLD = 5_000_000
+
+# Rows hashed and counted at a time; bounds the per-chunk working memory
+SKETCH_CHUNK_SIZE = 1_000_000
+
+# HyperLogLog with 2**14 one-byte registers: ~0.8% relative standard error
+HLL_PRECISION = 14
+
+# Counters kept by the heavy-hitters summary
+HEAVY_HITTER_CAPACITY = 1000
+
+
+def use_approximate(row_count: int, approximate: Optional[bool] = None) -> bool:
+    """
+    Resolve a per-request approximate flag.
+
+    Args:
+        row_count: Number of rows in the column
+        approximate: True/False to force a mode, None to decide by row count
+
+    Returns:
+        Whether approximate statistics should be used
+    """
+    if approximate is None:
+        return row_count > APPROXIMATE_ROW_THRESHOLD
+    return bool(approximate)
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """64-bit hashes of values; equal values get equal hashes."""
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-value counter.
+
+    Uses 2**precision bytes however many values are added. The relative
+    standard error of count() is about 1.04 / sqrt(2**precision). Sketches
+    with the same precision merge by taking register-wise maxima.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of count()."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add values given as 64-bit hashes (see hash_values)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        remaining_bits = 64 - self.precision
+        index = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << remaining_bits) - 1)
+        # Position of the leftmost 1-bit in the remaining bits
+        rank = (remaining_bits + 1 - _bit_length(remainder)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+class HeavyHitters:
+    """
+    Mergeable heavy-hitters summary (Misra-Gries, the counter-based family
+    Space-Saving belongs to).
+
+    Keeps at most `capacity` counters. A reported count is never above the
+    true count and at most `max_error` below it, where
+    max_error <= total / (capacity + 1). Any value occurring more often
+    than that is guaranteed to be kept.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTER_CAPACITY):
+        self.capacity = capacity
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=object)
+        self.max_error = 0
+        self.total = 0
+
+    def add(self, values: pd.Series, hashes: Optional[np.ndarray] = None) -> None:
+        """
+        Count a batch of values.
+
+        The batch is counted exactly (by hash) and then merged into the
+        summary, so memory is bounded by the batch size plus capacity.
+        """
+        if hashes is None:
+            hashes = hash_values(values)
+        keys, first, counts = np.unique(hashes, return_index=True, return_counts=True)
+        representatives = np.asarray(values.to_numpy()[first], dtype=object)
+        self.total += len(hashes)
+        self._merge(keys, counts, representatives)
+
+    def merge(self, other: 'HeavyHitters') -> None:
+        """Fold another summary into this one."""
+        self.total += other.total
+        self.max_error += other.max_error
+        self._merge(other.keys, other.counts, other.values)
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        """The k values with the highest counts, as (value, count) pairs."""
+        order = np.argsort(-self.counts, kind='stable')[:k]
+        return [(self.values[i], int(self.counts[i])) for i in order]
+
+    def _merge(self, keys: np.ndarray, counts: np.ndarray, values: np.ndarray) -> None:
+        all_keys = np.concatenate([self.keys, keys])
+        all_values = np.concatenate([self.values, values])
+        unique_keys, first, inverse = np.unique(all_keys, return_index=True, return_inverse=True)
+        merged = np.bincount(inverse, weights=np.concatenate([self.counts, counts])).astype(np.int64)
+        merged_values = all_values[first]
+
+        if len(unique_keys) > self.capacity:
+            # Subtract the (capacity + 1)-th largest count from every counter
+            # and drop those that reach zero
+            cutoff = np.partition(merged, len(merged) - self.capacity - 1)[len(merged) - self.capacity - 1]
+            merged = merged - cutoff
+            keep = merged > 0
+            unique_keys, merged, merged_values = unique_keys[keep], merged[keep], merged_values[keep]
+            self.max_error += int(cutoff)
+
+        self.keys, self.counts, self.values = unique_keys, merged, merged_values
+
+
+def sketch_column(
+    column: pd.Series,
+    capacity: int = HEAVY_HITTER_CAPACITY,
+    precision: int = HLL_PRECISION,
+    chunk_size: int = SKETCH_CHUNK_SIZE
+) -> Tuple[HyperLogLog, HeavyHitters]:
+    """
+    Build distinct-count and heavy-hitter sketches of a column's non-null
+    values, one chunk at a time.
+
+    Args:
+        column: Column to sketch
+        capacity: Counters kept by the heavy-hitters summary
+        precision: HyperLogLog precision
+        chunk_size: Rows processed per chunk
+
+    Returns:
+        Tuple of (HyperLogLog, HeavyHitters)
+    """
+    distinct = HyperLogLog(precision)
+    heavy = HeavyHitters(capacity)
+    for start in range(0, len(column), chunk_size):
+        chunk = column.iloc[start:start + chunk_size].dropna()
+        if len(chunk) == 0:
+            continue
+        hashes = hash_values(chunk)
+        distinct.add_hashes(hashes)
+        heavy.add(chunk, hashes)
+    return distinct, heavy
+
+
+def top_value_counts(heavy: HeavyHitters, k: int) -> pd.Series:
+    """Top k values of a summary as a Series shaped like value_counts()."""
+    top = heavy.top(k)
+    return pd.Series([count for _, count in top], index=[value for value, _ in top], dtype=np.int64)
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Vectorized int.bit_length() for uint64 arrays."""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        values[high] >>= np.uint64(shift)
+    return length + (values > 0)
@@ -0,0 +1,262 @@
+"""
+Streaming Cleaning for ResearcherML
+Out-of-core replay of questionnaire cleaning steps over CSV files read in chunks
+"""
+
+import re
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple
+
+from questionnaire_handler import apply_cleaning_transformation, StatisticRequired, select_onehot_levels
+
+
+# Rows read, cleaned and written per chunk
+STREAM_CHUNK_SIZE = 200_000
+
+# Summary messages whose leading number counts rows, so it adds up across chunks
+_ROW_COUNT_MESSAGE = re.compile(r'^(Filled|Removed|Marked) (\d+) (.*)$')
+
+
+def stream_clean_csv(
+    source_path: str,
+    output_path: str,
+    steps: List[Dict[str, Any]],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Apply cleaning steps to a CSV file without loading it into memory.
+
+    The file is read in chunks and each chunk goes through the steps in
+    order. Steps that need a statistic of the whole column (median, mode,
+    one-hot categories, ...) cannot be applied chunk by chunk until that
+    statistic is known, so a pass that meets one only accumulates it and
+    the file is read again once it is fitted. Data that needs no
+    statistics is cleaned in a single pass; the usual fill/encode steps
+    take two. Cleaned chunks are appended to output_path as they are
+    produced.
+
+    Memory is bounded by the chunk size, except for median fills, which
+    hold that one column's non-missing values, and mode fills and one-hot
+    encodings, which hold its distinct values with their counts.
+
+    Args:
+        source_path: CSV file to clean
+        output_path: Where to write the cleaned CSV
+        steps: Steps with 'column_name', 'answers', 'branch' and optionally
+               'fitted' (statistics from an earlier fit) keys, in order
+        chunk_size: Rows per chunk
+
+    Returns:
+        Dictionary with row counts, number of passes, per-step summaries
+        and the fitted statistics of every step
+
+    Raises:
+        ValueError: If a step's column is neither in the file nor created
+                    by an earlier step
+    """
+    check_step_columns(pd.read_csv(source_path, nrows=0).columns, steps)
+    fitted = [dict(step.get('fitted') or {}) for step in steps]
+    passes = 0
+
+    while True:
+        passes += 1
+        accumulators = {}
+        summaries = [[] for _ in steps]
+        rows_in = rows_out = 0
+        columns = []
+        writing = True
+
+        with open(output_path, 'w', newline='') as output:
+            reader = pd.read_csv(source_path, chunksize=chunk_size)
+            for chunk_number, chunk in enumerate(reader):
+                rows_in += len(chunk)
+                chunk, chunk_summaries, complete = _clean_chunk(chunk, steps, fitted, accumulators)
+                # Output is only kept from a pass where every chunk was fully cleaned
+                writing = writing and complete
+                if not writing:
+                    continue
+                chunk.to_csv(output, header=(chunk_number == 0), index=False)
+                rows_out += len(chunk)
+                columns = chunk.columns.tolist()
+                for step_summaries, summary in zip(summaries, chunk_summaries):
+                    step_summaries.append(summary)
+
+        if writing:
+            break
+
+        for (step_index, key), accumulator in accumulators.items():
+            fitted[step_index][key] = accumulator.result()
+        print(f"🔁 Fitted {len(accumulators)} statistics in pass {passes}, reading {source_path} again")
+
+    return {
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'columns': columns,
+        'passes': passes,
+        'summaries': [_merge_summaries(step_summaries) for step_summaries in summaries],
+        'fitted': fitted
+    }
+
+
+def check_step_columns(columns: List[str], steps: List[Dict[str, Any]], first_step: int = 1) -> None:
+    """
+    Check that each step's column exists when the step runs, without
+    reading any data: it is in `columns` (e.g. a CSV header) or was added
+    by an earlier step. One-hot levels are only known once fitted, so
+    after a one-hot step any column named '{column}_...' is accepted.
+
+    Args:
+        columns: Columns of the data before the first step
+        steps: Steps with 'column_name' and 'answers' keys, in order
+        first_step: Number of the first step in error messages
+
+    Raises:
+        ValueError: If a step's column is not there, as CleaningPipeline.transform
+    """
+    available = set(columns)
+    onehot_prefixes = []
+    for index, step in enumerate(steps):
+        column_name = step['column_name']
+        if column_name not in available and not str(column_name).startswith(tuple(onehot_prefixes)):
+            raise ValueError(f"Column '{column_name}' needed by step {first_step + index} not found in data")
+        answers = step.get('answers', {})
+        # Same order as apply_cleaning_transformation: excluded columns are
+        # kept as they are, one-hot encoding wins over a date transform
+        if answers.get('q1') in ['id_code', 'free_text'] or answers.get('exclude'):
+            continue
+        if answers.get('encoding') == 'onehot':
+            onehot_prefixes.append(f"{column_name}_")
+            available.discard(column_name)
+        elif answers.get('date_transform') in ('extract_year', 'days_elapsed'):
+            suffix = 'year' if answers['date_transform'] == 'extract_year' else 'days_elapsed'
+            available.add(f"{column_name}_{suffix}")
+            available.discard(column_name)
+
+
+def _clean_chunk(
+    chunk: pd.DataFrame,
+    steps: List[Dict[str, Any]],
+    fitted: List[Dict[str, Any]],
+    accumulators: Dict[Tuple[int, str], '_StatisticAccumulator']
+) -> Tuple[pd.DataFrame, List[Dict[str, Any]], bool]:
+    """
+    Run one chunk through the steps, accumulating statistics that are not
+    fitted yet. Once a step is held up, later steps on the same column (or
+    on any column, if the held-up step removes rows) are skipped too.
+
+    Returns:
+        Tuple of (chunk, step summaries, whether every step was applied)
+    """
+    blocked = set()
+    summaries = []
+    for step_index, step in enumerate(steps):
+        column_name = step['column_name']
+        answers = step.get('answers', {})
+        removes_rows = answers.get('missing_strategy') == 'remove_rows'
+
+        # A missing column may be one a held-up step has yet to create
+        if column_name in blocked or (blocked and column_name not in chunk.columns):
+            blocked.add(column_name)
+            if removes_rows:
+                break
+            continue
+
+        try:
+            chunk, summary = apply_cleaning_transformation(
+                chunk, column_name, answers, step.get('branch', 'unknown'),
+                copy=False, fitted=fitted[step_index], require_fitted=True
+            )
+            summaries.append(summary)
+        except StatisticRequired as e:
+            accumulator = accumulators.setdefault((step_index, e.key), _StatisticAccumulator(e.key, e.options))
+            accumulator.add(e.values)
+            blocked.add(column_name)
+            if removes_rows:
+                break
+
+    return chunk, summaries, not blocked
+
+
+class _StatisticAccumulator:
+    """Accumulates one whole-column statistic over chunks."""
+
+    def __init__(self, key: str, options: Optional[Dict[str, Any]] = None):
+        if key not in ('median', 'mean', 'mode', 'min', 'max', 'onehot_levels', 'label_values'):
+            raise ValueError(f"Cannot accumulate statistic '{key}' over chunks")
+        self.key = key
+        self.options = options or {}
+        self.pieces = []
+        self.total = 0.0
+        self.count = 0
+        self.counts = None
+        self.extreme = None
+        self.seen = {}
+
+    def add(self, values: pd.Series) -> None:
+        if self.key == 'median':
+            self.pieces.append(values.dropna())
+        elif self.key == 'mean':
+            if not pd.api.types.is_numeric_dtype(values):
+                raise TypeError(f"Cannot compute the mean of non-numeric column '{values.name}'")
+            self.total += float(values.sum())
+            self.count += int(values.count())
+        elif self.key in ('mode', 'onehot_levels'):
+            value_counts = values.value_counts()
+            self.counts = value_counts if self.counts is None else self.counts.add(value_counts, fill_value=0)
+        elif self.key in ('min', 'max'):
+            chunk_extreme = values.min() if self.key == 'min' else values.max()
+            if pd.isna(chunk_extreme):
+                return
+            if self.extreme is None:
+                self.extreme = chunk_extreme
+            else:
+                self.extreme = min(self.extreme, chunk_extreme) if self.key == 'min' else max(self.extreme, chunk_extreme)
+        else:
+            # dict keeps first-appearance order, which label encoding uses
+            self.seen.update(dict.fromkeys(values.dropna().unique().tolist()))
+
+    def result(self) -> Any:
+        if self.key == 'median':
+            value = pd.concat(self.pieces).median() if self.pieces else np.nan
+        elif self.key == 'mean':
+            value = self.total / self.count if self.count else np.nan
+        elif self.key == 'mode':
+            if self.counts is None or len(self.counts) == 0:
+                return None
+            # Smallest of the most common values, as Series.mode()[0]
+            modes = self.counts.index[self.counts == self.counts.max()]
+            try:
+                value = sorted(modes)[0]
+            except TypeError:
+                value = modes[0]
+        elif self.key in ('min', 'max'):
+            value = np.nan if self.extreme is None else self.extreme
+        elif self.key == 'onehot_levels':
+            counts = self.counts if self.counts is not None else pd.Series([], dtype=np.int64)
+            return select_onehot_levels(counts, self.options['max_categories'])
+        else:
+            return list(self.seen)
+        return value.item() if isinstance(value, np.generic) else value
+
+
+def _merge_summaries(summaries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Combine one step's per-chunk summaries, adding up row counts."""
+    if not summaries:
+        return None
+    merged = dict(summaries[0])
+    messages = {}
+    for summary in summaries:
+        for message in summary['transformations']:
+            match = _ROW_COUNT_MESSAGE.match(message)
+            if match:
+                template = (match.group(1), match.group(3))
+                messages[template] = messages.get(template, 0) + int(match.group(2))
+            else:
+                messages.setdefault(message, None)
+    merged['transformations'] = [
+        f"{template[0]} {count} {template[1]}" if count is not None else template
+        for template, count in messages.items()
+    ]
+    return merged
+
@@ -0,0 +1,257 @@
+"""
+Streaming Merge for ResearcherML
+Out-of-core concatenation and timestamp alignment of time series stored as CSV
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional
+
+from time_series_utils import timestamp_seconds
+
+
+# Rows read per chunk from each input
+MERGE_CHUNK_SIZE = 500_000
+
+# Temporary column holding each row's timestamp in seconds
+_TIME_KEY = '__merge_seconds'
+
+
+class _SortedChunkReader:
+    """
+    Reads a CSV in chunks into a buffer of rows ordered by timestamp.
+
+    Rows whose timestamp cannot be parsed are dropped; chunks that are not
+    in order are sorted (and counted), so a disordered file is only
+    ordered within each chunk.
+    """
+
+    def __init__(self, path: str, timestamp_column: str, chunk_size: int):
+        self.timestamp_column = timestamp_column
+        self.reader = pd.read_csv(path, chunksize=chunk_size)
+        self.buffer = None
+        self.exhausted = False
+        self.rows_read = 0
+        self.dropped_rows = 0
+        self.unsorted_chunks = 0
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.buffer[_TIME_KEY].to_numpy() if self.buffer is not None else np.empty(0)
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the file is exhausted."""
+        chunk = next(self.reader, None)
+        if chunk is None:
+            self.exhausted = True
+            return False
+        self.rows_read += len(chunk)
+        chunk[_TIME_KEY] = timestamp_seconds(chunk[self.timestamp_column], self.timestamp_column).to_numpy()
+        valid = chunk[_TIME_KEY].notna()
+        if not valid.all():
+            self.dropped_rows += int((~valid).sum())
+            chunk = chunk[valid]
+        if not chunk[_TIME_KEY].is_monotonic_increasing:
+            self.unsorted_chunks += 1
+            chunk = chunk.sort_values(_TIME_KEY, kind='stable')
+        self.buffer = chunk if self.buffer is None or len(self.buffer) == 0 else pd.concat(
+            [self.buffer, chunk], ignore_index=True)
+        return True
+
+    def refill(self) -> None:
+        """Read until the buffer holds a row or the file is exhausted."""
+        while not self.exhausted and len(self.times) == 0:
+            self.fill()
+
+    def take(self, count: int) -> pd.DataFrame:
+        """Remove and return the first count buffered rows."""
+        taken = self.buffer.iloc[:count]
+        self.buffer = self.buffer.iloc[count:]
+        return taken
+
+    def summary(self) -> Dict[str, int]:
+        return {'rows_read': self.rows_read, 'dropped_rows': self.dropped_rows,
+                'unsorted_chunks': self.unsorted_chunks}
+
+
+def stream_concat_csv(
+    source_paths: List[str],
+    output_path: str,
+    timestamp_columns: List[str],
+    chunk_size: int = MERGE_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Interleave the rows of several time-sorted CSV files into one file
+    sorted by timestamp (a k-way merge), e.g. per-day recordings into one
+    week.
+
+    Each file is read in chunks. Every round writes out all buffered rows
+    up to the smallest "last buffered timestamp" of the files still being
+    read - no later row of any file can come before those - and refills
+    the files that ran dry. Memory is bounded by about two chunks per file.
+
+    Args:
+        source_paths: CSV files, each sorted by its timestamp column
+        output_path: Where to write the merged CSV
+        timestamp_columns: Timestamp column of each file; the output uses
+                           the first name
+        chunk_size: Rows read per chunk from each file
+
+    Returns:
+        Dictionary with row counts, output columns and per-source summaries
+
+    Raises:
+        ValueError: If there are fewer than two sources or a column is missing
+    """
+    _check_sources(source_paths, timestamp_columns)
+    output_time = timestamp_columns[0]
+    # Union of all columns, in order of first appearance
+    columns = {}
+    for path, time_column in zip(source_paths, timestamp_columns):
+        header = pd.read_csv(path, nrows=0).columns
+        columns.update(dict.fromkeys(output_time if col == time_column else col for col in header))
+    columns = list(columns)
+
+    readers = [_SortedChunkReader(path, col, chunk_size) for path, col in zip(source_paths, timestamp_columns)]
+    rows_out = 0
+    with open(output_path, 'w', newline='') as output:
+        pd.DataFrame(columns=columns).to_csv(output, index=False)
+        while True:
+            # Files that were drained need their next chunk
+            for reader in readers:
+                reader.refill()
+            if all(len(reader.times) == 0 for reader in readers):
+                break
+            watermark = min((reader.times[-1] for reader in readers if not reader.exhausted), default=np.inf)
+            pieces = []
+            for reader in readers:
+                count = int(np.searchsorted(reader.times, watermark, side='right'))
+                if count:
+                    pieces.append(reader.take(count).rename(columns={reader.timestamp_column: output_time}))
+            if pieces:
+                merged = pd.concat(pieces, ignore_index=True)
+                merged = merged.iloc[np.argsort(merged[_TIME_KEY].to_numpy(), kind='stable')]
+                merged.reindex(columns=columns).to_csv(output, header=False, index=False)
+                rows_out += len(merged)
+
+    return {
+        'mode': 'concat',
+        'rows_out': rows_out,
+        'columns': columns,
+        'timestamp_column': output_time,
+        'sources': [reader.summary() for reader in readers]
+    }
+
+
+def stream_asof_csv(
+    source_paths: List[str],
+    output_path: str,
+    timestamp_columns: List[str],
+    tolerance_seconds: Optional[float] = None,
+    direction: str = 'nearest',
+    chunk_size: int = MERGE_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Align the columns of other time-sorted CSV files onto the rows of the
+    first (an as-of join), e.g. channels recorded by separate devices.
+
+    Each row of the first file gets, from every other file, the row whose
+    timestamp is nearest to its own (or the latest at or before it, with
+    direction='backward', or the earliest at or after it, with 'forward'),
+    if within tolerance_seconds; otherwise those columns are empty. The
+    first file is streamed chunk by chunk; the others are read just far
+    enough ahead to cover each chunk, so memory is bounded by a few chunks
+    per file. Rows of the first file without a parseable timestamp are
+    dropped.
+
+    Args:
+        source_paths: CSV files, each sorted by its timestamp column
+        output_path: Where to write the aligned CSV
+        timestamp_columns: Timestamp column of each file; the output keeps
+                           the first file's
+        tolerance_seconds: Largest time difference for a match (None = any)
+        direction: 'nearest', 'backward' or 'forward'
+        chunk_size: Rows read per chunk from each file
+
+    Returns:
+        Dictionary with row counts, output columns and per-source
+        summaries, including how many rows found a match in each file
+
+    Raises:
+        ValueError: If the sources, direction or tolerance are invalid
+    """
+    _check_sources(source_paths, timestamp_columns)
+    if direction not in ('nearest', 'backward', 'forward'):
+        raise ValueError("direction must be 'nearest', 'backward' or 'forward'")
+    if tolerance_seconds is not None and tolerance_seconds < 0:
+        raise ValueError("tolerance_seconds must not be negative")
+
+    primary = _SortedChunkReader(source_paths[0], timestamp_columns[0], chunk_size)
+    others = [_SortedChunkReader(path, col, chunk_size)
+              for path, col in zip(source_paths[1:], timestamp_columns[1:])]
+
+    # Columns of later files are renamed if they collide with earlier ones
+    columns = list(pd.read_csv(source_paths[0], nrows=0).columns)
+    renames = []
+    for position, (path, time_column) in enumerate(zip(source_paths[1:], timestamp_columns[1:]), start=2):
+        rename = {}
+        for col in pd.read_csv(path, nrows=0).columns:
+            if col == time_column:
+                continue
+            name = col if col not in columns else f"{col}_{position}"
+            rename[col] = name
+            columns.append(name)
+        renames.append(rename)
+    matched = [0] * len(others)
+
+    rows_out = 0
+    reach = tolerance_seconds or 0.0
+    with open(output_path, 'w', newline='') as output:
+        pd.DataFrame(columns=columns).to_csv(output, index=False)
+        while primary.fill():
+            chunk = primary.take(len(primary.buffer))
+            if len(chunk) == 0:
+                continue
+            last = chunk[_TIME_KEY].iloc[-1]
+            for index, (reader, rename) in enumerate(zip(others, renames)):
+                # Read ahead until a row lies past this chunk's reach
+                while not reader.exhausted and (len(reader.times) == 0 or reader.times[-1] <= last + reach):
+                    reader.fill()
+                if reader.buffer is None or len(reader.buffer) == 0:
+                    chunk = chunk.assign(**{name: np.nan for name in rename.values()})
+                    continue
+                right = reader.buffer[[_TIME_KEY] + list(rename)].rename(columns=rename)
+                right['__matched'] = True
+                chunk = pd.merge_asof(chunk, right, on=_TIME_KEY, direction=direction,
+                                      tolerance=tolerance_seconds)
+                matched[index] += int(chunk['__matched'].notna().sum())
+                chunk = chunk.drop(columns='__matched')
+                # Later chunks only need rows from the last one at or before this chunk's end
+                keep_from = max(int(np.searchsorted(reader.times, last - reach, side='right')) - 1, 0)
+                reader.take(keep_from)
+            chunk.reindex(columns=columns).to_csv(output, header=False, index=False)
+            rows_out += len(chunk)
+
+    sources = [primary.summary()] + [reader.summary() for reader in others]
+    for summary, count in zip(sources[1:], matched):
+        summary['matched_rows'] = count
+    return {
+        'mode': 'asof',
+        'rows_out': rows_out,
+        'columns': columns,
+        'timestamp_column': timestamp_columns[0],
+        'tolerance_seconds': tolerance_seconds,
+        'direction': direction,
+        'sources': sources
+    }
+
+
+def _check_sources(source_paths: List[str], timestamp_columns: List[str]) -> None:
+    """Validate source/timestamp lists before any file is written."""
+    if len(source_paths) < 2:
+        raise ValueError("Merging needs at least two sources")
+    if len(timestamp_columns) != len(source_paths):
+        raise ValueError("Every source needs a timestamp column")
+    for path, col in zip(source_paths, timestamp_columns):
+        if col not in pd.read_csv(path, nrows=0).columns:
+            raise ValueError(f"Timestamp column '{col}' not found in {path}")
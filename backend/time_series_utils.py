@@ -3,10 +3,56 @@ Time Series Utilities for ResearcherML
 Provides analysis, resampling, and audio processing for time series data
 """
 
+import os
+import re
+import warnings
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
 from scipy import signal as scipy_signal
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+
+# Rows read and resampled at a time by stream_resample_csv
+RESAMPLE_CHUNK_SIZE = 1_000_000
+
+# Largest up- or down-sampling ratio accepted
+MAX_RESAMPLE_RATIO = 1000
+
+# Non-integer ratios are approximated by up/down with down at most this;
+# the filter has ~20 * max(up, down) taps, of which each output sample
+# uses ~20 * max(up, down) / up, so the cost stays linear in the samples
+RESAMPLE_MAX_DENOMINATOR = 1000
+
+
+# Values converted to float64 at a time by channel_statistics (~128 MB)
+CHANNEL_BLOCK_ELEMENTS = 1 << 24
+
+# Frames decoded at a time by decode_audio
+AUDIO_BLOCK_FRAMES = 1 << 16
+
+# Buckets in the peak envelope sent with audio previews
+AUDIO_ENVELOPE_BUCKETS = 2000
+
+# Timestamps examined by analyze_sampling, taken as evenly spaced runs of
+# consecutive rows so intervals stay meaningful on very long recordings
+FREQUENCY_SAMPLE_SIZE = 100_000
+FREQUENCY_SAMPLE_RUNS = 10
+
+# An interval longer than this many median intervals is a gap
+GAP_FACTOR = 1.5
+
+# Sampling is irregular when the intervals' median absolute deviation
+# exceeds this fraction of the median interval
+IRREGULAR_JITTER = 0.05
+
+# Column names that suggest a time axis
+TIMESTAMP_KEYWORDS = ('time', 'timestamp', 'date', 'epoch')
+
+# Seconds per unit for numeric timestamps whose name ends in a unit
+_TIME_UNITS = {'s': 1.0, 'sec': 1.0, 'ms': 1e-3, 'msec': 1e-3, 'millis': 1e-3,
+               'us': 1e-6, 'usec': 1e-6, 'micros': 1e-6, 'ns': 1e-9, 'nanos': 1e-9}
 
 
 def detect_frequency(df: pd.DataFrame, timestamp_column: Optional[str] = None) -> float:
@@ -15,27 +61,183 @@ def detect_frequency(df: pd.DataFrame, timestamp_column: Optional[str] = None) -
     
     Args:
         df: Time series DataFrame
-        timestamp_column: Name of the timestamp column (if exists)
+        timestamp_column: Name of the timestamp column (None = detect it)
         
     Returns:
-        Frequency in Hz (samples per second)
+        Frequency in Hz (samples per second), 1.0 if there is no usable
+        timestamp column
     """
-    if timestamp_column and timestamp_column in df.columns:
-        try:
-            timestamps = pd.to_datetime(df[timestamp_column], errors='coerce').dropna()
-            if len(timestamps) < 2:
-                return 1.0
-            
-            intervals = timestamps.diff().dropna().dt.total_seconds()
-            median_interval = intervals.median()
-            
-            if median_interval > 0:
-                return round(1.0 / median_interval, 4)
-        except Exception as e:
-            print(f"Warning: Could not detect frequency from timestamps: {e}")
-            return 1.0
+    return analyze_sampling(df, timestamp_column)['frequency']
+
+
+def find_timestamp_column(df: pd.DataFrame) -> Optional[str]:
+    """
+    Find the column holding the time axis: a datetime column, else the
+    first column named like one (a word of its name starts with one of
+    TIMESTAMP_KEYWORDS, so 'DateTime' and 'time_ms' count but
+    'update_count' and 'runtime' do not) whose first values parse as
+    numbers or dates.
+    """
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            return col
+    for col in df.columns:
+        words = re.findall(r'[a-z]+', re.sub(r'([a-z])([A-Z])', r'\1_\2', str(col)).lower())
+        if not any(word.startswith(kw) for word in words for kw in TIMESTAMP_KEYWORDS):
+            continue
+        head = df[col].head(FREQUENCY_SAMPLE_SIZE // FREQUENCY_SAMPLE_RUNS).dropna()
+        if len(head) >= 2 and timestamp_seconds(head, col).notna().mean() > 0.5:
+            return col
+    return None
+
+
+def analyze_sampling(
+    df: pd.DataFrame,
+    timestamp_column: Optional[str] = None,
+    sample_size: int = FREQUENCY_SAMPLE_SIZE
+) -> Dict:
+    """
+    Estimate the sampling frequency, jitter and gaps of a time series from
+    a bounded sample of its timestamps.
+    
+    At most sample_size timestamps are parsed, in FREQUENCY_SAMPLE_RUNS
+    runs of consecutive rows spread over the file, so the cost does not
+    grow with the recording. Numeric timestamps are read as seconds (or
+    the unit their name ends in, e.g. time_ms; epoch values in ms, us or
+    ns are recognised by magnitude) without datetime parsing. Gaps
+    between runs are caught by comparing the first-to-last span with the
+    sample count.
     
-    return 1.0  # Default: assume 1 sample per unit time
+    Args:
+        df: Time series DataFrame
+        timestamp_column: Name of the timestamp column (None = detect it)
+        sample_size: Maximum number of timestamps to examine
+        
+    Returns:
+        Dictionary with the timestamp column used, frequency (Hz), median
+        interval (s), relative jitter, gap statistics, an estimate of the
+        samples missing overall and whether sampling looks regular
+    """
+    if timestamp_column is None:
+        timestamp_column = find_timestamp_column(df)
+    result = {
+        'timestamp_column': timestamp_column,
+        'frequency': 1.0,  # Default: assume 1 sample per unit time
+        'source': 'default',
+        'interval_seconds': None,
+        'jitter': None,
+        'gap_count': 0,
+        'max_gap_seconds': None,
+        'non_increasing_count': 0,
+        'estimated_missing_samples': 0,
+        'sampled_intervals': 0,
+        'regular': None
+    }
+    if not timestamp_column or timestamp_column not in df.columns:
+        return result
+
+    try:
+        runs, span = _sampled_intervals(df[timestamp_column], timestamp_column, sample_size)
+    except Exception as e:
+        print(f"Warning: Could not detect frequency from timestamps: {e}")
+        return result
+    intervals = np.concatenate(runs)
+    positive = intervals[intervals > 0]
+    if len(positive) == 0:
+        return result
+
+    median_interval = float(np.median(positive))
+    jitter = float(np.median(np.abs(positive - median_interval))) / median_interval
+    is_gap = positive > GAP_FACTOR * median_interval
+    gaps = positive[is_gap]
+    # Mean of the regular intervals: unlike the median, not biased by
+    # timestamps rounded to a coarser unit than the sampling period
+    regular_intervals = positive[~is_gap]
+    interval = float(regular_intervals.mean())
+    frequency = 1.0 / interval
+    missing = int(round(span * frequency)) + 1 - len(df) if span is not None else 0
+    # Extrapolating the sampled interval over the whole span is only as
+    # exact as its standard error, estimated from the spread of the run
+    # means (interval noise within a run largely cancels out)
+    run_means = [run[(run > 0) & (run <= GAP_FACTOR * median_interval)].mean() for run in runs]
+    run_means = np.array([mean for mean in run_means if not np.isnan(mean)])
+    if len(run_means) > 1:
+        standard_error = float(run_means.std()) / interval / np.sqrt(len(run_means))
+    else:
+        standard_error = float(regular_intervals.std()) / interval / np.sqrt(len(regular_intervals))
+    missing = missing if missing > max(1.0, 5 * len(df) * standard_error) else 0
+    # Never fewer than the gaps seen in the sample account for
+    missing = max(missing, int(np.sum(np.round(gaps / interval) - 1)))
+
+    result.update({
+        # Significant figures, so daily (1.16e-5 Hz) data does not round to 0
+        'frequency': float(f"{frequency:.6g}"),
+        'source': 'timestamps',
+        'interval_seconds': interval,
+        'jitter': round(jitter, 6),
+        'gap_count': int(len(gaps)),
+        'max_gap_seconds': float(gaps.max()) if len(gaps) else None,
+        'non_increasing_count': int(len(intervals) - len(positive)),
+        'estimated_missing_samples': missing,
+        'sampled_intervals': int(len(intervals)),
+        'regular': bool(jitter <= IRREGULAR_JITTER and len(gaps) == 0 and missing == 0)
+    })
+    return result
+
+
+def _sampled_intervals(timestamps: pd.Series, name: str, sample_size: int) -> Tuple[List[np.ndarray], Optional[float]]:
+    """Intervals (s) within each run of consecutive timestamps, and the first-to-last span."""
+    n = len(timestamps)
+    runs = 1 if n <= sample_size else FREQUENCY_SAMPLE_RUNS
+    run_length = min(n, max(2, sample_size // runs))
+    starts = np.unique(np.linspace(0, n - run_length, runs).astype(np.int64))
+
+    intervals = []
+    for start in starts:
+        seconds = timestamp_seconds(timestamps.iloc[start:start + run_length], name).to_numpy(dtype=np.float64)
+        seconds = seconds[~np.isnan(seconds)]
+        intervals.append(np.diff(seconds))
+
+    ends = timestamp_seconds(timestamps.iloc[[0, -1]], name).to_numpy(dtype=np.float64)
+    span = float(ends[1] - ends[0]) if not np.isnan(ends).any() else None
+    return intervals, span
+
+
+def timestamp_seconds(values: pd.Series, name: str) -> pd.Series:
+    """
+    Timestamps as float seconds; unparseable values become NaN.
+
+    Date strings and datetimes become seconds since the epoch. Numbers are
+    scaled by a unit suffix of the column name (time_ms, t_us) or, without
+    one, by their magnitude (epochs in ms, us or ns).
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').where(values.notna()) / 1e9
+    if not pd.api.types.is_numeric_dtype(values):
+        # Probe a few values first: numeric parsing of date strings is slow
+        numeric = pd.to_numeric(values.head(100), errors='coerce')
+        if numeric.notna().mean() > 0.5:
+            numeric = pd.to_numeric(values, errors='coerce')
+        else:
+            parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+            if parsed.notna().mean() <= 0.5:
+                with warnings.catch_warnings():
+                    # Per-value format inference warning
+                    warnings.simplefilter('ignore', UserWarning)
+                    parsed = pd.to_datetime(values, errors='coerce')
+            return parsed.astype('int64').where(parsed.notna()) / 1e9
+        values = numeric
+    values = values.astype(np.float64)
+
+    suffix = str(name).lower().replace('-', '_').rsplit('_', 1)[-1]
+    if suffix in _TIME_UNITS:
+        return values * _TIME_UNITS[suffix]
+    # Epoch timestamps in ms, us or ns are far larger than any epoch in seconds
+    magnitude = values.abs().median()
+    for threshold, scale in ((1e17, 1e-9), (1e14, 1e-6), (1e11, 1e-3)):
+        if magnitude >= threshold:
+            return values * scale
+    return values
 
 
 def analyze_time_series(df: pd.DataFrame, timestamp_column: Optional[str] = None) -> Dict:
@@ -44,36 +246,32 @@ def analyze_time_series(df: pd.DataFrame, timestamp_column: Optional[str] = None
     
     Args:
         df: Time series DataFrame
-        timestamp_column: Name of the timestamp column (if exists)
+        timestamp_column: Name of the timestamp column (None = detect it)
         
     Returns:
-        Dictionary containing frequency, sample count, signal columns, and statistics
+        Dictionary containing frequency, sample count, signal columns,
+        statistics and the sampling report (see analyze_sampling)
     """
-    frequency = detect_frequency(df, timestamp_column)
+    sampling = analyze_sampling(df, timestamp_column)
+    timestamp_column = sampling['timestamp_column']
+    frequency = sampling['frequency']
     
-    # Identify signal columns (numeric, not time-related)
-    time_keywords = ['time', 'timestamp', 'date', 'sample', 'index', 't']
+    # Identify signal columns (numeric, not time-related); a bare 't' is a
+    # time axis, but names merely containing a 't' (amplitude) are not
+    time_keywords = ['time', 'timestamp', 'date', 'sample', 'index']
     signal_columns = [
         col for col in df.columns
         if pd.api.types.is_numeric_dtype(df[col])
+        and col != timestamp_column
+        and col.lower() != 't'
         and not any(kw in col.lower() for kw in time_keywords)
     ]
     
     sample_count = len(df)
     duration_seconds = sample_count / frequency if frequency > 0 else sample_count
     
-    # Calculate statistics for each signal column
-    stats = {}
-    for col in signal_columns[:10]:  # Limit to first 10 for performance
-        series = df[col].dropna()
-        if len(series) > 0:
-            stats[col] = {
-                'mean': float(series.mean()),
-                'std': float(series.std()),
-                'min': float(series.min()),
-                'max': float(series.max()),
-                'missing_pct': float(df[col].isna().mean() * 100)
-            }
+    # Calculate statistics for every signal column
+    stats = channel_statistics(df, signal_columns)
     
     return {
         'frequency': frequency,
@@ -81,7 +279,85 @@ def analyze_time_series(df: pd.DataFrame, timestamp_column: Optional[str] = None
         'signal_columns': signal_columns,
         'timestamp_column': timestamp_column,
         'duration_seconds': duration_seconds,
-        'column_stats': stats
+        'column_stats': stats,
+        'sampling': sampling
+    }
+
+
+def channel_statistics(
+    df: pd.DataFrame,
+    columns: List[str],
+    max_workers: Optional[int] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Mean, standard deviation, min, max and missing percentage of every
+    channel, as NaN-aware reductions along axis 0 of 2-D blocks of channels.
+    
+    Channels are converted to float64 a block at a time (about
+    CHANNEL_BLOCK_ELEMENTS values), so memory stays bounded however many
+    channels there are; blocks are reduced on a thread pool. Only channels
+    with missing values take the slower nan* reductions.
+    
+    Args:
+        df: Time series DataFrame
+        columns: Numeric channel columns
+        max_workers: Threads (None = CPU count, 1 = serial)
+        
+    Returns:
+        Dictionary of column name to its statistics; channels with no
+        values are left out
+    """
+    if not columns or len(df) == 0:
+        return {}
+    per_block = max(1, CHANNEL_BLOCK_ELEMENTS // len(df))
+    blocks = [columns[i:i + per_block] for i in range(0, len(columns), per_block)]
+    workers = max_workers or min(len(blocks), os.cpu_count() or 1)
+
+    def reduce_block(block):
+        return _block_statistics(df[block].to_numpy(dtype=np.float64, na_value=np.nan), block)
+
+    if workers <= 1 or len(blocks) <= 1:
+        results = [reduce_block(block) for block in blocks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(reduce_block, blocks))
+
+    stats = {}
+    for result in results:
+        stats.update(result)
+    return stats
+
+
+def _block_statistics(values: np.ndarray, columns: List[str]) -> Dict[str, Dict[str, float]]:
+    """Statistics of each column of a (samples, channels) array."""
+    missing_counts = np.isnan(values).sum(axis=0)
+    valid_counts = len(values) - missing_counts
+    with warnings.catch_warnings():
+        # Channels with no (or one) value; they are dropped or get NaN std
+        warnings.simplefilter('ignore', RuntimeWarning)
+        means = values.mean(axis=0)
+        stds = values.std(axis=0, ddof=1)
+        mins = values.min(axis=0)
+        maxs = values.max(axis=0)
+        # Only channels with gaps are reduced again, skipping missing values
+        gappy = np.flatnonzero(missing_counts)
+        if len(gappy):
+            subset = values[:, gappy]
+            means[gappy] = np.nanmean(subset, axis=0)
+            stds[gappy] = np.nanstd(subset, axis=0, ddof=1)
+            mins[gappy] = np.nanmin(subset, axis=0)
+            maxs[gappy] = np.nanmax(subset, axis=0)
+
+    return {
+        col: {
+            'mean': float(means[i]),
+            'std': float(stds[i]),
+            'min': float(mins[i]),
+            'max': float(maxs[i]),
+            'missing_pct': float(missing_counts[i] / len(values) * 100)
+        }
+        for i, col in enumerate(columns)
+        if valid_counts[i] > 0
     }
 
 
@@ -95,6 +371,10 @@ def downsample_time_series(
     """
     Downsample time series from original_freq to target_freq.
     
+    Each block of round(original_freq / target_freq) consecutive samples
+    becomes one; the last block may be shorter and missing values are
+    skipped. Blocks are reduced as reshaped NumPy views rather than groups.
+    
     Args:
         df: Time series DataFrame
         target_freq: Target sampling frequency in Hz
@@ -111,32 +391,362 @@ def downsample_time_series(
     factor = int(round(original_freq / target_freq))
     
     # Get numeric columns (excluding timestamp)
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if timestamp_column and timestamp_column in numeric_cols:
-        numeric_cols.remove(timestamp_column)
+    numeric_cols = _numeric_columns(df, timestamp_column)
     
     # Map method to pandas aggregation function
-    agg_funcs = {
-        'average': 'mean',
-        'max': 'max',
-        'min': 'min',
-        'first': 'first',
-        'last': 'last'
-    }
-    agg = agg_funcs.get(method, 'mean')
-    
-    # Create group indices for downsampling
-    groups = np.arange(len(df)) // factor
-    result = df.groupby(groups)[numeric_cols].agg(agg).reset_index(drop=True)
+    agg = _AGGREGATIONS.get(method, 'mean')
+    return _downsample_blocks(df, factor, agg, numeric_cols, timestamp_column)
+
+
+# Downsampling methods and the pandas aggregation each one is
+_AGGREGATIONS = {
+    'average': 'mean',
+    'max': 'max',
+    'min': 'min',
+    'first': 'first',
+    'last': 'last'
+}
+
+
+def _downsample_blocks(
+    df: pd.DataFrame,
+    factor: int,
+    agg: str,
+    numeric_cols: List[str],
+    timestamp_column: Optional[str]
+) -> pd.DataFrame:
+    """Reduce blocks of `factor` rows; the timestamp of a block is its first."""
+    # Plain NumPy columns are reduced as (n // factor, factor) views;
+    # nullable extension columns go through groupby
+    if all(isinstance(df[col].dtype, np.dtype) for col in numeric_cols):
+        result = pd.DataFrame({col: _block_reduce(df[col].to_numpy(), factor, agg) for col in numeric_cols})
+    else:
+        groups = np.arange(len(df)) // factor
+        result = df.groupby(groups)[numeric_cols].agg(agg).reset_index(drop=True)
     
     # Reconstruct timestamp if present
     if timestamp_column and timestamp_column in df.columns:
-        ts_groups = df.groupby(groups)[timestamp_column].first().reset_index(drop=True)
+        timestamps = df[timestamp_column]
+        if timestamps.notna().all():
+            ts_groups = timestamps.iloc[::factor].reset_index(drop=True)
+        else:
+            # First non-missing timestamp of each block
+            ts_groups = timestamps.groupby(np.arange(len(df)) // factor).first().reset_index(drop=True)
         result.insert(0, timestamp_column, ts_groups)
     
     return result
 
 
+def resample_polyphase(
+    df: pd.DataFrame,
+    target_freq: float,
+    original_freq: float,
+    timestamp_column: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Resample a time series to target_freq, up or down, with an
+    anti-aliasing polyphase FIR filter (scipy.signal.resample_poly, which
+    for integer downsampling is what decimate(ftype='fir') runs).
+    
+    All signal columns are filtered together as one 2-D array. The ratio
+    target_freq / original_freq need not be an integer; it is taken as the
+    nearest fraction up/down with down <= RESAMPLE_MAX_DENOMINATOR. Gaps
+    are interpolated before filtering so they do not spread.
+    
+    Args:
+        df: Time series DataFrame
+        target_freq: Target sampling frequency in Hz
+        original_freq: Original sampling frequency in Hz
+        timestamp_column: Name of timestamp column
+        
+    Returns:
+        Resampled DataFrame with the timestamp column (regenerated at the
+        new rate) and the numeric signal columns as float
+    """
+    up, down = resample_ratio(target_freq, original_freq)
+    signal_cols = _numeric_columns(df, timestamp_column)
+    output_length = -(-len(df) * up // down)
+    
+    values = df[signal_cols].to_numpy(dtype=np.float64)
+    if np.isnan(values.sum()):
+        values = df[signal_cols].interpolate(limit_direction='both').to_numpy(dtype=np.float64)
+    if len(df) > 0 and signal_cols:
+        # Edges are padded along a fitted line rather than with zeros
+        values = scipy_signal.resample_poly(values, up, down, axis=0, padtype='line')
+    else:
+        values = np.empty((output_length, len(signal_cols)))
+    result = pd.DataFrame(values, columns=signal_cols)
+    
+    if timestamp_column and timestamp_column in df.columns:
+        timestamps = _regular_timestamps(df[timestamp_column], output_length, original_freq * up / down)
+        if timestamps is not None:
+            result.insert(0, timestamp_column, timestamps)
+    
+    return result
+
+
+def resample_ratio(target_freq: float, original_freq: float) -> Tuple[int, int]:
+    """target_freq / original_freq as a fraction (up, down) in lowest terms."""
+    ratio = Fraction(target_freq / original_freq).limit_denominator(RESAMPLE_MAX_DENOMINATOR)
+    if ratio == 0:
+        ratio = Fraction(1, RESAMPLE_MAX_DENOMINATOR)
+    return ratio.numerator, ratio.denominator
+
+
+def resampled_frequency(target_freq: float, original_freq: float, method: str = 'average') -> float:
+    """
+    Exact rate that resampling to target_freq produces: original_freq * up
+    / down for 'polyphase' and any upsampling, original_freq / factor for
+    the block methods.
+    """
+    if method == 'polyphase' or target_freq > original_freq:
+        up, down = resample_ratio(target_freq, original_freq)
+        return original_freq * up / down
+    return original_freq / max(1, int(round(original_freq / target_freq)))
+
+
+def stream_resample_csv(
+    source_path: str,
+    output_path: str,
+    target_freq: float,
+    original_freq: float,
+    timestamp_column: Optional[str] = None,
+    method: str = 'average',
+    chunk_size: int = RESAMPLE_CHUNK_SIZE
+) -> Dict:
+    """
+    Resample a CSV recording chunk by chunk, without loading it into memory.
+    
+    Block methods ('average', 'max', ...) carry the rows of an unfinished
+    block over to the next chunk, so the result equals
+    downsample_time_series on the whole file. 'polyphase' (and any
+    upsampling) carries the filter's input history instead. The result
+    equals resample_poly with constant padding around the mean of the
+    first chunk, which only differs from resample_polyphase within a
+    filter length of either end. Gaps are interpolated per chunk.
+    
+    Signal columns are the numeric columns of the first chunk. Resampled
+    chunks are appended to output_path as they are produced.
+    
+    Args:
+        source_path: CSV file to resample
+        output_path: Where to write the resampled CSV
+        target_freq: Target sampling frequency in Hz
+        original_freq: Original sampling frequency in Hz
+        timestamp_column: Name of timestamp column
+        method: 'polyphase' or a downsampling method ('average', 'max', 'min', 'first', 'last')
+        chunk_size: Rows per chunk
+        
+    Returns:
+        Dictionary with row counts, chunk count, output columns, the
+        method used and the exact output frequency
+    """
+    polyphase = method == 'polyphase' or target_freq > original_freq
+    frequency = resampled_frequency(target_freq, original_freq, method)
+    if polyphase:
+        up, down = resample_ratio(target_freq, original_freq)
+    else:
+        factor = max(1, int(round(original_freq / target_freq)))
+        agg = _AGGREGATIONS.get(method, 'mean')
+    
+    rows_in = rows_out = chunks = 0
+    columns = []
+    signal_cols = None
+    stream = first_timestamps = last_values = None
+    pending = None
+    
+    with open(output_path, 'w', newline='') as output:
+        reader = pd.read_csv(source_path, chunksize=chunk_size)
+        chunk = next(reader, None)
+        while chunk is not None:
+            next_chunk = next(reader, None)
+            final = next_chunk is None
+            rows_in += len(chunk)
+            chunks += 1
+            if signal_cols is None:
+                signal_cols = _numeric_columns(chunk, timestamp_column)
+            for col in signal_cols:
+                if not pd.api.types.is_numeric_dtype(chunk[col]):
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+            has_timestamps = bool(timestamp_column) and timestamp_column in chunk.columns
+            
+            if polyphase:
+                values = chunk[signal_cols].to_numpy(dtype=np.float64)
+                if np.isnan(values.sum()):
+                    # Interpolate from the last sample of the previous chunk
+                    context = values if last_values is None else np.vstack([last_values, values])
+                    values = pd.DataFrame(context).interpolate(limit_direction='both').to_numpy()[len(context) - len(values):]
+                if len(values):
+                    last_values = values[-1:]
+                if stream is None:
+                    stream = _PolyphaseStream(up, down, np.nanmean(values, axis=0) if len(values) else 0.0)
+                if has_timestamps and first_timestamps is None:
+                    first_timestamps = chunk[timestamp_column].dropna().iloc[:1]
+                    if len(first_timestamps) == 0:
+                        first_timestamps = None
+                resampled = pd.DataFrame(stream.push(values, final), columns=signal_cols)
+                if first_timestamps is not None:
+                    timestamps = _regular_timestamps(first_timestamps, len(resampled), frequency, start=rows_out)
+                    if timestamps is not None:
+                        resampled.insert(0, timestamp_column, timestamps)
+            else:
+                if pending is not None:
+                    chunk = pd.concat([pending, chunk], ignore_index=True)
+                # Rows of an unfinished block wait for the next chunk
+                complete = len(chunk) if final else len(chunk) // factor * factor
+                pending = chunk.iloc[complete:]
+                keep = ([timestamp_column] if has_timestamps else []) + signal_cols
+                resampled = _downsample_blocks(
+                    chunk.iloc[:complete][keep].reset_index(drop=True), factor, agg, signal_cols,
+                    timestamp_column if has_timestamps else None
+                )
+            
+            resampled.to_csv(output, header=(rows_out == 0 and not columns), index=False)
+            if not columns:
+                columns = resampled.columns.tolist()
+            rows_out += len(resampled)
+            chunk = next_chunk
+    
+    return {
+        'rows_in': rows_in,
+        'rows_out': rows_out,
+        'chunks': chunks,
+        'columns': columns,
+        'method': 'polyphase' if polyphase else method,
+        'frequency': frequency
+    }
+
+
+class _PolyphaseStream:
+    """
+    resample_poly (padtype='constant' around `offset`) of a signal that
+    arrives in pieces: the same filter is run with upfirdn over the
+    retained input history plus each new piece, and only outputs whose
+    inputs have all been seen are emitted.
+    """
+
+    def __init__(self, up: int, down: int, offset):
+        self.up = up
+        self.down = down
+        self.offset = offset
+        # Same filter, pre-padding and delay as scipy.signal.resample_poly
+        max_rate = max(up, down)
+        half_len = 10 * max_rate
+        taps = scipy_signal.firwin(2 * half_len + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * up
+        pre_pad = down - half_len % down
+        self.taps = np.concatenate([np.zeros(pre_pad), taps])
+        self.delay = (half_len + pre_pad) // down
+        self.history = None
+        self.start = 0          # Input index of history[0], always a multiple of down
+        self.next_output = 0    # Index (counting delay outputs) of the next output
+        self.samples = 0
+
+    def push(self, values: np.ndarray, final: bool = False) -> np.ndarray:
+        """Add samples (rows) and return the outputs they complete."""
+        values = values - self.offset
+        self.history = values if self.history is None else np.concatenate([self.history, values])
+        self.samples += len(values)
+        emitted = self.next_output
+        if len(self.history) == 0:
+            return np.empty((0, values.shape[1]))
+        
+        filtered = scipy_signal.upfirdn(self.taps, self.history, self.up, self.down, axis=0)
+        base = self.start * self.up // self.down
+        if final:
+            stop = self.delay - (-self.samples * self.up // self.down) - base
+            if stop > len(filtered):
+                padding = np.zeros((stop - len(filtered),) + filtered.shape[1:])
+                filtered = np.concatenate([filtered, padding])
+        else:
+            # Later outputs also depend on samples not read yet
+            stop = (len(self.history) - 1) * self.up // self.down + 1
+        stop = max(stop, self.next_output - base)
+        outputs = filtered[self.next_output - base:stop]
+        self.next_output = base + stop
+        
+        # Keep only the inputs that outputs still to come depend on
+        needed = max(0, self.next_output * self.down - (len(self.taps) - 1)) // self.up
+        new_start = needed // self.down * self.down
+        self.history = self.history[new_start - self.start:]
+        self.start = new_start
+        
+        # The first `delay` outputs are the filter's lead-in
+        outputs = outputs[max(0, self.delay - emitted):]
+        return outputs + self.offset
+
+
+def _numeric_columns(df: pd.DataFrame, timestamp_column: Optional[str] = None) -> List[str]:
+    """Numeric, non-boolean columns other than the timestamp (select_dtypes would copy the frame)."""
+    return [
+        col for col in df.columns
+        if col != timestamp_column
+        and pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+    ]
+
+
+def _regular_timestamps(timestamps: pd.Series, count: int, freq: float, start: int = 0) -> Optional[pd.Series]:
+    """
+    Timestamps of samples start .. start + count - 1 at freq Hz from the
+    first one: seconds for numeric columns, datetimes otherwise. None if
+    no timestamp can be parsed.
+    """
+    offsets = np.arange(start, start + count) / freq
+    if pd.api.types.is_numeric_dtype(timestamps):
+        valid = timestamps.dropna()
+        return pd.Series(valid.iloc[0] + offsets) if len(valid) else None
+    valid = pd.to_datetime(timestamps, errors='coerce').dropna()
+    if len(valid) == 0:
+        return None
+    return pd.Series(valid.iloc[0] + pd.to_timedelta(offsets, unit='s'))
+
+
+def _block_reduce(values: np.ndarray, factor: int, agg: str) -> np.ndarray:
+    """
+    Reduce consecutive blocks of `factor` values, as groupby(arange(n) // factor)
+    would: missing values are skipped and the last block may be shorter.
+    """
+    full = len(values) // factor * factor
+    blocks = [values[:full].reshape(-1, factor)]
+    if full < len(values):
+        blocks.append(values[full:].reshape(1, -1))
+    # A NaN (or inf - inf) anywhere makes the sum NaN; no mask needed to check
+    has_nan = values.dtype.kind == 'f' and bool(np.isnan(values.sum()))
+    result = np.concatenate([_reduce_rows(block, agg, has_nan) for block in blocks])
+    if agg == 'mean' and values.dtype.kind == 'f':
+        # Means are accumulated in float64, then given the column's precision back
+        result = result.astype(values.dtype, copy=False)
+    return result
+
+
+def _reduce_rows(block: np.ndarray, agg: str, has_nan: bool) -> np.ndarray:
+    """Reduce each row of a 2-D block with a pandas aggregation name."""
+    if not has_nan:
+        if agg == 'first':
+            return block[:, 0]
+        if agg == 'last':
+            return block[:, -1]
+        if agg == 'mean':
+            return block.mean(axis=1, dtype=np.float64)
+        return getattr(block, agg)(axis=1)
+    
+    if agg in ('first', 'last'):
+        valid = ~np.isnan(block)
+        if agg == 'first':
+            index = valid.argmax(axis=1)
+        else:
+            index = block.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+        result = block[np.arange(len(block)), index]
+        result[~valid.any(axis=1)] = np.nan
+        return result
+    
+    # All-missing blocks give NaN, as in groupby
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if agg == 'mean':
+            return np.nanmean(block, axis=1, dtype=np.float64)
+        return {'max': np.nanmax, 'min': np.nanmin}[agg](block, axis=1)
+
+
 def validate_frequency_conversion(original_freq: float, target_freq: float) -> Tuple[bool, str]:
     """
     Validate if frequency conversion is possible and safe.
@@ -151,56 +761,98 @@ def validate_frequency_conversion(original_freq: float, target_freq: float) -> T
     if target_freq <= 0:
         return False, "Target frequency must be greater than 0"
     
-    if target_freq > original_freq:
-        return False, f"Cannot upsample: target ({target_freq} Hz) > original ({original_freq} Hz)"
+    if original_freq <= 0:
+        return False, "Original frequency must be greater than 0"
+    
+    if original_freq / target_freq > MAX_RESAMPLE_RATIO:
+        return False, f"Downsampling ratio too large (max {MAX_RESAMPLE_RATIO}x). Choose a higher target frequency."
     
-    if original_freq / target_freq > 1000:
-        return False, "Downsampling ratio too large (max 1000x). Choose a higher target frequency."
+    if target_freq / original_freq > MAX_RESAMPLE_RATIO:
+        return False, f"Upsampling ratio too large (max {MAX_RESAMPLE_RATIO}x). Choose a lower target frequency."
     
     return True, ""
 
 
-def process_audio_file(audio_bytes: bytes, sample_rate: Optional[int] = None) -> Dict:
+def decode_audio(source, block_frames: int = AUDIO_BLOCK_FRAMES) -> Dict:
     """
-    Process raw audio bytes into a time series DataFrame.
+    Decode an audio file to mono float32 samples with soundfile, a block of
+    frames at a time.
+    
+    Blocks are mixed down and written into one preallocated float32 array,
+    so peak memory is the decoded signal plus one block - not float64
+    copies of every channel. Formats soundfile cannot read (e.g. .m4a) go
+    through librosa if it is installed.
     
     Args:
-        audio_bytes: Raw audio file bytes
-        sample_rate: Target sample rate (None = use original)
+        source: Path or seekable binary file object
+        block_frames: Frames decoded per block
         
     Returns:
-        Dictionary containing DataFrame, frequency, and metadata
+        Dictionary with 'samples' (float32 array), sample_rate, channels,
+        sample_count, duration and the container format
         
     Raises:
-        ImportError: If librosa or soundfile are not installed
+        ImportError: If neither soundfile nor librosa can decode the file
     """
     try:
-        import librosa
         import soundfile as sf
-        import io
-    except ImportError:
-        raise ImportError(
-            "Audio processing requires librosa and soundfile. "
-            "Install with: pip install librosa soundfile"
-        )
-    
-    # Load audio from bytes
-    audio_buffer = io.BytesIO(audio_bytes)
-    audio_array, sr = librosa.load(audio_buffer, sr=sample_rate, mono=True)
-    
-    duration = len(audio_array) / sr
-    timestamps = np.arange(len(audio_array)) / sr
-    
-    # Create DataFrame
-    df = pd.DataFrame({
-        'timestamp': timestamps,
-        'amplitude': audio_array
+        with sf.SoundFile(source) as audio:
+            # Some containers report no (or a wrong) frame count; grow if needed
+            samples = np.empty(max(audio.frames, 0), dtype=np.float32)
+            count = 0
+            for block in audio.blocks(blocksize=block_frames, dtype='float32', always_2d=True):
+                mono = block[:, 0] if block.shape[1] == 1 else block.mean(axis=1, dtype=np.float32)
+                if count + len(mono) > len(samples):
+                    samples = np.resize(samples, max(2 * len(samples), count + len(mono)))
+                samples[count:count + len(mono)] = mono
+                count += len(mono)
+            sample_rate, channels, container = audio.samplerate, audio.channels, audio.format
+        samples = samples[:count]
+    except (ImportError, RuntimeError) as e:
+        try:
+            import librosa
+        except ImportError:
+            raise ImportError(
+                f"Could not decode audio ({e}). Formats soundfile cannot read "
+                "need librosa. Install with: pip install librosa soundfile"
+            )
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        samples, sample_rate = librosa.load(source, sr=None, mono=True)
+        samples = samples.astype(np.float32, copy=False)
+        channels, container = 1, None
+
+    return {
+        'samples': samples,
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'sample_count': len(samples),
+        'duration': len(samples) / sample_rate if sample_rate else 0.0,
+        'format': container
+    }
+
+
+def audio_frame(samples: np.ndarray, sample_rate: float, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+    """Samples [start, stop) as a (timestamp, amplitude) DataFrame."""
+    amplitude = samples[start:stop]
+    return pd.DataFrame({
+        'timestamp': (start + np.arange(len(amplitude))) / sample_rate,
+        'amplitude': amplitude
     })
+
+
+def waveform_envelope(samples: np.ndarray, buckets: int = AUDIO_ENVELOPE_BUCKETS) -> Dict:
+    """
+    Peak envelope of a signal: the minimum and maximum of each of about
+    `buckets` equal runs of samples, enough to draw the whole waveform.
     
+    Returns:
+        Dictionary with 'bucket_size' (samples per bucket) and float32
+        'min' and 'max' arrays
+    """
+    bucket_size = max(1, -(-len(samples) // max(1, buckets)))
     return {
-        'data': df,
-        'frequency': float(sr),
-        'sample_rate': sr,
-        'duration': duration,
-        'sample_count': len(audio_array)
+        'bucket_size': bucket_size,
+        'min': _block_reduce(samples, bucket_size, 'min'),
+        'max': _block_reduce(samples, bucket_size, 'max')
     }
@@ -225,6 +225,27 @@
         }
     };
 
+    // ========== COLUMNAR WIRE FORMAT DECODING ==========
+    // Data endpoints accept ?format=columns and then send { column: values }
+    // instead of one object per row; the full-dataset loads in upload.js use it.
+    // Record payloads (arrays) pass through unchanged.
+    window.columnsToRecords = function (payload) {
+        if (!payload || Array.isArray(payload)) return payload || [];
+        const columns = payload;
+        const names = Object.keys(columns);
+        const rowCount = names.length > 0 ? columns[names[0]].length : 0;
+        const records = new Array(rowCount);
+        for (let i = 0; i < rowCount; i++) {
+            const row = {};
+            for (let j = 0; j < names.length; j++) {
+                const value = columns[names[j]][i];
+                row[names[j]] = Number.isNaN(value) ? null : value;
+            }
+            records[i] = row;
+        }
+        return records;
+    };
+
     // Initialize restoration on page load
     function initializeRestoration() {
         // Restore tabular data
@@ -158,13 +158,22 @@
                                 <option value="us">Microseconds (μs)</option>
                                 <option value="min">Minutes (min)</option>
                             </select>
-                            <button onclick="window.applyTimeResampling()" 
+                            <select id="resampleMethod" style="padding: 8px; border: 1px solid #cbd5e0; border-radius: 4px;">
+                                <option value="average">Block average</option>
+                                <option value="polyphase">Anti-aliased (polyphase filter)</option>
+                                <option value="max">Block maximum</option>
+                                <option value="min">Block minimum</option>
+                                <option value="first">First sample of block</option>
+                                <option value="last">Last sample of block</option>
+                            </select>
+                            <button onclick="window.convertTimeUnit()" 
                                     style="background: #0071e3; color: white; border: none; padding: 8px 16px; border-radius: 6px; cursor: pointer; font-weight: 500;">
                                 Apply Resampling
                             </button>
                         </div>
                         <p style="color: #718096; font-size: 0.9rem; margin-top: 8px;">
-                            Specify a custom sampling interval (e.g., 2ms, 5ms, 0.5s) to resample your data. This will downsample to the specified interval.
+                            Specify a custom sampling interval (e.g., 2ms, 5ms, 0.5s) to resample your data. Block methods combine each run of samples;
+                            the anti-aliased filter removes frequencies above the new Nyquist limit first and also handles non-integer rate changes.
                         </p>
                     </div>
                     <div style="margin-bottom: 15px;">
@@ -371,6 +380,7 @@
         const targetUnit = document.getElementById('convertTimeUnitSelect').value;
         const customInterval = document.getElementById('customTimeInterval').value;
         const customUnit = document.getElementById('customTimeUnit').value;
+        const resampleMethod = document.getElementById('resampleMethod').value;
 
         // Time unit multipliers (to seconds)
         const multipliers = {
@@ -410,20 +420,15 @@
             const targetFrequency = 1.0 / intervalSeconds;
             const originalFrequency = window.timeSeriesData.frequency || 1;
 
-            if (targetFrequency > originalFrequency) {
-                alert(`Cannot upsample: target frequency (${targetFrequency.toFixed(2)} Hz) exceeds original frequency (${originalFrequency.toFixed(2)} Hz).`);
-                return;
-            }
-
-            // Perform resampling
-            window.resampleTimeSeriesData(targetFrequency, originalFrequency);
+            // Perform resampling (upsampling is filtered on the server)
+            window.resampleTimeSeriesData(targetFrequency, originalFrequency, resampleMethod);
         } else {
             // Just update time unit metadata
             alert(`Time unit updated to ${targetUnit}. Data will be converted when saved.`);
         }
     };
 
-    window.resampleTimeSeriesData = async function (targetFrequency, originalFrequency) {
+    window.resampleTimeSeriesData = async function (targetFrequency, originalFrequency, method = 'average') {
         try {
             const fileId = window.timeSeriesData.uploadId;
             const response = await fetch(`${window.API_BASE_URL || ""}/api/time-series/resample`, {
@@ -435,17 +440,20 @@
                     file_id: fileId,
                     target_frequency: targetFrequency,
                     original_frequency: originalFrequency,
-                    method: 'average'
+                    method: method
                 })
             });
 
             if (response.ok) {
                 const result = await response.json();
+                // The server reports the rate it actually produced, which can
+                // differ from the requested one (whole block sizes, ratio limits)
+                const frequency = result.frequency;
                 window.timeSeriesData.rawData = result.data;
-                window.timeSeriesData.frequency = targetFrequency;
-                window.timeSeriesData.currentFrequency = targetFrequency;
+                window.timeSeriesData.frequency = frequency;
+                window.timeSeriesData.currentFrequency = frequency;
                 
-                alert(`Data resampled to ${targetFrequency.toFixed(2)} Hz (${(1/targetFrequency).toFixed(4)} seconds per sample)`);
+                alert(`Data resampled to ${frequency.toFixed(2)} Hz (${(1/frequency).toFixed(4)} seconds per sample)`);
                 window.renderTimeSeriesResampleInterface();
             } else {
                 const error = await response.json();
@@ -159,6 +159,8 @@
                 signalColumns: signalColumns,
                 columns: columns,
                 uploadId: fileId,
+                // Audio: per-bucket min/max of the whole waveform, instead of every sample
+                envelope: fileData.envelope || null,
                 metadata: {
                     taskType: data.selected_model_action || 'classification',
                     originalFrequency: frequency,
@@ -177,25 +179,11 @@
                 modelType: data.selected_model_type
             });
 
-            // Display time series data table immediately with available data
+            // Display the preview table and plot every sample through the range
+            // endpoint, which returns about 2 * width points per signal at any zoom;
+            // the full recording is never sent to the browser
             window.renderTimeSeriesTable();
 
-            // If we only have preview data, try to load full dataset in background
-            // Check if we have full data or just preview
-            const hasFullData = fileData.data && fileData.data.length > 0;
-            const hasPreviewOnly = fileData.preview_data && (!fileData.data || fileData.data.length === 0);
-            
-            if (hasPreviewOnly) {
-                console.log('📊 Loading full dataset in background...');
-                window.loadFullTimeSeriesData(fileId).then(() => {
-                    // Update table with full data once loaded
-                    console.log('✅ Full dataset loaded, updating table');
-                    window.renderTimeSeriesTable();
-                });
-            } else if (hasFullData) {
-                console.log('✅ Full dataset already loaded:', fileData.data.length, 'rows');
-            }
-
         } catch (error) {
             console.error('Error loading time series data:', error);
             viewerContent.innerHTML = `
@@ -208,28 +196,107 @@
         }
     };
 
-    window.loadFullTimeSeriesData = async function (fileId) {
+    // Plot-ready min/max/mean buckets for samples [start, end) at a given pixel width.
+    // Returns about 2 * width points per signal at any zoom, instead of every sample.
+    window.fetchTimeSeriesRange = async function (fileId, start = 0, end = null, width = 1000, columns = null) {
+        const params = new URLSearchParams({ start, width });
+        if (end !== null) params.set('end', end);
+        if (columns && columns.length) params.set('columns', columns.join(','));
+
+        const response = await fetch(`${window.API_BASE_URL || ""}/api/time-series/range/${fileId}?${params}`);
+        if (!response.ok) {
+            throw new Error(`Failed to fetch time series range: ${response.statusText}`);
+        }
+        return response.json();
+    };
+
+    const PLOT_COLORS = ['#0071e3', '#e53e3e', '#38a169', '#d69e2e', '#805ad5', '#dd6b20', '#319795', '#d53f8c'];
+
+    // Plot samples [start, end) of the current recording; end = null plots to the end.
+    // Zoomed-out views show each bucket's min/max band and mean; windows short
+    // enough to plot sample by sample show the raw signal.
+    window.renderTimeSeriesPlot = async function (start = 0, end = null) {
+        const state = window.timeSeriesData;
+        const canvas = document.getElementById('timeSeriesCanvas');
+        const status = document.getElementById('timeSeriesPlotStatus');
+        if (!canvas || !state || !state.uploadId || typeof Chart === 'undefined') return;
+
+        const width = Math.max(200, Math.round(canvas.parentElement.clientWidth || 1000));
+        let range;
         try {
-            // Fetch full dataset from backend
-            const response = await fetch(`${window.API_BASE_URL || ""}/api/data/${fileId}?full=true`);
-            if (!response.ok) {
-                // If full data endpoint doesn't exist, use preview data
-                console.warn('Full data endpoint not available, using preview data');
-                return;
+            range = await window.fetchTimeSeriesRange(state.uploadId, start, end, width);
+        } catch (error) {
+            console.warn('Could not load time series plot:', error);
+            if (status) status.textContent = 'Plot unavailable: ' + error.message;
+            return;
+        }
+        state.plotRange = { start: range.start, end: range.end };
+
+        const datasets = [];
+        Object.entries(range.signals).forEach(([column, summary], i) => {
+            const color = PLOT_COLORS[i % PLOT_COLORS.length];
+            const points = values => range.index.map((x, k) => ({ x, y: values[k] }));
+            if (range.level > 0) {
+                // Band from max down to the min dataset that follows it
+                datasets.push({ label: `${column} max`, data: points(summary.max), borderWidth: 0,
+                                backgroundColor: color + '33', fill: '+1', pointRadius: 0 });
+                datasets.push({ label: `${column} min`, data: points(summary.min), borderWidth: 0,
+                                pointRadius: 0 });
             }
+            datasets.push({ label: column, data: points(summary.mean), borderColor: color,
+                            borderWidth: 1, pointRadius: 0 });
+        });
 
-            const fileData = await response.json();
-            if (fileData.data) {
-                window.timeSeriesData.fullData = fileData.data;
-                window.timeSeriesData.rawData = fileData.data;
-                console.log('✅ Loaded full time series data:', fileData.data.length, 'rows');
+        if (state.plotChart) state.plotChart.destroy();
+        state.plotChart = new Chart(canvas.getContext('2d'), {
+            type: 'line',
+            data: { datasets },
+            options: {
+                animation: false,
+                parsing: false,
+                normalized: true,
+                responsive: true,
+                maintainAspectRatio: false,
+                scales: {
+                    x: { type: 'linear', min: range.start, max: range.end, title: { display: true, text: 'Sample' } }
+                },
+                plugins: {
+                    legend: { labels: { filter: item => !/ (min|max)$/.test(item.text) } },
+                    tooltip: { enabled: false }
+                }
             }
-        } catch (error) {
-            console.warn('Could not load full dataset, using preview:', error);
-            // Continue with preview data
+        });
+
+        if (status) {
+            const detail = range.level > 0 ? `${range.bucket_size} samples per point` : 'every sample';
+            status.textContent = `Samples ${range.start.toLocaleString()}–${range.end.toLocaleString()} of ` +
+                `${range.sample_count.toLocaleString()} (${detail}). Drag across the plot to zoom, double-click to reset.`;
         }
+        attachPlotZoom(canvas);
     };
 
+    // Drag across the plot to zoom into that sample range; double-click to show everything
+    function attachPlotZoom(canvas) {
+        if (canvas.dataset.zoomAttached) return;
+        canvas.dataset.zoomAttached = 'true';
+        let dragStart = null;
+
+        canvas.addEventListener('mousedown', event => {
+            dragStart = event.offsetX;
+        });
+        canvas.addEventListener('mouseup', event => {
+            const chart = window.timeSeriesData.plotChart;
+            if (dragStart === null || !chart) return;
+            const [left, right] = [dragStart, event.offsetX].sort((a, b) => a - b);
+            dragStart = null;
+            if (right - left < 5) return;
+            const start = Math.max(0, Math.floor(chart.scales.x.getValueForPixel(left)));
+            const end = Math.ceil(chart.scales.x.getValueForPixel(right));
+            if (end > start) window.renderTimeSeriesPlot(start, end);
+        });
+        canvas.addEventListener('dblclick', () => window.renderTimeSeriesPlot(0, null));
+    }
+
     window.renderTimeSeriesTable = function () {
         const viewerContent = document.getElementById('viewerContent');
         if (!viewerContent) return;
@@ -286,6 +353,12 @@
                     </div>
                 </div>
             </div>
+            <div id="timeSeriesPlot" style="margin-bottom: 20px;">
+                <div style="position: relative; height: 320px; cursor: crosshair;">
+                    <canvas id="timeSeriesCanvas"></canvas>
+                </div>
+                <div id="timeSeriesPlotStatus" style="margin-top: 6px; font-size: 0.85rem; color: #718096;">Loading plot...</div>
+            </div>
             <div style="overflow-x: auto; overflow-y: auto; max-height: 70vh; border: 1px solid #e2e8f0; border-radius: 8px; background: white;">
                 <table class="data-table" style="width: 100%; border-collapse: collapse; font-size: 0.875rem;">
                     <thead style="position: sticky; top: 0; background: #f7fafc; z-index: 10; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
@@ -331,11 +404,15 @@
             </div>
             <div style="margin-top: 15px; padding: 12px; background: #f7fafc; border-radius: 8px; font-size: 0.9rem; color: #718096; display: flex; justify-content: space-between; align-items: center;">
                 <span>Showing ${data.length.toLocaleString()} of ${sampleCount.toLocaleString()} samples</span>
-                ${data.length < sampleCount ? '<span style="color: #d69e2e;">⚠️ Showing preview - scroll to view all data</span>' : '<span style="color: #34c759;">✅ All data loaded</span>'}
+                ${data.length < sampleCount ? '<span style="color: #d69e2e;">Table shows a preview; the plot covers every sample</span>' : '<span style="color: #34c759;">✅ All data loaded</span>'}
             </div>
         `;
 
         viewerContent.innerHTML = tableHTML;
+
+        // The plot keeps its zoom when the table is re-rendered
+        const plotRange = window.timeSeriesData.plotRange;
+        window.renderTimeSeriesPlot(plotRange ? plotRange.start : 0, plotRange ? plotRange.end : null);
         
         // Add event listeners for frequency input
         const frequencyInput = document.getElementById('frequencyInput');
@@ -137,12 +137,14 @@
 
         window.fullDatasetPromise = (async () => {
             try {
-                const dataUrl = `${window.API_BASE_URL || ''}/api/data/${fileId}?full=true`;
+                // Column-oriented payload: column names are not repeated per row
+                const dataUrl = `${window.API_BASE_URL || ''}/api/data/${fileId}?full=true&format=columns`;
                 const fullResponse = await fetch(dataUrl);
                 if (!fullResponse.ok) {
                     throw new Error(`Full dataset fetch failed with status ${fullResponse.status}`);
                 }
                 const fullData = await fullResponse.json();
+                if (fullData) fullData.data = window.columnsToRecords(fullData.data);
                 if (fullData && fullData.type === 'tabular' && Array.isArray(fullData.data) && fullData.data.length > 0) {
                     console.log(`✅ Full dataset loaded in background: ${fullData.data.length} rows, ${fullData.columns ? fullData.columns.length : 'unknown'} columns`);
                     window.allData = fullData.data;
@@ -585,12 +587,13 @@
 
                     // Load FULL dataset immediately
                     try {
-                        const dataUrl = `${window.API_BASE_URL || ''}/api/data/${fileId}?full=true`;
+                        const dataUrl = `${window.API_BASE_URL || ''}/api/data/${fileId}?full=true&format=columns`;
                         console.log('Fetching full dataset from:', dataUrl);
                         const fullResponse = await fetch(dataUrl);
                         if (fullResponse.ok) {
                             const fullData = await fullResponse.json();
-                            if (fullData.type === 'tabular' && fullData.data) {
+                            fullData.data = window.columnsToRecords(fullData.data);
+                            if (fullData.type === 'tabular' && fullData.data.length > 0) {
                                 window.allData = fullData.data;
                                 window.allColumns = fullData.columns || [];
                                 window.totalDatasetRows = fullData.shape ? fullData.shape[0] : window.allData.length;